@@ -13,12 +13,13 @@ bl_info = {
     "category": "3D View",
 }
 
-import bpy
-
 # Import modules with error handling
 try:
+    import bpy
+
     from . import ui_panel
-    from .core import parameters
+    from .core import generation_undo, lod_manager, parameters
+    from .generators import region_regen
 except ImportError as e:
     # In test environments, relative imports may fail
     if __name__ != "__main__":
@@ -69,6 +70,9 @@ def register():
         for cls in ui_panel.classes:
             bpy.utils.register_class(cls)
         _register_keymaps()
+        lod_manager.register()
+        region_regen.register()
+        generation_undo.register()
         print("PCG Level Blockout addon registered successfully")
     except Exception as e:
         print(f"PCG Level Blockout: Registration error - {e}")
@@ -80,6 +84,9 @@ def register():
 def unregister():
     """Unregister addon classes and properties"""
     try:
+        generation_undo.unregister()
+        region_regen.unregister()
+        lod_manager.unregister()
         _unregister_keymaps()
         for cls in reversed(ui_panel.classes):
             bpy.utils.unregister_class(cls)
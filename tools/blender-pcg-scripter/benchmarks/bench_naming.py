@@ -0,0 +1,89 @@
+"""Spawn-time benchmark: legacy fixed names vs. per-generation namespaces.
+
+Run inside Blender (no addon install needed)::
+
+    blender --background --factory-startup --python benchmarks/bench_naming.py -- 5000 8
+
+Arguments after ``--`` are objects per round (default 5000) and rounds
+(default 8). Each round spawns the same number of objects *without* deleting
+the previous rounds, which is what repeated Generates do while old output is
+still in the file.
+
+With legacy names (``Floor_0012_000`` reused every round) each new object has
+to resolve a ``.NNN`` suffix against every earlier round, so per-round time
+climbs with the round number. With :class:`NameAllocator` names every round
+takes roughly the same time, i.e. total spawn time is linear in the number of
+objects created.
+"""
+
+import importlib.util
+import os
+import sys
+import time
+
+import bpy
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_spec = importlib.util.spec_from_file_location(
+    "pcg_naming", os.path.join(_HERE, os.pardir, "core", "naming.py"))
+naming = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(naming)
+
+
+def _args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    per_round = int(argv[0]) if len(argv) > 0 else 5000
+    rounds = int(argv[1]) if len(argv) > 1 else 8
+    return per_round, rounds
+
+
+def _clear():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj, do_unlink=True)
+
+
+def _spawn_round(mesh, coll, names):
+    t0 = time.perf_counter()
+    for name in names:
+        coll.objects.link(bpy.data.objects.new(name, mesh))
+    return time.perf_counter() - t0
+
+
+def _run(label, per_round, rounds, make_names):
+    _clear()
+    mesh = bpy.data.meshes.new("BenchMesh")
+    coll = bpy.data.collections.new(f"Bench_{label}")
+    bpy.context.scene.collection.children.link(coll)
+    timings = []
+    for r in range(rounds):
+        timings.append(_spawn_round(mesh, coll, make_names(per_round)))
+    print(f"\n{label}: {per_round} objects x {rounds} rounds")
+    for r, t in enumerate(timings):
+        print(f"  round {r:2d}: {t * 1000.0:9.1f} ms"
+              f"  ({t / per_round * 1e6:6.2f} us/object)")
+    growth = timings[-1] / max(timings[0], 1e-9)
+    print(f"  last/first round ratio: {growth:.2f}x")
+    return timings
+
+
+def main():
+    per_round, rounds = _args()
+
+    def legacy(n):
+        return [f"Floor_{i // 8:04d}_{i % 8:03d}" for i in range(n)]
+
+    def namespaced(n):
+        alloc = naming.NameAllocator()
+        return alloc.piece_names([("floor", i // 8, i % 8) for i in range(n)])
+
+    legacy_t = _run("legacy", per_round, rounds, legacy)
+    ns_t = _run("namespaced", per_round, rounds, namespaced)
+    _clear()
+
+    print("\nSummary (total seconds):")
+    print(f"  legacy     {sum(legacy_t):8.3f}")
+    print(f"  namespaced {sum(ns_t):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""World-space chunk grid shared by the LOD manager and chunked output.
+
+Chunks are axis-aligned ``size x size`` squares on the XY plane, indexed by
+integer ``(cx, cy)`` with chunk ``(0, 0)`` covering ``[0, size)`` on both
+axes. Pure math, no ``bpy``.
+"""
+
+import math
+from typing import Tuple
+
+DEFAULT_CHUNK_SIZE = 64.0
+
+ChunkCoord = Tuple[int, int]
+
+
+def chunk_coord(x: float, y: float, size: float = DEFAULT_CHUNK_SIZE) -> ChunkCoord:
+    """Chunk index containing world point ``(x, y)``."""
+    return (math.floor(x / size), math.floor(y / size))
+
+
+def chunk_bounds(coord: ChunkCoord, size: float = DEFAULT_CHUNK_SIZE
+                 ) -> Tuple[float, float, float, float]:
+    """``(min_x, min_y, max_x, max_y)`` of chunk ``coord``."""
+    cx, cy = coord
+    return (cx * size, cy * size, (cx + 1) * size, (cy + 1) * size)
+
+
+def chunk_name(coord: ChunkCoord, prefix: str = "Chunk") -> str:
+    """Stable display name, e.g. ``Chunk_3_-2``."""
+    return f"{prefix}_{coord[0]}_{coord[1]}"
@@ -0,0 +1,200 @@
+"""Exact Euclidean distance transform over regular grids.
+
+Distances from every node of a ``(rows, cols)`` grid to the nearest feature
+node, with the index of that feature, in ``O(rows * cols)``:
+
+1. columns: for a binary feature mask the 1D transform is just the gap to
+   the nearest feature above or below, found with two running
+   max / min scans;
+2. rows: the lower envelope of parabolas ``dx^2 (j - p)^2 + g(p)`` of
+   Felzenszwalb & Huttenlocher, *Distance Transforms of Sampled Functions*
+   (2012), over the squared column distances ``g``.
+
+The envelope pass walks along a row once, but does so for every row at the
+same time: the per-step work is a handful of array operations over all rows,
+so the Python loop runs ``cols`` times, not ``rows * cols``.
+
+:func:`rasterize_polyline` turns a 3D polyline into the feature nodes, each
+remembering the exact polyline point (and its Z) that claimed it, so callers
+can measure true distances and read the nearest Z off the feature index.
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+Bounds = Tuple[float, float, float, float]   # (min_x, max_x, min_y, max_y)
+
+# Stand-in for "no feature" in the envelope pass: finite so differences
+# stay NaN-free, far above any squared distance on a real grid.
+_FAR = 1e30
+
+
+def grid_spacing(bounds: Bounds, rows: int, cols: int) -> Tuple[float, float]:
+    """``(dx, dy)`` between neighbouring nodes; 1.0 on a degenerate axis."""
+    min_x, max_x, min_y, max_y = bounds
+    dx = (max_x - min_x) / (cols - 1) if cols > 1 else 1.0
+    dy = (max_y - min_y) / (rows - 1) if rows > 1 else 1.0
+    return dx or 1.0, dy or 1.0
+
+
+def _segments(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Segment start / end points of a polyline; one point is one
+    zero-length segment."""
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(pts) == 1:
+        return pts, pts
+    return pts[:-1], pts[1:]
+
+
+def rasterize_polyline(points: np.ndarray, bounds: Bounds, rows: int, cols: int
+                       ) -> np.ndarray:
+    """Mark the grid nodes a 3D polyline passes over.
+
+    Segments are sampled at half the node spacing and each sample claims the
+    node it rounds to; samples outside the grid are dropped. Returns an
+    int64 ``(rows, cols)`` array holding, at feature nodes, the index of the
+    segment that claimed the node, and -1 elsewhere.
+    """
+    segment = np.full((rows, cols), -1, dtype=np.int64)
+    if len(points) == 0 or rows == 0 or cols == 0:
+        return segment
+
+    start, end = _segments(points)
+    min_x, _, min_y, _ = bounds
+    dx, dy = grid_spacing(bounds, rows, cols)
+    delta = end - start
+    length = np.hypot(delta[:, 0], delta[:, 1])
+    counts = np.maximum(1, np.ceil(length / (0.5 * min(dx, dy))).astype(np.int64))
+    seg_id = np.repeat(np.arange(len(start)), counts)
+    t = (np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)) \
+        / counts[seg_id]
+    seg_id = np.append(seg_id, len(start) - 1)
+    t = np.append(t, 1.0)
+    xy = start[seg_id, :2] + delta[seg_id, :2] * t[:, None]
+
+    j = np.rint((xy[:, 0] - min_x) / dx).astype(np.int64)
+    i = np.rint((xy[:, 1] - min_y) / dy).astype(np.int64)
+    inside = (i >= 0) & (i < rows) & (j >= 0) & (j < cols)
+    segment[i[inside], j[inside]] = seg_id[inside]
+    return segment
+
+
+def _column_pass(mask: np.ndarray, dy: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Squared distance to, and row of, the nearest feature in each column."""
+    rows = mask.shape[0]
+    r = np.arange(rows, dtype=np.int64)[:, None]
+    above = np.maximum.accumulate(np.where(mask, r, -1), axis=0)
+    below = np.minimum.accumulate(np.where(mask, r, rows)[::-1], axis=0)[::-1]
+    use_below = (above < 0) | ((below < rows) & (below - r < r - above))
+    nearest = np.where(use_below, below, above)
+    missing = (nearest < 0) | (nearest >= rows)
+    g = ((r - nearest) * dy).astype(np.float64) ** 2
+    g[missing] = _FAR
+    nearest[missing] = 0
+    return g, nearest
+
+
+def _envelope_pass(f: np.ndarray, dx: float) -> Tuple[np.ndarray, np.ndarray]:
+    """``min_p dx^2 (q - p)^2 + f[:, p]`` and its argmin, for every row."""
+    n_lines, n = f.shape
+    f = f / (dx * dx)                          # work in index units
+    lines = np.arange(n_lines)
+    v = np.zeros((n_lines, n), dtype=np.int64)  # parabola apexes
+    z = np.empty((n_lines, n + 1))              # envelope breakpoints
+    z[:, 0] = -np.inf
+    z[:, 1] = np.inf
+    k = np.zeros(n_lines, dtype=np.int64)
+
+    for q in range(1, n):
+        fq = f[:, q] + q * q
+        while True:
+            vk = v[lines, k]
+            s = (fq - (f[lines, vk] + vk * vk)) / (2.0 * (q - vk))
+            pop = s <= z[lines, k]
+            if not pop.any():
+                break
+            k[pop] -= 1
+        k += 1
+        v[lines, k] = q
+        z[lines, k] = s
+        z[lines, k + 1] = np.inf
+
+    d = np.empty((n_lines, n))
+    arg = np.empty((n_lines, n), dtype=np.int64)
+    k[:] = 0
+    for q in range(n):
+        while True:
+            step = z[lines, k + 1] < q
+            if not step.any():
+                break
+            k[step] += 1
+        vk = v[lines, k]
+        arg[:, q] = vk
+        d[:, q] = (q - vk) ** 2 + f[lines, vk]
+    return d * (dx * dx), arg
+
+
+def distance_transform(mask: np.ndarray, spacing: Tuple[float, float] = (1.0, 1.0)
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Exact Euclidean distance from every node to the nearest ``mask`` node.
+
+    ``spacing`` is ``(dx, dy)``: node distance along columns (j) and rows
+    (i). Returns float32 distances (``inf`` everywhere when ``mask`` is
+    empty) and the row / column index of the nearest feature node.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    rows, cols = mask.shape
+    if not mask.any():
+        zeros = np.zeros((rows, cols), dtype=np.int64)
+        return np.full((rows, cols), np.inf, dtype=np.float32), zeros, zeros.copy()
+    dx, dy = spacing
+    g, nearest_row = _column_pass(mask, dy)
+    d2, nearest_col = _envelope_pass(g, dx)
+    nearest_row = np.take_along_axis(nearest_row, nearest_col, axis=1)
+    return np.sqrt(d2).astype(np.float32), nearest_row, nearest_col
+
+
+def polyline_distance_field(points: np.ndarray, bounds: Bounds, rows: int, cols: int
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+    """Distance to and Z of the nearest polyline point for every grid node.
+
+    The feature index from :func:`distance_transform` names the segment
+    that claimed the nearest feature node. Distance is then measured
+    exactly, in XY, to that segment and its two neighbours, so it is not
+    snapped to the grid; Z is interpolated at the closest point. Returns
+    float32 ``(nearest_z, nearest_dist)``.
+    """
+    far = (np.zeros((rows, cols), dtype=np.float32),
+           np.full((rows, cols), np.inf, dtype=np.float32))
+    if rows == 0 or cols == 0 or len(points) == 0:
+        return far
+    segment = rasterize_polyline(points, bounds, rows, cols)
+    mask = segment >= 0
+    if not mask.any():
+        return far
+    _, nearest_row, nearest_col = distance_transform(
+        mask, grid_spacing(bounds, rows, cols))
+    claimed = segment[nearest_row, nearest_col]
+
+    start, end = _segments(points)
+    delta = end - start
+    len2 = np.maximum(delta[:, 0] ** 2 + delta[:, 1] ** 2, 1e-12)
+    min_x, max_x, min_y, max_y = bounds
+    x = np.linspace(min_x, max_x, cols)[None, :]
+    y = np.linspace(min_y, max_y, rows)[:, None]
+    best_d2 = np.full((rows, cols), np.inf)
+    best_z = np.zeros((rows, cols))
+    for shift in (-1, 0, 1):
+        s = np.clip(claimed + shift, 0, len(start) - 1)
+        t = ((x - start[s, 0]) * delta[s, 0] + (y - start[s, 1]) * delta[s, 1]) / len2[s]
+        np.clip(t, 0.0, 1.0, out=t)
+        px = start[s, 0] + delta[s, 0] * t
+        py = start[s, 1] + delta[s, 1] * t
+        d2 = (x - px) ** 2 + (y - py) ** 2
+        closer = d2 < best_d2
+        best_d2[closer] = d2[closer]
+        best_z[closer] = (start[s, 2] + delta[s, 2] * t)[closer]
+    return best_z.astype(np.float32), np.sqrt(best_d2).astype(np.float32)
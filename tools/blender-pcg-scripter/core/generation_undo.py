@@ -0,0 +1,72 @@
+"""Plan-based undo for light generation.
+
+The light Generate operator (``pcg.generate_light``) skips Blender's global
+undo push, whose memfile snapshot after tens of thousands of new objects
+costs seconds and doubles memory. Instead every run records one small
+:class:`UndoEntry`: the name of the generation root it created, the panel
+parameters from before the run and the region-regeneration session that was
+current. ``pcg.undo_generation`` pops the newest entry whose root still
+exists, deletes that generation and restores the parameters and the session,
+so Regenerate Region keeps working on the previous output.
+
+Sessions hold a whole layout, so only the newest entry keeps one; older
+entries restore parameters only. The stack is cleared on file load.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import bpy
+from bpy.app.handlers import persistent
+
+MAX_UNDO_ENTRIES = 10
+
+
+@dataclass
+class UndoEntry:
+    root_name: str                 # PCG_Generation_* collection to delete
+    params: Dict[str, Any]         # PG to_dict() from before the run
+    session: Any = None            # region_regen.GenerationSession or None
+
+
+_stack: List[UndoEntry] = []
+
+
+def push(root_name: str, params: Dict[str, Any], session: Any = None) -> None:
+    for entry in _stack:
+        entry.session = None
+    _stack.append(UndoEntry(root_name, params, session))
+    del _stack[:-MAX_UNDO_ENTRIES]
+
+
+def pop() -> Optional[UndoEntry]:
+    """Newest entry whose generation still exists; stale ones are dropped."""
+    while _stack:
+        entry = _stack.pop()
+        if entry.root_name in bpy.data.collections:
+            return entry
+    return None
+
+
+def depth() -> int:
+    return sum(1 for e in _stack if e.root_name in bpy.data.collections)
+
+
+def clear() -> None:
+    _stack.clear()
+
+
+@persistent
+def _clear_on_load(*_args) -> None:
+    clear()
+
+
+def register() -> None:
+    if _clear_on_load not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_on_load)
+
+
+def unregister() -> None:
+    if _clear_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_on_load)
+    clear()
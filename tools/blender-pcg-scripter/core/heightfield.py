@@ -0,0 +1,248 @@
+"""Heightfield math shared by TerrainGenerator and the terrain tile workers.
+
+Everything here is plain NumPy on float32 ``(rows, cols)`` arrays, with row
+``i`` along +Y and column ``j`` along +X of ``(min_x, max_x, min_y, max_y)``
+bounds. Nothing imports ``bpy``, so tile worker processes can load this
+module outside Blender.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from .noise import fbm
+
+Bounds = Tuple[float, float, float, float]   # (min_x, max_x, min_y, max_y)
+
+# Heightmap noise: metres per base-octave cycle and octave count. Smoothness
+# maps onto the per-octave gain (0 -> rough 0.65, 1 -> gentle 0.2).
+TERRAIN_FEATURE_SIZE = 64.0
+TERRAIN_OCTAVES = 5
+
+# Road trench under the road mesh: extra half width beyond the mesh edge,
+# depth below the mesh, and the width of the ramp back up to the terrain.
+TRENCH_SHOULDER = 0.5
+TRENCH_EXTRA_DEPTH = 0.2
+TRENCH_BLEND = 1.5
+
+# Flat zones: width of the ramp from a cell footprint back to the terrain,
+# and how many zones are rasterized per batch (bounds scratch memory).
+FLAT_ZONE_FEATHER = 1.5
+_ZONE_BATCH = 2048
+
+
+def grid_axes(bounds: Bounds, rows: int, cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """World X of every column and world Y of every row (float64)."""
+    min_x, max_x, min_y, max_y = bounds
+    return np.linspace(min_x, max_x, cols), np.linspace(min_y, max_y, rows)
+
+
+def grid_normals(heightmap: np.ndarray, bounds: Bounds) -> np.ndarray:
+    """Unit surface normals of the heightfield, ``(rows, cols, 3)`` float32.
+
+    Slopes are central differences (one-sided on the border).
+    """
+    rows, cols = heightmap.shape
+    xs, ys = grid_axes(bounds, rows, cols)
+    normals = np.empty((rows, cols, 3), dtype=np.float32)
+    normals[..., 0] = -np.gradient(heightmap, xs, axis=1) if cols > 1 else 0.0
+    normals[..., 1] = -np.gradient(heightmap, ys, axis=0) if rows > 1 else 0.0
+    normals[..., 2] = 1.0
+    normals /= np.linalg.norm(normals, axis=2, keepdims=True)
+    return normals
+
+
+def noise_heightmap(bounds: Bounds, rows: int, cols: int, seed: int,
+                    height_variation: float, smoothness: float) -> np.ndarray:
+    """fBm terrain sampled at world positions; same point, same height."""
+    xs, ys = grid_axes(bounds, rows, cols)
+    smoothness = min(1.0, max(0.0, smoothness))
+    heightmap = fbm(xs[None, :], ys[:, None], seed=seed or 0,
+                    octaves=TERRAIN_OCTAVES,
+                    frequency=1.0 / TERRAIN_FEATURE_SIZE,
+                    gain=0.65 - 0.45 * smoothness)
+    heightmap *= height_variation
+    return heightmap
+
+
+@dataclass(frozen=True)
+class SplineShaping:
+    """One shaping stage driven by the spline distance field.
+
+    Pulls the terrain towards ``nearest_z + offset`` with a weight that is
+    1 within ``inner`` metres of the spline and falls linearly to 0 at
+    ``outer``. Cells at ``outer`` or further are untouched, so ``outer`` is
+    the stage's reach; a stage with ``outer <= inner`` does nothing.
+    """
+
+    offset: float
+    inner: float
+    outer: float
+
+
+def spline_blend(blend_distance: float) -> SplineShaping:
+    """Fully at the spline Z on the spline, fading out over ``blend_distance``."""
+    return SplineShaping(0.0, 0.0, blend_distance)
+
+
+def road_flatten(road_width: float) -> SplineShaping:
+    """Snap to the spline Z within ``road_width / 2``, easing back to the
+    terrain by ``road_width``."""
+    return SplineShaping(0.0, road_width * 0.5, road_width)
+
+
+def road_trench(road_mesh_width: float, road_height_offset: float) -> SplineShaping:
+    """Sink the terrain under the road mesh so it never pokes through."""
+    half = road_mesh_width * 0.5 + TRENCH_SHOULDER
+    return SplineShaping(-(road_height_offset + TRENCH_EXTRA_DEPTH), half,
+                         half + TRENCH_BLEND)
+
+
+def shape_along_spline(heightmap: np.ndarray, nearest_z: np.ndarray,
+                       nearest_dist: np.ndarray,
+                       stages: Sequence[SplineShaping]) -> np.ndarray:
+    """Apply ``stages`` in order, touching only cells within their reach.
+
+    The cells within the largest reach are gathered once into flat arrays;
+    each stage then updates the subset inside its own reach, and the result
+    is scattered back in one step. Far from the road, which is most of the
+    grid, no stage costs more than the one distance comparison.
+    Modifies ``heightmap`` in place.
+    """
+    stages = [st for st in stages if st.outer > st.inner]
+    if not stages:
+        return heightmap
+    mask = nearest_dist < max(st.outer for st in stages)
+    if not mask.any():
+        return heightmap
+    h = heightmap[mask]
+    z = nearest_z[mask]
+    d = nearest_dist[mask]
+    for st in stages:
+        near = d < st.outer
+        dn = d[near]
+        w = np.clip((st.outer - dn) / np.float32(st.outer - st.inner), 0.0, 1.0)
+        hn = h[near]
+        hn += (z[near] + np.float32(st.offset) - hn) * w
+        h[near] = hn
+    heightmap[mask] = h
+    return heightmap
+
+
+def blend_to_spline(heightmap: np.ndarray, nearest_z: np.ndarray,
+                    nearest_dist: np.ndarray, blend_distance: float) -> np.ndarray:
+    """:func:`spline_blend` on its own. Modifies ``heightmap`` in place."""
+    return shape_along_spline(heightmap, nearest_z, nearest_dist,
+                              [spline_blend(blend_distance)])
+
+
+def flatten_road(heightmap: np.ndarray, nearest_z: np.ndarray,
+                 nearest_dist: np.ndarray, road_width: float) -> np.ndarray:
+    """:func:`road_flatten` on its own. Modifies ``heightmap`` in place."""
+    return shape_along_spline(heightmap, nearest_z, nearest_dist,
+                              [road_flatten(road_width)])
+
+
+def carve_trench(heightmap: np.ndarray, nearest_z: np.ndarray,
+                 nearest_dist: np.ndarray, road_mesh_width: float,
+                 road_height_offset: float) -> np.ndarray:
+    """:func:`road_trench` on its own. Modifies ``heightmap`` in place."""
+    return shape_along_spline(heightmap, nearest_z, nearest_dist,
+                              [road_trench(road_mesh_width, road_height_offset)])
+
+
+def trench_reach(road_mesh_width: float) -> float:
+    """Distance from the spline beyond which :func:`carve_trench` is a no-op."""
+    return road_trench(road_mesh_width, 0.0).outer
+
+
+@dataclass(frozen=True)
+class FlatZones:
+    """Oriented rectangles to level the terrain to, as parallel arrays."""
+
+    centers: np.ndarray        # (n, 3) world XY of the centre, Z = ground level
+    half_extents: np.ndarray   # (n, 2) half size along the local X / Y axes
+    yaw: np.ndarray            # (n,) rotation of the local frame about Z
+
+    def __len__(self) -> int:
+        return int(self.centers.shape[0])
+
+
+def rasterize_flat_zones(zones: FlatZones, bounds: Bounds, rows: int, cols: int,
+                         feather: float = FLAT_ZONE_FEATHER
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """Target height and blend weight of the flat zones on the grid.
+
+    A zone's weight is 1 on its footprint and falls linearly to 0 at
+    ``feather`` outside it. Only each zone's bounding box is visited: every
+    zone gets the same window of nodes (sized for the largest zone), so a
+    batch of zones is one array expression. Where zones overlap, the
+    strongest zone sets both the weight and the target; ties go to the
+    later zone.
+
+    Returns float32 ``(target, weight)``; weight is 0 outside every zone.
+    """
+    target = np.zeros((rows, cols), dtype=np.float32)
+    weight = np.zeros((rows, cols), dtype=np.float32)
+    n = len(zones)
+    if n == 0 or rows == 0 or cols == 0:
+        return target, weight
+
+    min_x, _, min_y, _ = bounds
+    xs, ys = grid_axes(bounds, rows, cols)
+    dx = xs[1] - xs[0] if cols > 1 else 1.0
+    dy = ys[1] - ys[0] if rows > 1 else 1.0
+    cos_o = np.cos(zones.yaw)
+    sin_o = np.sin(zones.yaw)
+    hx, hy = zones.half_extents[:, 0], zones.half_extents[:, 1]
+    # Half size of each zone's axis-aligned bounding box, feather included.
+    ex = np.abs(cos_o) * hx + np.abs(sin_o) * hy + feather
+    ey = np.abs(sin_o) * hx + np.abs(cos_o) * hy + feather
+    cx, cy = zones.centers[:, 0], zones.centers[:, 1]
+    j0 = np.floor((cx - ex - min_x) / dx).astype(np.int64)
+    i0 = np.floor((cy - ey - min_y) / dy).astype(np.int64)
+    kx = np.arange(int(np.ceil(2.0 * ex.max() / dx)) + 2)
+    ky = np.arange(int(np.ceil(2.0 * ey.max() / dy)) + 2)
+
+    for lo in range(0, n, _ZONE_BATCH):
+        b = slice(lo, min(n, lo + _ZONE_BATCH))
+        i = i0[b, None, None] + ky[None, :, None]              # (m, ky, 1)
+        j = j0[b, None, None] + kx[None, None, :]              # (m, 1, kx)
+        px = min_x + j * dx - cx[b, None, None]
+        py = min_y + i * dy - cy[b, None, None]
+        c = cos_o[b, None, None]
+        sn = sin_o[b, None, None]
+        du = np.maximum(np.abs(px * c + py * sn) - hx[b, None, None], 0.0)
+        dv = np.maximum(np.abs(py * c - px * sn) - hy[b, None, None], 0.0)
+        w = 1.0 - np.hypot(du, dv) / feather if feather > 0.0 \
+            else (du + dv == 0.0).astype(np.float64)
+        i, j = np.broadcast_arrays(i, j)
+        keep = (w > 0.0) & (i >= 0) & (i < rows) & (j >= 0) & (j < cols)
+        flat = (i * cols + j)[keep]
+        w = np.minimum(w, 1.0)[keep].astype(np.float32)
+        z = np.broadcast_to(zones.centers[b, 2, None, None], keep.shape)[keep]
+        # Strongest zone per node: sort by node, then weight; last of a run wins.
+        order = np.lexsort((w, flat))
+        flat, w, z = flat[order], w[order], z[order]
+        last = np.append(flat[1:] != flat[:-1], True)
+        flat, w, z = flat[last], w[last], z[last]
+        stronger = w >= weight.ravel()[flat]
+        weight.ravel()[flat[stronger]] = w[stronger]
+        target.ravel()[flat[stronger]] = z[stronger]
+    return target, weight
+
+
+def flatten_zones(heightmap: np.ndarray, zones: FlatZones, bounds: Bounds,
+                  feather: float = FLAT_ZONE_FEATHER) -> np.ndarray:
+    """Level the terrain to the flat zones in one blend over the nodes they
+    touch. Modifies ``heightmap`` in place."""
+    rows, cols = heightmap.shape
+    target, weight = rasterize_flat_zones(zones, bounds, rows, cols, feather)
+    mask = weight > 0.0
+    h = heightmap[mask]
+    h += (target[mask] - h) * weight[mask]
+    heightmap[mask] = h
+    return heightmap
@@ -0,0 +1,162 @@
+"""Heightmap export to 16-bit RAW and PNG for engine terrain import.
+
+Heights are mapped linearly onto ``0..65535`` between the heightmap's lowest
+and highest point; the JSON sidecar next to the images records that range,
+the world bounds and the grid spacing, so an importer can rebuild the
+terrain at its real size. Images are written north-up: the first row is
+the terrain's max Y edge, the first column its min X edge, as seen in
+Blender's top view.
+
+Everything works in strips of :data:`STRIP_ROWS` rows. The RAW file is a
+``numpy.memmap`` filled strip by strip, and the PNG encoder filters and
+deflates one strip at a time into its own ``IDAT`` chunk, so a memory-mapped
+source heightmap (see :mod:`.terrain_cache`) is never loaded whole and no
+full-size image ever exists in memory. PNG encoding uses only ``zlib``.
+"""
+
+import json
+import os
+import struct
+import zlib
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+Bounds = Tuple[float, float, float, float]   # (min_x, max_x, min_y, max_y)
+
+STRIP_ROWS = 256
+FORMAT_RAW16 = "RAW16"
+FORMAT_PNG16 = "PNG16"
+
+_EXTENSIONS = {FORMAT_RAW16: ".r16", FORMAT_PNG16: ".png"}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_FILTER_UP = 2
+# Unreal landscapes span 512 m of height at Z scale 100.
+_UNREAL_RANGE_AT_SCALE_100 = 512.0
+
+
+def height_range(heightmap: np.ndarray, strip_rows: int = STRIP_ROWS) -> Tuple[float, float]:
+    """Lowest and highest height, scanned strip by strip."""
+    lo, hi = np.inf, -np.inf
+    for r0 in range(0, heightmap.shape[0], strip_rows):
+        strip = heightmap[r0:r0 + strip_rows]
+        lo = min(lo, float(strip.min()))
+        hi = max(hi, float(strip.max()))
+    return lo, hi
+
+
+def _north_first(heightmap: np.ndarray, strip_rows: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """``(first image row, rows)`` strips, image row 0 = heightmap's last row."""
+    rows = heightmap.shape[0]
+    for r0 in range(0, rows, strip_rows):
+        hi = rows - r0
+        yield r0, heightmap[max(0, hi - strip_rows):hi][::-1]
+
+
+def _quantize(strip: np.ndarray, z_min: float, z_max: float) -> np.ndarray:
+    scale = 65535.0 / (z_max - z_min) if z_max > z_min else 0.0
+    q = (np.asarray(strip, dtype=np.float64) - z_min) * scale
+    return np.clip(np.rint(q), 0, 65535).astype(np.uint16)
+
+
+def write_raw16(path: str, heightmap: np.ndarray, z_min: float, z_max: float,
+                strip_rows: int = STRIP_ROWS) -> str:
+    """Headerless little-endian 16-bit samples, row-major, north-up."""
+    out = np.memmap(path, dtype="<u2", mode="w+", shape=heightmap.shape)
+    try:
+        for r0, strip in _north_first(heightmap, strip_rows):
+            out[r0:r0 + len(strip)] = _quantize(strip, z_min, z_max)
+        out.flush()
+    finally:
+        del out
+    return path
+
+
+def _png_chunk(f, kind: bytes, data: bytes) -> None:
+    f.write(struct.pack(">I", len(data)))
+    f.write(kind)
+    f.write(data)
+    f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+
+def write_png16(path: str, heightmap: np.ndarray, z_min: float, z_max: float,
+                strip_rows: int = STRIP_ROWS, level: int = 6) -> str:
+    """16-bit grayscale PNG, north-up.
+
+    Every scanline uses the *Up* filter (difference to the row above), which
+    turns smooth terrain into long runs of small bytes that deflate well.
+    """
+    rows, cols = heightmap.shape
+    deflate = zlib.compressobj(level)
+    previous = np.zeros(cols * 2, dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(_PNG_SIGNATURE)
+        _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", cols, rows, 16, 0, 0, 0, 0))
+        for _, strip in _north_first(heightmap, strip_rows):
+            lines = _quantize(strip, z_min, z_max).astype(">u2").view(np.uint8)
+            lines = lines.reshape(len(strip), cols * 2)
+            filtered = np.empty((len(strip), cols * 2 + 1), dtype=np.uint8)
+            filtered[:, 0] = _PNG_FILTER_UP
+            np.subtract(lines[0], previous, out=filtered[0, 1:])
+            np.subtract(lines[1:], lines[:-1], out=filtered[1:, 1:])
+            previous = lines[-1].copy()
+            data = deflate.compress(filtered.tobytes())
+            if data:
+                _png_chunk(f, b"IDAT", data)
+        _png_chunk(f, b"IDAT", deflate.flush())
+        _png_chunk(f, b"IEND", b"")
+    return path
+
+
+def write_sidecar(path: str, bounds: Bounds, shape: Tuple[int, int],
+                  z_min: float, z_max: float, files: Dict[str, str]) -> str:
+    """JSON description of the exported images."""
+    rows, cols = shape
+    min_x, max_x, min_y, max_y = bounds
+    z_range = z_max - z_min
+    meta = {
+        "width": cols,
+        "height": rows,
+        "bounds": {"min_x": min_x, "max_x": max_x, "min_y": min_y, "max_y": max_y},
+        "spacing": [(max_x - min_x) / max(cols - 1, 1), (max_y - min_y) / max(rows - 1, 1)],
+        "z_min": z_min,
+        "z_max": z_max,
+        "z_scale": z_range / 65535.0,       # metres per 16-bit step
+        "row_order": "north_first",
+        "raw_byte_order": "little",
+        "unreal_z_scale": z_range * 100.0 / _UNREAL_RANGE_AT_SCALE_100,
+        "files": files,
+    }
+    with open(path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+def export_heightmap(heightmap: np.ndarray, bounds: Bounds, stem: str,
+                     formats: Sequence[str] = (FORMAT_RAW16, FORMAT_PNG16),
+                     strip_rows: int = STRIP_ROWS) -> List[str]:
+    """
+    Write ``heightmap`` as ``<stem>.r16`` / ``<stem>.png`` plus ``<stem>.json``.
+
+    Args:
+        heightmap: ``(rows, cols)`` heights; may be a read-only memory map
+        bounds: (min_x, max_x, min_y, max_y) terrain boundaries
+        stem: Output path without extension
+        formats: Any of :data:`FORMAT_RAW16`, :data:`FORMAT_PNG16`
+        strip_rows: Rows converted at a time
+
+    Returns:
+        Paths written, sidecar last
+    """
+    writers = {FORMAT_RAW16: write_raw16, FORMAT_PNG16: write_png16}
+    os.makedirs(os.path.dirname(os.path.abspath(stem)), exist_ok=True)
+    z_min, z_max = height_range(heightmap, strip_rows)
+    written = []
+    files = {}
+    for fmt in formats:
+        path = stem + _EXTENSIONS[fmt]
+        written.append(writers[fmt](path, heightmap, z_min, z_max, strip_rows))
+        files[fmt] = os.path.basename(path)
+    written.append(write_sidecar(stem + ".json", bounds, heightmap.shape,
+                                 z_min, z_max, files))
+    return written
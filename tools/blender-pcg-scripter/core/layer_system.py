@@ -13,6 +13,7 @@ class PlacementRule(Enum):
     FILL_GRID = "FILL_GRID"  # Fill the interior space on a grid
     SCATTER = "SCATTER"      # Randomly scatter objects
     CENTER_LINE = "CENTER_LINE" # Place along the center spline
+    POISSON_DISK = "POISSON_DISK"  # Level-wide blue-noise scatter (min distance)
 
 
 class CellTarget(Enum):
@@ -29,6 +30,19 @@ class CellTarget(Enum):
     LATERAL_ONLY = "LATERAL_ONLY"
 
 
+class CollisionMode(Enum):
+    """What a decoration layer's props refuse to overlap.
+
+    ``STRUCTURE`` keeps props out of walls, pillars, doorway passages and
+    ramps / stairs. ``ALL`` additionally rejects props that would overlap a
+    prop already placed (by this or an earlier layer). ``NONE`` is the legacy
+    free placement.
+    """
+    NONE = "NONE"
+    STRUCTURE = "STRUCTURE"
+    ALL = "ALL"
+
+
 @dataclass
 class LayerConfig:
     """Configuration for a single generation layer."""
@@ -43,17 +57,25 @@ class LayerConfig:
     density: float = 1.0
     offset: float = 0.0
     z_offset: float = 0.0
+    # POISSON_DISK spacing; 0 derives it from density.
+    min_distance: float = 0.0
 
     # Cell-role filter: which cells this layer is allowed to populate.
     # Defaults to OFF_ROAD so the spline corridor stays unobstructed.
     cell_target: CellTarget = CellTarget.OFF_ROAD
 
+    # Collision rejection against the blockout / other props.
+    collision_mode: CollisionMode = CollisionMode.STRUCTURE
+
     # Randomization
     random_rotation: bool = False
     random_scale: bool = False
     scale_min: float = 0.8
     scale_max: float = 1.2
 
+    # Weight when the global prop budget (GenerationParams.max_props) bites.
+    priority: float = 1.0
+
     def to_dict(self) -> dict:
         return {
             "name": self.name,
@@ -63,11 +85,14 @@ class LayerConfig:
             "density": self.density,
             "offset": self.offset,
             "z_offset": self.z_offset,
+            "min_distance": self.min_distance,
             "cell_target": self.cell_target.value,
+            "collision_mode": self.collision_mode.value,
             "random_rotation": self.random_rotation,
             "random_scale": self.random_scale,
             "scale_min": self.scale_min,
-            "scale_max": self.scale_max
+            "scale_max": self.scale_max,
+            "priority": self.priority,
         }
 
     @classmethod
@@ -80,14 +105,21 @@ class LayerConfig:
         layer.density = data.get("density", 1.0)
         layer.offset = data.get("offset", 0.0)
         layer.z_offset = data.get("z_offset", 0.0)
+        layer.min_distance = data.get("min_distance", 0.0)
         # Legacy presets without cell_target default to OFF_ROAD so previously
         # placed scenes that fenced the road get cleaned up automatically.
         try:
             layer.cell_target = CellTarget(data.get("cell_target", "OFF_ROAD"))
         except ValueError:
             layer.cell_target = CellTarget.OFF_ROAD
+        try:
+            layer.collision_mode = CollisionMode(
+                data.get("collision_mode", "STRUCTURE"))
+        except ValueError:
+            layer.collision_mode = CollisionMode.STRUCTURE
         layer.random_rotation = data.get("random_rotation", False)
         layer.random_scale = data.get("random_scale", False)
         layer.scale_min = data.get("scale_min", 0.8)
         layer.scale_max = data.get("scale_max", 1.2)
+        layer.priority = data.get("priority", 1.0)
         return layer
@@ -0,0 +1,279 @@
+"""Distance-based viewport LOD for generated levels.
+
+Objects of the newest ``PCG_Generation_*`` collection are grouped into
+world chunks (:mod:`.chunking`). A throttled ``bpy.app.timers`` callback
+reads the active 3D view's eye position and switches every chunk farther
+than ``lod_distance`` to a cheap representation:
+
+* ``BOUNDS`` -- each object draws as its bounding box
+  (``display_type = 'BOUNDS'``); nothing is created.
+* ``PROXY`` -- the chunk's objects are hidden and one merged mesh of their
+  oriented bounding boxes is shown instead, so a far chunk costs a single
+  draw call. Proxies are built lazily the first time a chunk goes far and
+  live in a ``LOD_Proxies`` collection under the generation root.
+
+Chunk distances are evaluated with numpy in one pass, with a small
+hysteresis band so chunks on the threshold do not flicker. Ticks where the
+view has not moved and the settings are unchanged do no work. The registry
+is rebuilt automatically when a new generation appears.
+
+Settings come from ``scene.pcg_props`` (``lod_enabled``, ``lod_distance``,
+``lod_mode``, ``chunk_size``) on every tick, so panel edits apply
+immediately. The chunk size is shared with chunked output, so LOD chunks
+line up with the ``Chunk_x_y`` collections when those are enabled.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import bpy
+import numpy as np
+
+from ..generators.collision import COLLISION_COLLECTION_NAME
+from .chunking import DEFAULT_CHUNK_SIZE, ChunkCoord, chunk_coord, chunk_name
+
+LOD_BOUNDS = "BOUNDS"
+LOD_PROXY = "PROXY"
+
+PROXY_COLLECTION_NAME = "LOD_Proxies"
+
+_TICK_INTERVAL = 0.25     # seconds between evaluations while enabled
+_IDLE_INTERVAL = 1.0      # seconds between checks while disabled
+_HYSTERESIS = 0.1         # fraction of lod_distance
+_MOVE_EPSILON = 0.5       # view movement (m) that triggers re-evaluation
+
+# Bottom ring 0-3 and top ring 4-7, both CCW seen from above; outward winding.
+_BOX_FACES = (
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+)
+
+
+class _Chunk:
+    __slots__ = ("coord", "objects", "display_types", "far", "proxy")
+
+    def __init__(self, coord: ChunkCoord):
+        self.coord = coord
+        self.objects: List[bpy.types.Object] = []
+        self.display_types: List[str] = []
+        self.far = False
+        self.proxy: Optional[bpy.types.Object] = None
+
+
+class LODManager:
+    """Chunk registry plus the far / near switching logic."""
+
+    def __init__(self, chunk_size: float = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.root_name: Optional[str] = None
+        self.chunks: List[_Chunk] = []
+        self._centers = np.zeros((0, 3))
+        self._radii = np.zeros(0)
+        self._mode: Optional[str] = None
+        self._last_eye: Optional[np.ndarray] = None
+        self._last_distance = -1.0
+
+    # ------------------------------------------------------------ registry
+
+    @staticmethod
+    def latest_root() -> Optional[bpy.types.Collection]:
+        roots = [c for c in bpy.data.collections
+                 if c.name.startswith("PCG_Generation_")]
+        return max(roots, key=lambda c: c.name) if roots else None
+
+    def rebuild(self, root: bpy.types.Collection) -> None:
+        """Group ``root``'s mesh objects (proxies, colliders excluded) into chunks."""
+        self.clear()
+        self.root_name = root.name
+        proxies = bpy.data.collections.get(PROXY_COLLECTION_NAME)
+        skip = set(proxies.all_objects) if proxies is not None else set()
+        for child in root.children:
+            if child.name.startswith(COLLISION_COLLECTION_NAME):
+                skip.update(child.all_objects)
+        by_coord: Dict[ChunkCoord, _Chunk] = {}
+        lo: Dict[ChunkCoord, np.ndarray] = {}
+        hi: Dict[ChunkCoord, np.ndarray] = {}
+        size = self.chunk_size
+        for obj in root.all_objects:
+            if obj.type != 'MESH' or obj in skip:
+                continue
+            loc = obj.location
+            coord = chunk_coord(loc.x, loc.y, size)
+            chunk = by_coord.get(coord)
+            if chunk is None:
+                chunk = by_coord[coord] = _Chunk(coord)
+                lo[coord] = np.full(3, np.inf)
+                hi[coord] = np.full(3, -np.inf)
+            chunk.objects.append(obj)
+            chunk.display_types.append(obj.display_type)
+            half = np.asarray(obj.dimensions) * 0.5
+            p = np.asarray(loc)
+            np.minimum(lo[coord], p - half, out=lo[coord])
+            np.maximum(hi[coord], p + half, out=hi[coord])
+        self.chunks = list(by_coord.values())
+        if self.chunks:
+            lows = np.array([lo[c.coord] for c in self.chunks])
+            highs = np.array([hi[c.coord] for c in self.chunks])
+            self._centers = (lows + highs) * 0.5
+            self._radii = np.linalg.norm(highs - lows, axis=1) * 0.5
+        else:
+            self._centers = np.zeros((0, 3))
+            self._radii = np.zeros(0)
+        self._last_eye = None
+
+    def clear(self) -> None:
+        """Restore every chunk, delete built proxies and empty the registry."""
+        self.restore_all()
+        for chunk in self.chunks:
+            proxy = chunk.proxy
+            chunk.proxy = None
+            if proxy is None:
+                continue
+            try:
+                mesh = proxy.data
+                bpy.data.objects.remove(proxy, do_unlink=True)
+                if mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
+            except ReferenceError:
+                pass
+        self.root_name = None
+        self.chunks = []
+        self._centers = np.zeros((0, 3))
+        self._radii = np.zeros(0)
+
+    # ------------------------------------------------------------ switching
+
+    def update(self, eye: np.ndarray, distance: float, mode: str) -> None:
+        """Switch chunks whose near / far state changed for ``eye``."""
+        if mode != self._mode:
+            self.restore_all()
+            self._mode = mode
+            self._last_eye = None
+        if (self._last_eye is not None and distance == self._last_distance
+                and np.linalg.norm(eye - self._last_eye) < _MOVE_EPSILON):
+            return
+        self._last_eye = eye
+        self._last_distance = distance
+        if not self.chunks:
+            return
+        gap = np.linalg.norm(self._centers - eye, axis=1) - self._radii
+        far_now = np.array([c.far for c in self.chunks])
+        band = distance * _HYSTERESIS
+        want_far = np.where(far_now, gap > distance - band, gap > distance + band)
+        for i in np.flatnonzero(want_far != far_now):
+            self._set_far(self.chunks[i], bool(want_far[i]))
+
+    def restore_all(self) -> None:
+        for chunk in self.chunks:
+            if chunk.far:
+                self._set_far(chunk, False)
+
+    def _set_far(self, chunk: _Chunk, far: bool) -> None:
+        try:
+            if self._mode == LOD_PROXY:
+                if far and chunk.proxy is None:
+                    chunk.proxy = self._build_proxy(chunk)
+                if chunk.proxy is not None:
+                    chunk.proxy.hide_set(not far)
+                for obj in chunk.objects:
+                    obj.hide_set(far)
+            else:
+                for obj, original in zip(chunk.objects, chunk.display_types):
+                    obj.display_type = 'BOUNDS' if far else original
+        except ReferenceError:
+            # Objects were deleted behind our back; drop the chunk's state
+            # and let the next registry rebuild pick up whatever remains.
+            self.root_name = None
+        chunk.far = far
+
+    def _build_proxy(self, chunk: _Chunk) -> Optional[bpy.types.Object]:
+        """One mesh holding every object's world-space bounding box."""
+        boxes = []
+        for obj in chunk.objects:
+            mw = np.array(obj.matrix_world)
+            local = np.array([tuple(c) for c in obj.bound_box])
+            # bound_box corner order -> quad-friendly ring order.
+            local = local[[0, 4, 7, 3, 1, 5, 6, 2]]
+            boxes.append(local @ mw[:3, :3].T + mw[:3, 3])
+        if not boxes:
+            return None
+        verts = np.concatenate(boxes)
+        faces = [tuple(base + i for i in face)
+                 for base in range(0, len(verts), 8) for face in _BOX_FACES]
+        name = chunk_name(chunk.coord, "LOD")
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(verts.tolist(), [], faces)
+        mesh.update()
+        proxy = bpy.data.objects.new(name, mesh)
+        proxy.display_type = 'SOLID'
+        self._proxy_collection().objects.link(proxy)
+        return proxy
+
+    def _proxy_collection(self) -> bpy.types.Collection:
+        coll = bpy.data.collections.get(PROXY_COLLECTION_NAME)
+        if coll is None:
+            coll = bpy.data.collections.new(PROXY_COLLECTION_NAME)
+            root = bpy.data.collections.get(self.root_name or "")
+            parent = root if root is not None else bpy.context.scene.collection
+            parent.children.link(coll)
+        return coll
+
+
+_manager = LODManager()
+
+
+def _active_view_eye() -> Optional[np.ndarray]:
+    """Eye position of the first 3D viewport found, or None."""
+    wm = bpy.context.window_manager
+    if wm is None:
+        return None
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type != 'VIEW_3D':
+                continue
+            rv3d = area.spaces.active.region_3d
+            if rv3d is not None:
+                return np.array(rv3d.view_matrix.inverted().translation)
+    return None
+
+
+def _tick() -> float:
+    try:
+        scene = bpy.context.scene
+        props = getattr(scene, "pcg_props", None) if scene is not None else None
+        if props is None or not props.lod_enabled:
+            if _manager.chunks:
+                _manager.clear()
+            return _IDLE_INTERVAL
+        root = _manager.latest_root()
+        if root is None:
+            _manager.clear()
+            return _IDLE_INTERVAL
+        if (root.name != _manager.root_name
+                or props.chunk_size != _manager.chunk_size):
+            _manager.chunk_size = props.chunk_size
+            _manager.rebuild(root)
+        eye = _active_view_eye()
+        if eye is not None:
+            _manager.update(eye, props.lod_distance, props.lod_mode)
+    except Exception as e:
+        print(f"PCG LOD: {e}")
+    return _TICK_INTERVAL
+
+
+def invalidate() -> None:
+    """Forget the registry; the next tick rebuilds it (call after Generate)."""
+    _manager.clear()
+
+
+def register() -> None:
+    if not bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.register(_tick, first_interval=_IDLE_INTERVAL,
+                                persistent=True)
+
+
+def unregister() -> None:
+    if bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.unregister(_tick)
+    _manager.clear()
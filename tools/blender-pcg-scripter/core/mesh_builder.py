@@ -0,0 +1,66 @@
+"""Bulk mesh construction from NumPy arrays.
+
+``Mesh.from_pydata`` wants Python sequences, so a large mesh first becomes
+millions of tuples and is then walked again on the C side. Here the vertex,
+loop and polygon blocks are allocated with ``add`` and filled with
+``foreach_set`` straight from contiguous arrays, and custom normals and a UV
+map go through the same path. All faces of one call have the same corner
+count (a quad grid, a triangle soup).
+"""
+
+from typing import Optional
+
+import bpy
+import numpy as np
+
+
+def build_mesh(name: str, vertices: np.ndarray, faces: np.ndarray,
+               normals: Optional[np.ndarray] = None,
+               uvs: Optional[np.ndarray] = None,
+               uv_name: str = "UVMap") -> bpy.types.Mesh:
+    """
+    Create a mesh datablock from arrays.
+
+    Args:
+        name: Mesh datablock name
+        vertices: ``(V, 3)`` vertex positions
+        faces: ``(F, k)`` vertex indices, one row per face
+        normals: Optional ``(V, 3)`` per-vertex custom normals; faces are
+            shaded smooth so they show
+        uvs: Optional ``(V, 2)`` per-vertex UVs, written to every face
+            corner that uses the vertex
+
+    Returns:
+        The new mesh, updated and with edges computed
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+    faces = np.ascontiguousarray(faces, dtype=np.int32)
+    n_faces, corners = faces.shape if faces.ndim == 2 else (0, 0)
+    loops = faces.ravel()
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.add(len(loops))
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set("loop_start",
+                              np.arange(0, len(loops), max(corners, 1), dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.full(n_faces, corners, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    if uvs is not None and n_faces:
+        uvs = np.asarray(uvs, dtype=np.float32).reshape(-1, 2)
+        layer = mesh.uv_layers.new(name=uv_name)
+        layer.data.foreach_set("uv", np.ascontiguousarray(uvs[loops]).ravel())
+
+    if normals is not None and n_faces:
+        mesh.polygons.foreach_set("use_smooth", np.ones(n_faces, dtype=bool))
+        if hasattr(mesh, "use_auto_smooth"):
+            # Blender < 4.1 ignores custom normals without auto smooth.
+            mesh.use_auto_smooth = True
+        mesh.normals_split_custom_set_from_vertices(
+            np.asarray(normals, dtype=np.float32).reshape(-1, 3))
+
+    mesh.validate(clean_customdata=False)
+    return mesh
@@ -0,0 +1,108 @@
+"""Collision-free object naming for generated output.
+
+Blender keeps ID names unique by appending ``.001``, ``.002`` ... whenever a
+requested name is taken, and finding the next free suffix means scanning the
+existing names that share the base. Re-running Generate with the same
+``Floor_0012_000`` style names therefore made every spawn pay for all the
+previous generations' leftovers, and spawn time grew super-linearly.
+
+:class:`NameAllocator` avoids that by reserving a per-generation namespace
+token (``G007``) that no existing object name starts with. Every name built
+from it is unique by construction, so Blender never has to resolve a clash.
+The token scan is a single pass over ``bpy.data.objects`` per generation.
+
+This module only depends on ``bpy`` so ``benchmarks/bench_naming.py`` can
+load it straight from disk.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import bpy
+
+# Decoration naming modes.
+NAMING_FULL = "FULL"          # G007_Rocks_0042_3  (layer, cell, index)
+NAMING_COMPACT = "COMPACT"    # G007.1f3           (token + running counter)
+NAMING_LAZY = "LAZY"          # COMPACT at spawn, FULL later on request
+
+TOKEN_PREFIX = "G"
+
+
+def _parse_token(name: str) -> Optional[int]:
+    """Return the generation number encoded in ``name``'s token, if any."""
+    if not name.startswith(TOKEN_PREFIX):
+        return None
+    end = len(TOKEN_PREFIX)
+    while end < len(name) and name[end].isdigit():
+        end += 1
+    if end == len(TOKEN_PREFIX) or end >= len(name) or name[end] not in "_.":
+        return None
+    return int(name[len(TOKEN_PREFIX):end])
+
+
+def reserve_token(existing_names: Optional[Iterable[str]] = None) -> str:
+    """Pick a namespace token not used as a prefix by any existing object."""
+    if existing_names is None:
+        existing_names = bpy.data.objects.keys()
+    highest = -1
+    for name in existing_names:
+        k = _parse_token(name)
+        if k is not None and k > highest:
+            highest = k
+    return f"{TOKEN_PREFIX}{highest + 1:03d}"
+
+
+class NameAllocator:
+    """Hands out unique object names for one generation run."""
+
+    def __init__(self, decoration_mode: str = NAMING_FULL,
+                 existing_names: Optional[Iterable[str]] = None):
+        self.token = reserve_token(existing_names)
+        self.decoration_mode = decoration_mode
+        self._counter = 0
+
+    def piece_names(self, keys: Sequence[Tuple[str, int, int]]) -> List[str]:
+        """Bulk-name blockout pieces from ``(piece_id, space_id, index)``."""
+        token = self.token
+        return [f"{token}_{piece.capitalize()}_{space_id:04d}_{index:03d}"
+                for piece, space_id, index in keys]
+
+    def piece_name(self, piece_id: str, space_id: int, index: int) -> str:
+        return f"{self.token}_{piece_id.capitalize()}_{space_id:04d}_{index:03d}"
+
+    def prop_names(self, layer_name: str, cell_ids: Sequence[int]) -> List[str]:
+        """Bulk-name one layer's decoration props, one per entry in ``cell_ids``.
+
+        ``FULL`` keeps the legacy ``layer_cell_i`` shape (``i`` counts props
+        within a cell); ``COMPACT`` skips all string formatting beyond a hex
+        counter, which is the cheapest unique name Blender accepts. ``LAZY``
+        spawns with compact names and leaves the descriptive ones to
+        :meth:`descriptive_prop_names`, called when someone asks for them.
+        """
+        if self.decoration_mode not in (NAMING_COMPACT, NAMING_LAZY):
+            return self.descriptive_prop_names(layer_name, cell_ids)
+        token = self.token
+        start = self._counter
+        self._counter += len(cell_ids)
+        return [f"{token}.{n:x}" for n in range(start, self._counter)]
+
+    def descriptive_prop_names(self, layer_name: str,
+                               cell_ids: Sequence[int]) -> List[str]:
+        """``FULL``-style names for ``cell_ids``, whatever the mode."""
+        token = self.token
+        names: List[str] = []
+        last_cell = None
+        i = 0
+        for cell_id in cell_ids:
+            if cell_id != last_cell:
+                last_cell = cell_id
+                i = 0
+            names.append(f"{token}_{layer_name}_{cell_id}_{i}")
+            i += 1
+        return names
+
+    def prop_name(self, layer_name: str, cell_id: int, index: int) -> str:
+        if self.decoration_mode in (NAMING_COMPACT, NAMING_LAZY):
+            n = self._counter
+            self._counter += 1
+            return f"{self.token}.{n:x}"
+        return f"{self.token}_{layer_name}_{cell_id}_{index}"
@@ -0,0 +1,163 @@
+"""Seeded 2D gradient noise evaluated over whole coordinate arrays.
+
+Perlin gradient noise plus the two usual multi-octave sums built on it:
+
+* :func:`fbm`    -- fractional Brownian motion, rolling hills, in ``[-1, 1]``
+* :func:`ridged` -- ridged multifractal, sharp crests and valleys, in ``[0, 1]``
+
+Every function is a pure function of ``(x, y, seed)`` and the octave
+settings: a world coordinate gets the same value whatever grid, resolution or
+tile it is sampled in, so terrain tiles stitch seamlessly and previews match
+the final output. Coordinates are taken in float64 so large world offsets
+keep their fractional part; results are float32.
+
+Each octave draws its own permutation table and lattice offset from the
+seed, so octaves do not share zero crossings at integer coordinates.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+import numpy as np
+
+# Permutation period: the lattice repeats every 256 cells of each octave.
+_PERIOD = 256
+# Unit gradients at 45 degree steps; |perlin| <= sqrt(0.5) with these.
+_ANGLES = np.arange(8) * (np.pi / 4)
+_GRAD = (np.cos(_ANGLES) + 1j * np.sin(_ANGLES)).astype(np.complex64)
+_NORM = np.float32(np.sqrt(2.0))
+
+
+@lru_cache(maxsize=64)
+def _octave_table(seed: int, octave: int) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """Permutation, gradient table and lattice offset for one octave.
+
+    ``perm`` is doubled so ``perm[xi] + yi (+ 1)`` never needs wrapping.
+    ``grad[k]`` is the gradient hashed from ``perm[k]`` packed as
+    ``gx + i * gy``, so one gather fetches both components.
+    """
+    rng = np.random.default_rng([seed & 0xFFFFFFFF, octave])
+    perm = rng.permutation(_PERIOD)
+    perm = np.concatenate([perm, perm])
+    ox, oy = rng.random(2) * _PERIOD
+    return perm.astype(np.int32), _GRAD[perm & 7], float(ox), float(oy)
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def _lattice(v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Wrapped lattice index (int32) and float32 fraction of ``v``."""
+    vf = np.floor(v)
+    return (vf.astype(np.int64) & (_PERIOD - 1)).astype(np.int32), \
+        (v - vf).astype(np.float32)
+
+
+def _perlin(x: np.ndarray, y: np.ndarray, perm: np.ndarray,
+            grad: np.ndarray) -> np.ndarray:
+    """Perlin noise in ``[-1, 1]`` for broadcastable ``x`` / ``y``.
+
+    Everything that depends on one coordinate only is computed on the
+    un-broadcast input, so a ``(1, cols)`` by ``(rows, 1)`` grid does the
+    lattice work per row and column and only the gathers and blends per
+    sample.
+    """
+    xi, fx = _lattice(x)
+    yi, fy = _lattice(y)
+    fx1 = fx - np.float32(1.0)
+    fy1 = fy - np.float32(1.0)
+    u = _fade(fx)
+    v = _fade(fy)
+
+    a = perm[xi] + yi
+    b = perm[xi + 1] + yi
+    g = grad[a]
+    n00 = g.real * fx + g.imag * fy
+    g = grad[b]
+    n10 = g.real * fx1 + g.imag * fy
+    a += 1
+    b += 1
+    g = grad[a]
+    n01 = g.real * fx + g.imag * fy1
+    g = grad[b]
+    n11 = g.real * fx1 + g.imag * fy1
+
+    n10 -= n00
+    n10 *= u
+    n00 += n10                 # bottom edge
+    n11 -= n01
+    n11 *= u
+    n01 += n11                 # top edge
+    n01 -= n00
+    n01 *= v
+    n00 += n01
+    n00 *= _NORM
+    return n00
+
+
+def _coords(x, y) -> Tuple[np.ndarray, np.ndarray]:
+    return np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+
+
+def perlin2(x, y, seed: int = 0, frequency: float = 1.0) -> np.ndarray:
+    """Single-octave Perlin noise in ``[-1, 1]``; ``x`` / ``y`` broadcast."""
+    x, y = _coords(x, y)
+    perm, grad, ox, oy = _octave_table(int(seed), 0)
+    return _perlin(x * frequency + ox, y * frequency + oy, perm, grad)
+
+
+def _octaves(x, y, seed: int, octaves: int, frequency: float,
+             lacunarity: float) -> Iterator[np.ndarray]:
+    x, y = _coords(x, y)
+    f = frequency
+    for o in range(max(1, int(octaves))):
+        perm, grad, ox, oy = _octave_table(int(seed), o)
+        yield _perlin(x * f + ox, y * f + oy, perm, grad)
+        f *= lacunarity
+
+
+def fbm(x, y, seed: int = 0, octaves: int = 5, frequency: float = 1.0,
+        lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """Fractional Brownian motion: octave sum normalised to ``[-1, 1]``.
+
+    ``frequency`` is in cycles per world unit for the first octave; each
+    further octave multiplies it by ``lacunarity`` and its amplitude by
+    ``gain`` (higher gain = rougher).
+    """
+    total = None
+    amp = 1.0
+    norm = 0.0
+    for n in _octaves(x, y, seed, octaves, frequency, lacunarity):
+        n *= np.float32(amp)
+        total = n if total is None else total + n
+        norm += amp
+        amp *= gain
+    total *= np.float32(1.0 / norm)
+    return total
+
+
+def ridged(x, y, seed: int = 0, octaves: int = 5, frequency: float = 1.0,
+           lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """Ridged multifractal in ``[0, 1]``: crests where the noise crosses zero.
+
+    Each octave is ``(1 - |n|)^2``, weighted by the previous octave's signal
+    so detail gathers on the ridges and valleys stay smooth.
+    """
+    total = None
+    weight = 1.0
+    amp = 1.0
+    norm = 0.0
+    for n in _octaves(x, y, seed, octaves, frequency, lacunarity):
+        signal = np.float32(1.0) - np.abs(n)
+        signal *= signal
+        signal *= weight
+        weight = np.clip(signal * np.float32(2.0), 0.0, 1.0)
+        signal *= np.float32(amp)
+        total = signal if total is None else total + signal
+        norm += amp
+        amp *= gain
+    total *= np.float32(1.0 / norm)
+    return total
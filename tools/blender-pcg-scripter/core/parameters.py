@@ -6,7 +6,18 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 
 import bpy
 
-from .layer_system import CellTarget, LayerConfig, PlacementRule
+from .layer_system import CellTarget, CollisionMode, LayerConfig, PlacementRule
+from .naming import NAMING_COMPACT, NAMING_FULL, NAMING_LAZY
+from .pieces import (
+    ALL_PIECE_TYPES,
+    PIECE_DOORWAY,
+    PIECE_FLOOR,
+    PIECE_PILLAR,
+    PIECE_RAMP,
+    PIECE_STAIRS,
+    PIECE_WALL,
+    PIECE_WALL_HALF,
+)
 
 
 class BlockoutStyle(str, Enum):
@@ -23,27 +34,7 @@ class ElevationSource(str, Enum):
     FLAT = "FLAT"                          # all cells at z = 0
     RANDOM_SMOOTHED = "RANDOM_SMOOTHED"    # random per cell, smoothed across neighbors
     SPLINE_Z = "SPLINE_Z"                  # follow spline Z, side cells inherit + noise
-
-
-# Canonical placeholder piece identifiers used by BuildingBlockGenerator and
-# the per-piece override map. Stored as strings so they serialize cleanly.
-PIECE_FLOOR = "floor"
-PIECE_WALL = "wall"
-PIECE_WALL_HALF = "wall_half"
-PIECE_DOORWAY = "doorway"
-PIECE_RAMP = "ramp"
-PIECE_STAIRS = "stairs"
-PIECE_PILLAR = "pillar"
-
-ALL_PIECE_TYPES: Tuple[str, ...] = (
-    PIECE_FLOOR,
-    PIECE_WALL,
-    PIECE_WALL_HALF,
-    PIECE_DOORWAY,
-    PIECE_RAMP,
-    PIECE_STAIRS,
-    PIECE_PILLAR,
-)
+    NOISE = "NOISE"                        # fBm gradient noise sampled at cell centres
 
 
 @dataclass
@@ -80,6 +71,11 @@ class GenerationParams:
     ramp_slope_cells: int = 1       # Ramp footprint length (in cells) per step
     use_stairs: bool = False        # If True, stairs replace ramps
     generate_pillars: bool = False  # Add pillars at room corners (indoor)
+    merge_walls: bool = True        # Fuse collinear wall runs into long segments
+    merge_floors: bool = True       # Cover co-planar floor tiles with rectangles
+    shading_mode: str = "MATERIALS"  # "MATERIALS" | "ATTRIBUTE" (one shared material)
+    piece_solver: str = "RULES"     # "RULES" (built-in tree) | "WFC" (rules file)
+    wfc_rules: str = ""             # WFC rules file; "" = bundled default.json
     piece_overrides: Dict[str, str] = field(default_factory=dict)
     # Set of piece types to generate (skip omitted ones)
     block_types: Set[str] = field(
@@ -97,6 +93,10 @@ class GenerationParams:
     height_variation: float = 2.0
     smoothness: float = 0.8
     terrain_width: float = 50.0
+    terrain_tiled: bool = False        # one mesh per tile, no 200x200 grid cap
+    terrain_resolution: float = 1.0    # metres between nodes in tiled mode
+    terrain_adaptive: bool = False     # quadtree LOD mesh instead of the full grid
+    terrain_max_error: float = 0.05    # metres of height error allowed at the road
 
     # ------------------------------------------------------------ Road / corridor
     road_mode_enabled: bool = False
@@ -111,6 +111,18 @@ class GenerationParams:
 
     # --------------------------------------------------------- Decoration layers
     layers: List[LayerConfig] = field(default_factory=list)
+    decoration_naming: str = NAMING_FULL  # "FULL" | "COMPACT" | "LAZY" prop names
+    max_props: int = 0                    # Total decoration prop budget (0 = unlimited)
+
+    # ---------------------------------------------------------- Viewport LOD
+    lod_enabled: bool = False
+    lod_distance: float = 250.0           # Chunks farther than this switch to LOD
+    lod_mode: str = "BOUNDS"              # "BOUNDS" | "PROXY"
+
+    # ---------------------------------------------------------- World chunks
+    chunk_collections: bool = False       # Bucket output into Chunk_x_y collections
+    chunk_size: float = 64.0              # Chunk edge length (m), also used by LOD
+    collision_proxies: bool = False       # Merged UCX_ colliders per chunk
 
     # ------------------------------------------------------------------ Helpers
     def is_indoor(self) -> bool:
@@ -147,6 +159,11 @@ class GenerationParams:
             "ramp_slope_cells": self.ramp_slope_cells,
             "use_stairs": self.use_stairs,
             "generate_pillars": self.generate_pillars,
+            "merge_walls": self.merge_walls,
+            "merge_floors": self.merge_floors,
+            "shading_mode": self.shading_mode,
+            "piece_solver": self.piece_solver,
+            "wfc_rules": self.wfc_rules,
             "piece_overrides": dict(self.piece_overrides),
             "block_types": list(self.block_types),
             # Terrain
@@ -154,6 +171,10 @@ class GenerationParams:
             "height_variation": self.height_variation,
             "smoothness": self.smoothness,
             "terrain_width": self.terrain_width,
+            "terrain_tiled": self.terrain_tiled,
+            "terrain_resolution": self.terrain_resolution,
+            "terrain_adaptive": self.terrain_adaptive,
+            "terrain_max_error": self.terrain_max_error,
             # Road
             "road_mode_enabled": self.road_mode_enabled,
             "road_width": self.road_width,
@@ -164,6 +185,16 @@ class GenerationParams:
             "road_material_color": list(self.road_material_color),
             # Layers
             "layers": [layer.to_dict() for layer in self.layers],
+            "decoration_naming": self.decoration_naming,
+            "max_props": self.max_props,
+            # Viewport LOD
+            "lod_enabled": self.lod_enabled,
+            "lod_distance": self.lod_distance,
+            "lod_mode": self.lod_mode,
+            # World chunks
+            "chunk_collections": self.chunk_collections,
+            "chunk_size": self.chunk_size,
+            "collision_proxies": self.collision_proxies,
         }
 
     @classmethod
@@ -177,9 +208,15 @@ class GenerationParams:
             "grid_size", "wall_height", "path_width_cells", "lateral_depth_cells",
             "elevation_source", "step_height", "max_elevation_steps", "elevation_smoothing",
             "cover_density", "ramp_slope_cells", "use_stairs", "generate_pillars",
+            "merge_walls", "merge_floors", "shading_mode", "piece_solver", "wfc_rules",
             "terrain_enabled", "height_variation", "smoothness", "terrain_width",
+            "terrain_tiled", "terrain_resolution",
+            "terrain_adaptive", "terrain_max_error",
             "road_mode_enabled", "road_width", "side_placement",
             "road_mesh_enabled", "road_mesh_width", "road_height_offset",
+            "decoration_naming", "max_props",
+            "lod_enabled", "lod_distance", "lod_mode",
+            "chunk_collections", "chunk_size", "collision_proxies",
         ):
             if key in data:
                 setattr(params, key, data[key])
@@ -236,6 +273,8 @@ class PCG_LayerProperty(bpy.types.PropertyGroup):
             (PlacementRule.FILL_GRID.value, "Fill Grid", "Fill interior space"),
             (PlacementRule.SCATTER.value, "Scatter", "Random scatter"),
             (PlacementRule.CENTER_LINE.value, "Center Line", "Place along center"),
+            (PlacementRule.POISSON_DISK.value, "Poisson Disk",
+             "Even blue-noise scatter across all target cells"),
         ],
         default=PlacementRule.EDGE_LOOP.value
     )
@@ -258,6 +297,20 @@ class PCG_LayerProperty(bpy.types.PropertyGroup):
         default=CellTarget.OFF_ROAD.value,
     )
 
+    collision_mode: bpy.props.EnumProperty(
+        name="Collision",
+        description="What this layer's props are not allowed to overlap",
+        items=[
+            (CollisionMode.STRUCTURE.value, "Avoid Structure",
+             "Keep props out of walls, pillars, doorways and ramps/stairs"),
+            (CollisionMode.ALL.value, "Avoid All",
+             "Also avoid props already placed by this or earlier layers"),
+            (CollisionMode.NONE.value, "None",
+             "Place freely (legacy behaviour)"),
+        ],
+        default=CollisionMode.STRUCTURE.value,
+    )
+
     collection_name: bpy.props.StringProperty(
         name="Asset Collection",
         description="Name of collection containing assets to place"
@@ -266,12 +319,25 @@ class PCG_LayerProperty(bpy.types.PropertyGroup):
     density: bpy.props.FloatProperty(name="Density", default=1.0, min=0.1)
     offset: bpy.props.FloatProperty(name="Offset", default=0.0, unit='LENGTH')
     z_offset: bpy.props.FloatProperty(name="Z Offset", default=0.0, unit='LENGTH')
+    min_distance: bpy.props.FloatProperty(
+        name="Min Distance",
+        description="Poisson Disk: minimum spacing between props. "
+                    "0 derives it from Density",
+        default=0.0, min=0.0, unit='LENGTH',
+    )
 
     random_rotation: bpy.props.BoolProperty(name="Random Rotation", default=False)
     random_scale: bpy.props.BoolProperty(name="Random Scale", default=False)
     scale_min: bpy.props.FloatProperty(name="Min Scale", default=0.8, min=0.1)
     scale_max: bpy.props.FloatProperty(name="Max Scale", default=1.2, min=0.1)
 
+    priority: bpy.props.FloatProperty(
+        name="Priority",
+        description="Share of the prop budget relative to other layers. "
+                    "0 only gets what is left once every weighted layer is full",
+        default=1.0, min=0.0, soft_max=10.0,
+    )
+
 
 class PCG_PropertyGroup(bpy.types.PropertyGroup):
     """Blender PropertyGroup for storing parameters in scene data."""
@@ -337,6 +403,14 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
         default=False
     )
 
+    undo_light: bpy.props.BoolProperty(
+        name="Light Undo",
+        description="Generate without Blender's global undo step (faster, "
+                    "less memory on big levels). Revert runs with Undo "
+                    "Generation instead of Ctrl+Z",
+        default=False
+    )
+
     randomize_params_with_seed: bpy.props.BoolProperty(
         name="Randomize Parameters",
         description="Randomize all parameters when randomizing seed",
@@ -392,6 +466,9 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
             (ElevationSource.SPLINE_Z.value, "Follow Spline Z",
              "Read elevation from the spline; side cells inherit nearest path "
              "cell. Best for outdoor terrain-following layouts."),
+            (ElevationSource.NOISE.value, "Noise",
+             "Gradient noise sampled at each cell's world position: rolling "
+             "plateaus that stay put when the layout around them changes."),
         ],
         default=ElevationSource.SPLINE_Z.value
     )
@@ -448,6 +525,54 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
         default=False
     )
 
+    merge_walls: bpy.props.BoolProperty(
+        name="Merge Collinear Walls",
+        description="Fuse runs of adjacent, collinear walls and cover walls "
+                    "into single long segments (far fewer objects on indoor "
+                    "levels). Override-kit pieces are never merged",
+        default=True
+    )
+
+    merge_floors: bpy.props.BoolProperty(
+        name="Merge Floors",
+        description="Cover connected floor tiles that share elevation and "
+                    "orientation with as few rectangular slabs as possible. "
+                    "Skipped when the floor piece has a collection override",
+        default=True
+    )
+    shading_mode: bpy.props.EnumProperty(
+        name="Shading",
+        description="How generated blockout, road and preview geometry is "
+                    "shaded",
+        items=[
+            ("MATERIALS", "Materials",
+             "Placeholders unshaded; road, preview and override kits keep "
+             "their own materials"),
+            ("ATTRIBUTE", "Attribute",
+             "One shared material for everything; piece, role and elevation "
+             "are per-object pcg_* attributes read by Attribute nodes"),
+        ],
+        default="MATERIALS",
+    )
+    piece_solver: bpy.props.EnumProperty(
+        name="Piece Solver",
+        description="How wall / doorway / ramp pieces are chosen per edge",
+        items=[
+            ("RULES", "Rules", "Built-in rule tree (elevation, connections, "
+                               "cover density)"),
+            ("WFC", "WFC", "Wave Function Collapse over the edge graph, "
+                           "driven by a JSON rules file"),
+        ],
+        default="RULES",
+    )
+    wfc_rules: bpy.props.StringProperty(
+        name="WFC Rules",
+        description="Rules file: a name from the add-on's wfc_rules folder "
+                    "(e.g. varied_cover) or a path. Empty = default",
+        default="",
+        subtype='FILE_PATH',
+    )
+
     # Per-piece collection overrides (designer assets)
     piece_override_floor: bpy.props.StringProperty(name="Floor", default="")
     piece_override_wall: bpy.props.StringProperty(name="Wall", default="")
@@ -468,6 +593,30 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
     terrain_width: bpy.props.FloatProperty(
         name="Terrain Width", default=50.0, min=10.0, unit='LENGTH'
     )
+    terrain_tiled: bpy.props.BoolProperty(
+        name="Tiled Terrain",
+        description="Build the terrain as one mesh per tile at Terrain Resolution, "
+                    "computed in worker processes, instead of a single grid capped "
+                    "at 200x200",
+        default=False
+    )
+    terrain_resolution: bpy.props.FloatProperty(
+        name="Terrain Resolution",
+        description="Distance between terrain vertices in tiled mode",
+        default=1.0, min=0.25, max=10.0, unit='LENGTH'
+    )
+    terrain_adaptive: bpy.props.BoolProperty(
+        name="Adaptive Mesh",
+        description="Mesh the terrain from a quadtree: large triangles where the "
+                    "ground is smooth or far from the road, full resolution along it",
+        default=False
+    )
+    terrain_max_error: bpy.props.FloatProperty(
+        name="Max Error",
+        description="Largest height deviation from the heightmap allowed next to "
+                    "the road; the allowance doubles every 32 m further out",
+        default=0.05, min=0.001, max=2.0, unit='LENGTH'
+    )
 
     # ---- Preview
     show_preview_labels: bpy.props.BoolProperty(
@@ -515,6 +664,74 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
     layers: bpy.props.CollectionProperty(type=PCG_LayerProperty)
     active_layer_index: bpy.props.IntProperty(name="Active Layer Index", default=0)
 
+    decoration_naming: bpy.props.EnumProperty(
+        name="Prop Names",
+        description="How decoration props are named. Every generation gets its "
+                    "own name namespace either way, so repeated Generates never "
+                    "hit Blender's duplicate-name resolution",
+        items=[
+            (NAMING_FULL, "Descriptive",
+             "Layer, cell and index in every prop name"),
+            (NAMING_COMPACT, "Compact",
+             "Short generation token + counter; cheapest for huge prop counts"),
+            (NAMING_LAZY, "Lazy",
+             "Compact names at spawn; Name Props gives the last generation's "
+             "props descriptive names when needed"),
+        ],
+        default=NAMING_FULL
+    )
+    max_props: bpy.props.IntProperty(
+        name="Prop Budget",
+        description="Maximum number of decoration props per generation. "
+                    "Candidates are thinned evenly across cells, by layer "
+                    "priority, before anything is spawned. 0 = unlimited",
+        default=0, min=0, soft_max=200000,
+    )
+
+    # ---- Viewport LOD
+    lod_enabled: bpy.props.BoolProperty(
+        name="Distance LOD",
+        description="Draw chunks of the latest generation far from the "
+                    "active 3D view cheaply (checked a few times per second)",
+        default=False,
+    )
+    lod_distance: bpy.props.FloatProperty(
+        name="LOD Distance",
+        description="Chunks farther than this from the view switch to LOD",
+        default=250.0, min=1.0, soft_max=5000.0, unit='LENGTH',
+    )
+    lod_mode: bpy.props.EnumProperty(
+        name="LOD Mode",
+        items=[
+            ("BOUNDS", "Bounds", "Far objects draw as bounding boxes"),
+            ("PROXY", "Proxy",
+             "Far chunks are replaced by one merged box mesh each"),
+        ],
+        default="BOUNDS",
+    )
+
+    # ---- World chunks
+    chunk_collections: bpy.props.BoolProperty(
+        name="Chunk Collections",
+        description="Bucket blockout pieces and decoration props into "
+                    "Chunk_x_y collections of fixed world size, with a "
+                    "manifest of bounds and object counts",
+        default=False,
+    )
+    chunk_size: bpy.props.FloatProperty(
+        name="Chunk Size",
+        description="Edge length of a world chunk. Also sets the grouping "
+                    "used by Distance LOD",
+        default=64.0, min=4.0, soft_max=1024.0, unit='LENGTH',
+    )
+    collision_proxies: bpy.props.BoolProperty(
+        name="Collision Proxies",
+        description="Build merged convex colliders (UCX_ boxes and ramp "
+                    "wedges) per chunk from the blockout plan, in a "
+                    "Collision collection",
+        default=False,
+    )
+
     # ---- History
     history: bpy.props.CollectionProperty(type=PCG_HistoryItem)
     active_history_index: bpy.props.IntProperty(name="Active History Index", default=-1)
@@ -564,12 +781,21 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
             ramp_slope_cells=self.ramp_slope_cells,
             use_stairs=self.use_stairs,
             generate_pillars=self.generate_pillars,
+            merge_walls=self.merge_walls,
+            merge_floors=self.merge_floors,
+            shading_mode=self.shading_mode,
+            piece_solver=self.piece_solver,
+            wfc_rules=self.wfc_rules,
             piece_overrides=self._collect_piece_overrides(),
             block_types=self._collect_block_types(),
             terrain_enabled=self.terrain_enabled,
             height_variation=self.height_variation,
             smoothness=self.smoothness,
             terrain_width=self.terrain_width,
+            terrain_tiled=self.terrain_tiled,
+            terrain_resolution=self.terrain_resolution,
+            terrain_adaptive=self.terrain_adaptive,
+            terrain_max_error=self.terrain_max_error,
             road_mode_enabled=self.road_mode_enabled,
             road_width=self.road_width,
             side_placement=self.side_placement.lower(),
@@ -577,7 +803,15 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
             road_mesh_width=self.road_mesh_width,
             road_height_offset=self.road_height_offset,
             road_material_color=tuple(self.road_material_color),
-            layers=self._get_layer_configs()
+            layers=self._get_layer_configs(),
+            decoration_naming=self.decoration_naming,
+            max_props=self.max_props,
+            lod_enabled=self.lod_enabled,
+            lod_distance=self.lod_distance,
+            lod_mode=self.lod_mode,
+            chunk_collections=self.chunk_collections,
+            chunk_size=self.chunk_size,
+            collision_proxies=self.collision_proxies,
         )
 
     def _get_layer_configs(self) -> List[LayerConfig]:
@@ -587,6 +821,10 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
                 target = CellTarget(layer.cell_target)
             except (ValueError, AttributeError):
                 target = CellTarget.OFF_ROAD
+            try:
+                collision = CollisionMode(layer.collision_mode)
+            except (ValueError, AttributeError):
+                collision = CollisionMode.STRUCTURE
             configs.append(LayerConfig(
                 name=layer.name,
                 enabled=layer.enabled,
@@ -595,11 +833,14 @@ class PCG_PropertyGroup(bpy.types.PropertyGroup):
                 density=layer.density,
                 offset=layer.offset,
                 z_offset=layer.z_offset,
+                min_distance=layer.min_distance,
                 cell_target=target,
+                collision_mode=collision,
                 random_rotation=layer.random_rotation,
                 random_scale=layer.random_scale,
                 scale_min=layer.scale_min,
                 scale_max=layer.scale_max,
+                priority=layer.priority,
             ))
         return configs
 
@@ -648,11 +889,27 @@ class ParameterDefaults:
     RAMP_SLOPE_CELLS = 1
     USE_STAIRS = False
     GENERATE_PILLARS = False
+    MERGE_WALLS = True
+    MERGE_FLOORS = True
+    SHADING_MODE = "MATERIALS"
+    PIECE_SOLVER = "RULES"
+    WFC_RULES = ""
     BLOCK_TYPES = {PIECE_FLOOR, PIECE_WALL, PIECE_WALL_HALF, PIECE_DOORWAY, PIECE_RAMP}
     TERRAIN_ENABLED = False
     HEIGHT_VARIATION = 2.0
     SMOOTHNESS = 0.8
     TERRAIN_WIDTH = 50.0
+    TERRAIN_TILED = False
+    TERRAIN_RESOLUTION = 1.0
+    TERRAIN_ADAPTIVE = False
+    TERRAIN_MAX_ERROR = 0.05
+    MAX_PROPS = 0
+    LOD_ENABLED = False
+    LOD_DISTANCE = 250.0
+    LOD_MODE = "BOUNDS"
+    CHUNK_COLLECTIONS = False
+    CHUNK_SIZE = 64.0
+    COLLISION_PROXIES = False
 
     @classmethod
     def get_default_params(cls) -> GenerationParams:
@@ -676,11 +933,27 @@ class ParameterDefaults:
             ramp_slope_cells=cls.RAMP_SLOPE_CELLS,
             use_stairs=cls.USE_STAIRS,
             generate_pillars=cls.GENERATE_PILLARS,
+            merge_walls=cls.MERGE_WALLS,
+            merge_floors=cls.MERGE_FLOORS,
+            shading_mode=cls.SHADING_MODE,
+            piece_solver=cls.PIECE_SOLVER,
+            wfc_rules=cls.WFC_RULES,
             block_types=cls.BLOCK_TYPES.copy(),
             terrain_enabled=cls.TERRAIN_ENABLED,
             height_variation=cls.HEIGHT_VARIATION,
             smoothness=cls.SMOOTHNESS,
             terrain_width=cls.TERRAIN_WIDTH,
+            terrain_tiled=cls.TERRAIN_TILED,
+            terrain_resolution=cls.TERRAIN_RESOLUTION,
+            terrain_adaptive=cls.TERRAIN_ADAPTIVE,
+            terrain_max_error=cls.TERRAIN_MAX_ERROR,
+            max_props=cls.MAX_PROPS,
+            lod_enabled=cls.LOD_ENABLED,
+            lod_distance=cls.LOD_DISTANCE,
+            lod_mode=cls.LOD_MODE,
+            chunk_collections=cls.CHUNK_COLLECTIONS,
+            chunk_size=cls.CHUNK_SIZE,
+            collision_proxies=cls.COLLISION_PROXIES,
         )
 
 
@@ -749,6 +1022,18 @@ class ParameterValidator:
         if v > 200.0: return False, "Terrain width must be 200.0 or less"
         return True, ""
 
+    @staticmethod
+    def validate_terrain_resolution(v: float) -> tuple[bool, str]:
+        if v < 0.25: return False, "Terrain resolution must be at least 0.25"
+        if v > 10.0: return False, "Terrain resolution must be 10.0 or less"
+        return True, ""
+
+    @staticmethod
+    def validate_terrain_max_error(v: float) -> tuple[bool, str]:
+        if v <= 0.0: return False, "Terrain max error must be greater than 0.0"
+        if v > 2.0: return False, "Terrain max error must be 2.0 or less"
+        return True, ""
+
     @staticmethod
     def validate_spline_object(spline_object) -> tuple[bool, str]:
         if spline_object is None: return False, "No spline object selected"
@@ -784,6 +1069,8 @@ class ParameterValidator:
             (cls.validate_height_variation, params.height_variation, "height_variation"),
             (cls.validate_smoothness, params.smoothness, "smoothness"),
             (cls.validate_terrain_width, params.terrain_width, "terrain_width"),
+            (cls.validate_terrain_resolution, params.terrain_resolution, "terrain_resolution"),
+            (cls.validate_terrain_max_error, params.terrain_max_error, "terrain_max_error"),
         ]
         for fn, value, name in validators:
             ok, msg = fn(value)
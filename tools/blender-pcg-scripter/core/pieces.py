@@ -0,0 +1,27 @@
+"""Canonical placeholder piece identifiers.
+
+Used by BuildingBlockGenerator, the placement plan passes and the per-piece
+override map. Stored as strings so they serialize cleanly. Kept apart from
+:mod:`.parameters` (which needs ``bpy``) so plan passes load without Blender;
+:mod:`.parameters` re-exports them.
+"""
+
+from typing import Tuple
+
+PIECE_FLOOR = "floor"
+PIECE_WALL = "wall"
+PIECE_WALL_HALF = "wall_half"
+PIECE_DOORWAY = "doorway"
+PIECE_RAMP = "ramp"
+PIECE_STAIRS = "stairs"
+PIECE_PILLAR = "pillar"
+
+ALL_PIECE_TYPES: Tuple[str, ...] = (
+    PIECE_FLOOR,
+    PIECE_WALL,
+    PIECE_WALL_HALF,
+    PIECE_DOORWAY,
+    PIECE_RAMP,
+    PIECE_STAIRS,
+    PIECE_PILLAR,
+)
@@ -176,9 +176,15 @@ _DIRECT_PROPS = (
     "grid_size", "wall_height", "path_width_cells", "lateral_depth_cells",
     "elevation_source", "step_height", "max_elevation_steps", "elevation_smoothing",
     "cover_density", "ramp_slope_cells", "use_stairs", "generate_pillars",
+    "merge_walls", "merge_floors", "shading_mode", "piece_solver", "wfc_rules",
     "terrain_enabled", "height_variation", "smoothness", "terrain_width",
+    "terrain_tiled", "terrain_resolution",
+    "terrain_adaptive", "terrain_max_error",
     "road_mode_enabled", "road_width",
     "road_mesh_enabled", "road_mesh_width", "road_height_offset",
+    "decoration_naming", "max_props",
+    "lod_enabled", "lod_distance", "lod_mode",
+    "chunk_collections", "chunk_size", "collision_proxies",
     "randomize_params_with_seed",
 )
 
@@ -242,11 +248,14 @@ def apply_preset_to_scene(preset_params: Dict[str, Any], scene: bpy.types.Scene)
             layer.density = layer_data.get("density", 1.0)
             layer.offset = layer_data.get("offset", 0.0)
             layer.z_offset = layer_data.get("z_offset", 0.0)
+            layer.min_distance = layer_data.get("min_distance", 0.0)
             # Legacy presets (no cell_target) default to OFF_ROAD so the
             # spline corridor stays clear after a re-generate.
             layer.cell_target = layer_data.get("cell_target", "OFF_ROAD")
+            layer.collision_mode = layer_data.get("collision_mode", "STRUCTURE")
             layer.random_rotation = layer_data.get("random_rotation", False)
             layer.random_scale = layer_data.get("random_scale", False)
             layer.scale_min = layer_data.get("scale_min", 0.8)
             layer.scale_max = layer_data.get("scale_max", 1.2)
+            layer.priority = layer_data.get("priority", 1.0)
         props.active_layer_index = 0 if len(props.layers) > 0 else -1
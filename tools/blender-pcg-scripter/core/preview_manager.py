@@ -10,6 +10,9 @@ Performance notes:
       unit-cube mesh per preview build.
     * Materials, the shared cube mesh, and the preview collection are all
       cached for the duration of one ``create_preview`` call.
+    * In attribute shading mode every tile uses the one shared material
+      and carries its colour as a per-object attribute (see
+      :mod:`.shading`); per-role materials are not created at all.
 """
 
 import math
@@ -27,6 +30,7 @@ from ..generators.layout_generator import (
 from .adapters import BlenderCurveAdapter
 from .errors import InvalidSplineError
 from .parameters import BlockoutStyle, GenerationParams
+from .shading import PIECE_PREVIEW, SHADING_ATTRIBUTE, apply_attribute_shading, shared_material
 from .spline_sampler import SplinePoint, SplineSampler
 
 
@@ -170,6 +174,7 @@ class PreviewManager:
                 name=f"Cell_{cell.grid_coord[0]:+03d}_{cell.grid_coord[1]:+03d}",
                 tag=cell.role,
                 yaw=cell.orientation,
+                elevation=cell.elevation,
             )
 
             for cardinal in CARDINALS:
@@ -201,7 +206,8 @@ class PreviewManager:
     def _make_dot(self, position: mathutils.Vector, color):
         self._spawn_empty("Preview_EdgeDot", 'PLAIN_AXES', 0.25, position, color)
 
-    def _create_wireframe_box(self, position, size, color, name, tag, yaw=0.0):
+    def _create_wireframe_box(self, position, size, color, name, tag, yaw=0.0,
+                              elevation=0):
         mesh = self._get_cube_mesh()
         box = bpy.data.objects.new(f"Preview_{name}", mesh)
         box.location = position
@@ -211,6 +217,14 @@ class PreviewManager:
         box.display_type = 'WIRE'
         box["pcg_preview"] = True
 
+        if getattr(self.params, "shading_mode", None) == SHADING_ATTRIBUTE:
+            mat = self._material_cache.get(SHADING_ATTRIBUTE)
+            if mat is None:
+                mat = self._material_cache[SHADING_ATTRIBUTE] = shared_material()
+            apply_attribute_shading(box, mat, PIECE_PREVIEW, tag, elevation, color)
+            self.preview_collection.objects.link(box)
+            return
+
         mat = self._material_cache.get(tag)
         if mat is None:
             mat = self._make_preview_material(tag, color)
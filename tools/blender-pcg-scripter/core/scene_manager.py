@@ -1,10 +1,12 @@
 """Scene management system for organizing generated content in Blender."""
 
+import json
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import bpy
 
+from .chunking import ChunkCoord, chunk_bounds, chunk_coord, chunk_name
 from .parameters import GenerationParams
 
 
@@ -72,6 +74,36 @@ def cleanup_previous_generation():
         bpy.data.collections.remove(collection)
 
 
+def remove_generation(root: bpy.types.Collection) -> int:
+    """
+    Delete one generation: ``root``, every collection below it, their
+    objects and the meshes nothing else uses any more.
+
+    Meshes still used elsewhere (override kit sources) are kept.
+
+    Args:
+        root: A ``PCG_Generation_*`` collection
+
+    Returns:
+        Number of objects removed
+    """
+    collections = {root.as_pointer(): root}
+    pending = [root]
+    while pending:
+        for child in pending.pop().children:
+            if child.as_pointer() not in collections:
+                collections[child.as_pointer()] = child
+                pending.append(child)
+
+    objects = list(root.all_objects)
+    meshes = {o.data.as_pointer(): o.data for o in objects
+              if o.type == 'MESH' and o.data is not None}
+    bpy.data.batch_remove(objects)
+    orphans = [m for m in meshes.values() if m.users == 0]
+    bpy.data.batch_remove(orphans + list(collections.values()))
+    return len(objects)
+
+
 def store_metadata(collection: bpy.types.Collection, params: GenerationParams):
     """
     Save generation parameters to collection custom properties.
@@ -154,3 +186,88 @@ def create_generation_structure() -> Tuple[bpy.types.Collection, bpy.types.Colle
     root_collection.children.link(connections_collection)
 
     return root_collection, structures_collection, terrain_collection, connections_collection
+
+
+class ChunkedCollections:
+    """Routes generated objects into fixed-size world-chunk collections.
+
+    ``Chunk_x_y`` collections are created lazily under ``parent`` the first
+    time something lands in them. Every routed object is counted per group
+    (``blockout`` piece id / ``decoration`` layer name) and widens the
+    chunk's content bounds; :py:meth:`write_manifest` stores all of that as
+    JSON custom properties so exporters and partial regeneration can work
+    chunk by chunk without walking objects.
+    """
+
+    def __init__(self, parent: bpy.types.Collection, size: float):
+        self.parent = parent
+        self.size = size
+        self._colls: Dict[ChunkCoord, bpy.types.Collection] = {}
+        self._counts: Dict[ChunkCoord, Dict[str, Dict[str, int]]] = {}
+        self._content: Dict[ChunkCoord, List[float]] = {}
+
+    def collection_for(self, location: Tuple[float, float, float],
+                       kind: str, group: str) -> bpy.types.Collection:
+        """Chunk collection for an object at ``location``; records it."""
+        x, y, z = location
+        coord = chunk_coord(x, y, self.size)
+        coll = self._colls.get(coord)
+        if coll is None:
+            coll = bpy.data.collections.new(chunk_name(coord))
+            self.parent.children.link(coll)
+            self._colls[coord] = coll
+            self._counts[coord] = {}
+            self._content[coord] = [x, y, z, x, y, z]
+        per_kind = self._counts[coord].setdefault(kind, {})
+        per_kind[group] = per_kind.get(group, 0) + 1
+        b = self._content[coord]
+        if x < b[0]:
+            b[0] = x
+        if y < b[1]:
+            b[1] = y
+        if z < b[2]:
+            b[2] = z
+        if x > b[3]:
+            b[3] = x
+        if y > b[4]:
+            b[4] = y
+        if z > b[5]:
+            b[5] = z
+        return coll
+
+    def release(self, location: Tuple[float, float, float],
+                kind: str, group: str) -> None:
+        """Un-count an object routed earlier (it is being deleted).
+
+        Content bounds are left as they are, so they stay a superset.
+        """
+        coord = chunk_coord(location[0], location[1], self.size)
+        per_kind = self._counts.get(coord, {}).get(kind)
+        if per_kind and per_kind.get(group, 0) > 0:
+            per_kind[group] -= 1
+
+    def chunk_collection(self, coord: ChunkCoord) -> Optional[bpy.types.Collection]:
+        return self._colls.get(coord)
+
+    def manifest(self) -> Dict:
+        chunks = []
+        for coord in sorted(self._colls):
+            counts = self._counts[coord]
+            chunks.append({
+                "name": self._colls[coord].name,
+                "coord": list(coord),
+                "bounds": list(chunk_bounds(coord, self.size)),
+                "content_bounds": list(self._content[coord]),
+                "counts": counts,
+                "total": sum(sum(g.values()) for g in counts.values()),
+            })
+        return {"chunk_size": self.size, "chunks": chunks}
+
+    def write_manifest(self) -> Dict:
+        """Store the manifest on ``parent`` and each chunk's entry on it."""
+        manifest = self.manifest()
+        for entry in manifest["chunks"]:
+            coll = self._colls[tuple(entry["coord"])]
+            coll["pcg_chunk"] = json.dumps(entry)
+        self.parent["pcg_chunk_manifest"] = json.dumps(manifest)
+        return manifest
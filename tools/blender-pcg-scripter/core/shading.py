@@ -0,0 +1,150 @@
+"""Attribute-driven shading for generated geometry.
+
+With ``shading_mode == "ATTRIBUTE"`` every blockout piece, the road mesh and
+the preview tiles share the one material ``PCG_Attribute_Shading`` instead of
+a material per preview role, the road's own material and whatever override
+kits bring along. What those materials used to encode is written onto each
+object as custom properties, which the material reads with *Object*
+Attribute nodes:
+
+* ``pcg_piece``     -- index into :data:`SHADING_PIECES`
+* ``pcg_role``      -- index into :data:`SHADING_ROLES` (-1 = none)
+* ``pcg_elevation`` -- elevation step of the owning cell
+* ``pcg_color``     -- RGBA tint for the piece, adjusted by role
+
+Object-level attributes are used instead of per-face ones because
+placeholder meshes are shared by every piece of the same shape: a face
+attribute would force a mesh copy per object. ``pcg_color`` is mirrored into
+``Object.color`` so Solid mode with *Object* colouring matches Material
+Preview. With a single material the viewport draws the blockout in a few
+batches, and restyling the whole level is one node-tree edit.
+"""
+
+from typing import Optional, Tuple
+
+import bpy
+
+from .parameters import (
+    PIECE_DOORWAY,
+    PIECE_FLOOR,
+    PIECE_PILLAR,
+    PIECE_RAMP,
+    PIECE_STAIRS,
+    PIECE_WALL,
+    PIECE_WALL_HALF,
+)
+
+SHADING_MATERIALS = "MATERIALS"
+SHADING_ATTRIBUTE = "ATTRIBUTE"
+
+SHARED_MATERIAL_NAME = "PCG_Attribute_Shading"
+
+PIECE_ROAD = "road"
+PIECE_PREVIEW = "preview"
+
+# Index order is part of the pcg_piece / pcg_role contract; append only.
+SHADING_PIECES: Tuple[str, ...] = (
+    PIECE_FLOOR, PIECE_WALL, PIECE_WALL_HALF, PIECE_DOORWAY,
+    PIECE_RAMP, PIECE_STAIRS, PIECE_PILLAR, PIECE_ROAD, PIECE_PREVIEW,
+)
+SHADING_ROLES: Tuple[str, ...] = ("path", "lateral", "room")
+
+_PIECE_COLORS = {
+    PIECE_FLOOR:     (0.55, 0.55, 0.55),
+    PIECE_WALL:      (0.75, 0.72, 0.66),
+    PIECE_WALL_HALF: (0.85, 0.55, 0.25),
+    PIECE_DOORWAY:   (0.30, 0.55, 0.85),
+    PIECE_RAMP:      (0.90, 0.80, 0.20),
+    PIECE_STAIRS:    (0.90, 0.65, 0.20),
+    PIECE_PILLAR:    (0.50, 0.45, 0.60),
+    PIECE_ROAD:      (0.20, 0.20, 0.20),
+    PIECE_PREVIEW:   (0.20, 0.90, 0.50),
+}
+_ROLE_TINT = {
+    "path":    (1.00, 1.00, 1.00),
+    "lateral": (0.85, 0.90, 1.10),
+    "room":    (1.10, 0.95, 0.85),
+}
+# Brightness the material adds per elevation step.
+_ELEVATION_GAIN = 0.08
+
+
+def piece_color(piece: str, role: str = "") -> Tuple[float, float, float, float]:
+    """Default RGBA for a piece; what ``pcg_color`` holds unless overridden."""
+    r, g, b = _PIECE_COLORS.get(piece, _PIECE_COLORS[PIECE_WALL])
+    tr, tg, tb = _ROLE_TINT.get(role, (1.0, 1.0, 1.0))
+    return (min(1.0, r * tr), min(1.0, g * tg), min(1.0, b * tb), 1.0)
+
+
+def shared_material() -> bpy.types.Material:
+    """The shared attribute material, built on first use.
+
+    An existing material of that name is reused untouched, so edits made to
+    its node tree survive later generations.
+    """
+    mat = bpy.data.materials.get(SHARED_MATERIAL_NAME)
+    if mat is not None:
+        return mat
+    mat = bpy.data.materials.new(name=SHARED_MATERIAL_NAME)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    bsdf = nodes.get("Principled BSDF")
+    if bsdf is None:
+        return mat
+    bsdf.inputs["Roughness"].default_value = 0.8
+
+    color = nodes.new("ShaderNodeAttribute")
+    color.attribute_type = 'OBJECT'
+    color.attribute_name = "pcg_color"
+    color.location = (-700, 300)
+
+    elevation = nodes.new("ShaderNodeAttribute")
+    elevation.attribute_type = 'OBJECT'
+    elevation.attribute_name = "pcg_elevation"
+    elevation.location = (-700, 0)
+
+    # value = 1 + elevation * gain: higher tiers read brighter.
+    gain = nodes.new("ShaderNodeMath")
+    gain.operation = 'MULTIPLY_ADD'
+    gain.inputs[1].default_value = _ELEVATION_GAIN
+    gain.inputs[2].default_value = 1.0
+    gain.location = (-450, 0)
+
+    hsv = nodes.new("ShaderNodeHueSaturation")
+    hsv.location = (-250, 250)
+
+    links.new(elevation.outputs["Fac"], gain.inputs[0])
+    links.new(gain.outputs["Value"], hsv.inputs["Value"])
+    links.new(color.outputs["Color"], hsv.inputs["Color"])
+    links.new(hsv.outputs["Color"], bsdf.inputs["Base Color"])
+    return mat
+
+
+def apply_attribute_shading(obj: bpy.types.Object, material: bpy.types.Material,
+                            piece: str, role: str = "", elevation: int = 0,
+                            color: Optional[Tuple[float, float, float, float]] = None
+                            ) -> None:
+    """Tag ``obj`` with the shading attributes and give it ``material``.
+
+    Objects whose mesh already has material slots (override kits) get
+    object-linked slots, so the shared source mesh keeps its own materials.
+    A mesh without any slot gets ``material`` as its single data material;
+    placeholders share their mesh, so that happens once per template.
+    """
+    if color is None:
+        color = piece_color(piece, role)
+    obj["pcg_piece"] = SHADING_PIECES.index(piece) if piece in SHADING_PIECES else -1
+    obj["pcg_role"] = SHADING_ROLES.index(role) if role in SHADING_ROLES else -1
+    obj["pcg_elevation"] = elevation
+    obj["pcg_color"] = list(color)
+    obj.color = color
+
+    slots = obj.material_slots
+    if not slots:
+        obj.data.materials.append(material)
+        return
+    for slot in slots:
+        if slot.material != material:
+            slot.link = 'OBJECT'
+            slot.material = material
@@ -0,0 +1,72 @@
+"""Uniform-grid spatial hash for 2D bounding-box queries.
+
+Items are registered under every grid bucket their XY bounding box touches;
+a query visits the buckets its own box touches and yields each candidate
+once. With a bucket size close to the typical item size both operations are
+O(1) on average, independent of how many items are stored.
+
+Generic on purpose: callers store whatever payload they need and do their
+own exact overlap test on the candidates.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Generic, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SpatialHash(Generic[T]):
+    """Buckets payloads by the ``cell_size`` grid squares their boxes touch."""
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0.0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._inv = 1.0 / cell_size
+        self._buckets: Dict[tuple, List[int]] = {}
+        self._items: List[T] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _span(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        inv = self._inv
+        return (math.floor(min_x * inv), math.floor(min_y * inv),
+                math.floor(max_x * inv), math.floor(max_y * inv))
+
+    def insert(self, item: T, min_x: float, min_y: float,
+               max_x: float, max_y: float) -> int:
+        """Register ``item`` under its XY box; returns its handle."""
+        handle = len(self._items)
+        self._items.append(item)
+        x0, y0, x1, y1 = self._span(min_x, min_y, max_x, max_y)
+        buckets = self._buckets
+        for bx in range(x0, x1 + 1):
+            for by in range(y0, y1 + 1):
+                bucket = buckets.get((bx, by))
+                if bucket is None:
+                    buckets[(bx, by)] = [handle]
+                else:
+                    bucket.append(handle)
+        return handle
+
+    def query(self, min_x: float, min_y: float,
+              max_x: float, max_y: float) -> Iterator[T]:
+        """Yield every item whose buckets overlap the given XY box, once."""
+        x0, y0, x1, y1 = self._span(min_x, min_y, max_x, max_y)
+        buckets = self._buckets
+        items = self._items
+        if x0 == x1 and y0 == y1:
+            # Common case: the query box sits inside one bucket.
+            for handle in buckets.get((x0, y0), ()):
+                yield items[handle]
+            return
+        seen = set()
+        for bx in range(x0, x1 + 1):
+            for by in range(y0, y1 + 1):
+                for handle in buckets.get((bx, by), ()):
+                    if handle not in seen:
+                        seen.add(handle)
+                        yield items[handle]
@@ -0,0 +1,130 @@
+"""On-disk cache of finished terrain heightmaps.
+
+Terrain is a pure function of the spline, the seed, the terrain settings and
+the flat zones, so a Generate that only changed, say, wall height can reuse
+the last heightmap. Each entry is a directory named by a content hash under
+``cache/`` (next to ``presets/``) holding the final heightmap and the spline
+distance field as ``.npy`` files. Loads memory-map them, so a hit costs a
+few file opens however large the grid is.
+
+The cache is bounded in bytes. Every hit touches the entry's mtime, and
+stores evict the least recently used entries until the total fits. Entries
+are written to a temporary directory and renamed into place, so a crash or
+a second Blender instance never sees half an entry. Bump
+:data:`CACHE_VERSION` whenever terrain generation changes its output.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+CACHE_VERSION = 1
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+_ARRAYS = ("heightmap", "nearest_z", "nearest_dist")
+
+
+def get_cache_directory() -> str:
+    """Get the directory path for cached terrain (created on first store)."""
+    addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(addon_dir, "cache")
+
+
+def cache_key(settings: Dict[str, Any], *arrays: np.ndarray) -> str:
+    """Hex digest over JSON-able ``settings`` and the bytes of ``arrays``."""
+    h = hashlib.sha256()
+    h.update(json.dumps({"version": CACHE_VERSION, **settings},
+                        sort_keys=True, default=repr).encode())
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(f"{a.dtype.str}{a.shape}".encode())
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+@dataclass
+class CachedTerrain:
+    heightmap: np.ndarray       # read-only memory maps
+    nearest_z: np.ndarray
+    nearest_dist: np.ndarray
+    bounds: Tuple[float, float, float, float]
+
+
+class TerrainCache:
+    """Size-bounded LRU store of terrain arrays keyed by :func:`cache_key`."""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = directory or get_cache_directory()
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def load(self, key: str) -> Optional[CachedTerrain]:
+        """Memory-map a stored entry, or None on a miss or a damaged entry."""
+        path = self._entry(key)
+        try:
+            with open(os.path.join(path, "meta.json")) as f:
+                meta = json.load(f)
+            arrays = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                      for name in _ARRAYS]
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CachedTerrain(*arrays, bounds=tuple(meta["bounds"]))
+
+    def store(self, key: str, heightmap: np.ndarray, nearest_z: np.ndarray,
+              nearest_dist: np.ndarray, bounds: Tuple[float, float, float, float]) -> bool:
+        """Write an entry and evict old ones; False when the disk refused."""
+        final = self._entry(key)
+        tmp = f"{final}.tmp-{os.getpid()}"
+        try:
+            os.makedirs(tmp, exist_ok=True)
+            for name, a in zip(_ARRAYS, (heightmap, nearest_z, nearest_dist)):
+                np.save(os.path.join(tmp, f"{name}.npy"), np.asarray(a, dtype=np.float32))
+            with open(os.path.join(tmp, "meta.json"), "w") as f:
+                json.dump({"bounds": list(bounds), "created": time.time()}, f)
+            if os.path.isdir(final):
+                shutil.rmtree(tmp)       # written meanwhile by someone else
+            else:
+                os.replace(tmp, final)
+        except OSError as e:
+            print(f"PCG: could not cache terrain - {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self.evict(keep=key)
+        return True
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Drop least recently used entries until the cache fits."""
+        try:
+            names = [n for n in os.listdir(self.directory) if ".tmp-" not in n]
+        except OSError:
+            return
+        entries = []
+        total = 0
+        for name in names:
+            path = self._entry(name)
+            try:
+                size = sum(e.stat().st_size for e in os.scandir(path) if e.is_file())
+                entries.append((os.stat(path).st_mtime, size, name))
+            except OSError:
+                continue
+            total += size
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(self._entry(name), ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,214 @@
+"""Adaptive terrain triangulation from a restricted quadtree.
+
+A uniform heightmap grid spends as many triangles on distant hills as on the
+road corridor. This module picks, per region, the coarsest quad that still
+fits the heightmap and then triangulates the quads without cracks:
+
+1. the grid is covered by a forest of square roots of ``max_size`` cells;
+   every node at level ``l`` spans ``2**l`` cells;
+2. a node splits when its heights stray more than a tolerance from the
+   bilinear patch over its four corners. The tolerance grows with the
+   node's distance from the spline (``max_error * (1 + d / falloff)``),
+   and nodes within ``detail_radius`` of the spline always split down to
+   single cells. Nodes hanging over the grid edge always split;
+3. the tree is *restricted*: leaves that share an edge differ by at most
+   one level, enforced by splitting coarse leaves until it holds;
+4. a leaf whose neighbours are all as coarse becomes two triangles. A leaf
+   with a finer neighbour fans out from its centre and picks up that
+   edge's midpoint, so the T-junction is stitched instead of cracking.
+
+Everything is done level by level on whole arrays. The output refers to
+grid vertices by flat index ``i * cols + j`` and tags every triangle with
+the root it came from, so callers can split the mesh along root borders;
+with ``max_size`` equal to the terrain tile size no leaf crosses a tile
+edge, and the stitching still runs across it. Nothing imports ``bpy``.
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import numpy as np
+
+# Distance from the spline (metres) over which the tolerance doubles.
+DETAIL_FALLOFF = 32.0
+
+_OUTSIDE = 127  # leaf level of cells outside the grid: never "finer"
+
+
+def _block_reduce(a: np.ndarray, s: int, op) -> np.ndarray:
+    """Reduce ``(n*s (+1), m*s (+1))`` into ``(n, m)`` blocks; a trailing
+    extra row / column is folded into the last block."""
+    starts_r = np.arange(0, a.shape[0] - (a.shape[0] % s == 1), s)
+    starts_c = np.arange(0, a.shape[1] - (a.shape[1] % s == 1), s)
+    return op.reduceat(op.reduceat(a, starts_r, axis=0), starts_c, axis=1)
+
+
+def _upsample(a: np.ndarray) -> np.ndarray:
+    return a.repeat(2, axis=0).repeat(2, axis=1)
+
+
+def _node_error(h: np.ndarray, s: int) -> np.ndarray:
+    """Max deviation from each level-``s`` node's bilinear corner patch."""
+    n_r = (h.shape[0] - 1) // s
+    n_c = (h.shape[1] - 1) // s
+    corners = h[::s, ::s]
+    i = np.arange(h.shape[0])
+    j = np.arange(h.shape[1])
+    a = np.minimum(i // s, n_r - 1)
+    b = np.minimum(j // s, n_c - 1)
+    u = ((i - a * s) / s).astype(np.float32)[:, None]
+    v = ((j - b * s) / s).astype(np.float32)[None, :]
+    c00 = corners[a][:, b]
+    c01 = corners[a][:, b + 1]
+    c10 = corners[a + 1][:, b]
+    c11 = corners[a + 1][:, b + 1]
+    top = c00 + (c01 - c00) * v
+    bottom = c10 + (c11 - c10) * v
+    residual = np.abs(h - (top + (bottom - top) * u))
+    return _block_reduce(residual, s, np.maximum)
+
+
+def adaptive_triangles(heightmap: np.ndarray, nearest_dist: np.ndarray,
+                       max_error: float, detail_radius: float = 0.0,
+                       max_size: int = 256, falloff: float = DETAIL_FALLOFF
+                       ) -> Tuple[np.ndarray, np.ndarray]:
+    """Crack-free triangles over ``heightmap`` from a restricted quadtree.
+
+    Args:
+        heightmap: ``(rows, cols)`` heights
+        nearest_dist: ``(rows, cols)`` distance to the spline (``inf`` = far)
+        max_error: allowed height deviation at the spline, in metres
+        detail_radius: nodes closer than this to the spline stay at full
+            resolution
+        max_size: root size in cells, a power of two
+        falloff: distance over which the tolerance doubles
+
+    Returns:
+        ``(tris, roots)``: int64 ``(T, 3)`` flat vertex indices, wound
+        counter-clockwise seen from +Z, and int64 ``(T, 2)`` ``(root row,
+        root column)`` of each triangle.
+    """
+    rows, cols = heightmap.shape
+    empty = (np.zeros((0, 3), dtype=np.int64), np.zeros((0, 2), dtype=np.int64))
+    if rows < 2 or cols < 2:
+        return empty
+    top_level = max(0, int(max_size).bit_length() - 1)
+    size = 1 << top_level
+    roots_r = -(-(rows - 1) // size)
+    roots_c = -(-(cols - 1) // size)
+    cells_r, cells_c = roots_r * size, roots_c * size
+
+    pad = ((0, cells_r + 1 - rows), (0, cells_c + 1 - cols))
+    h = np.pad(np.asarray(heightmap, dtype=np.float32), pad, mode="edge")
+    d = np.pad(np.asarray(nearest_dist, dtype=np.float32), pad,
+               mode="constant", constant_values=np.inf)
+
+    # ---- Per-level split wishes, top-down existence
+    levels = range(top_level, -1, -1)
+    outside = {}
+    partial = {}
+    want = {}
+    for level in levels:
+        s = 1 << level
+        a = np.arange(cells_r // s)[:, None] * s
+        b = np.arange(cells_c // s)[None, :] * s
+        outside[level] = (a >= rows - 1) | (b >= cols - 1)
+        partial[level] = ~outside[level] & ((a + s > rows - 1) | (b + s > cols - 1))
+        if level == 0:
+            want[level] = np.zeros_like(outside[level])
+            continue
+        dmin = _block_reduce(d, s, np.minimum)
+        tol = max_error * (1.0 + dmin / falloff)
+        want[level] = partial[level] | (_node_error(h, s) > tol) | (dmin < detail_radius)
+
+    leaf = {}
+    exists = ~outside[top_level]
+    for level in levels:
+        split = exists & want[level] if level > 0 else np.zeros_like(exists)
+        leaf[level] = exists & ~split
+        if level > 0:
+            exists = _upsample(split) & ~outside[level - 1]
+
+    # ---- Restrict: edge neighbours differ by at most one level
+    def level_map() -> np.ndarray:
+        lm = np.full((cells_r, cells_c), _OUTSIDE, dtype=np.int8)
+        for level in levels:
+            s = 1 << level
+            cover = leaf[level].repeat(s, axis=0).repeat(s, axis=1)
+            lm[cover] = level
+        return lm
+
+    while True:
+        lm = level_map()
+        nb = lm.copy()
+        np.minimum(nb[1:], lm[:-1], out=nb[1:])
+        np.minimum(nb[:-1], lm[1:], out=nb[:-1])
+        np.minimum(nb[:, 1:], lm[:, :-1], out=nb[:, 1:])
+        np.minimum(nb[:, :-1], lm[:, 1:], out=nb[:, :-1])
+        changed = False
+        for level in levels:
+            if level < 2:
+                break
+            s = 1 << level
+            ring = nb.reshape(cells_r // s, s, cells_c // s, s).min(axis=(1, 3))
+            need = leaf[level] & (ring < level - 1)
+            if need.any():
+                leaf[level] &= ~need
+                leaf[level - 1] |= _upsample(need) & ~outside[level - 1]
+                changed = True
+        if not changed:
+            break
+
+    # ---- Triangulate
+    tris: List[np.ndarray] = []
+    owners: List[np.ndarray] = []
+
+    def vid(i, j):
+        return i * cols + j
+
+    def emit(t: np.ndarray, i0: np.ndarray, j0: np.ndarray) -> None:
+        if len(t):
+            tris.append(t)
+            owners.append(np.stack([i0 // size, j0 // size], axis=1))
+
+    for level in levels:
+        a, b = np.nonzero(leaf[level])
+        if not len(a):
+            continue
+        s = 1 << level
+        i0, j0 = a * s, b * s
+        i1, j1 = i0 + s, j0 + s
+        p0, p1, p2, p3 = vid(i0, j0), vid(i0, j1), vid(i1, j1), vid(i1, j0)
+        if level == 0:
+            flags = np.zeros((len(a), 4), dtype=bool)
+        else:
+            # Neighbour leaf level just across each edge (S, E, N, W).
+            flags = np.stack([
+                np.where(i0 > 0, lm[np.maximum(i0 - 1, 0), j0], _OUTSIDE),
+                np.where(j1 < cells_c, lm[i0, np.minimum(j1, cells_c - 1)], _OUTSIDE),
+                np.where(i1 < cells_r, lm[np.minimum(i1, cells_r - 1), j0], _OUTSIDE),
+                np.where(j0 > 0, lm[i0, np.maximum(j0 - 1, 0)], _OUTSIDE),
+            ], axis=1) < level
+        plain = ~flags.any(axis=1)
+        emit(np.concatenate([np.stack([p0[plain], p1[plain], p2[plain]], 1),
+                             np.stack([p0[plain], p2[plain], p3[plain]], 1)]),
+             np.concatenate([i0[plain]] * 2), np.concatenate([j0[plain]] * 2))
+        if plain.all():
+            continue
+        fan = ~plain
+        hs = s // 2
+        c = vid(i0 + hs, j0 + hs)
+        mids = (vid(i0, j0 + hs), vid(i0 + hs, j1), vid(i1, j0 + hs), vid(i0 + hs, j0))
+        edges = ((p0, p1), (p1, p2), (p2, p3), (p3, p0))
+        for e, ((pa, pb), m) in enumerate(zip(edges, mids)):
+            whole = fan & ~flags[:, e]
+            halves = fan & flags[:, e]
+            emit(np.stack([c[whole], pa[whole], pb[whole]], 1), i0[whole], j0[whole])
+            emit(np.concatenate([np.stack([c[halves], pa[halves], m[halves]], 1),
+                                 np.stack([c[halves], m[halves], pb[halves]], 1)]),
+                 np.concatenate([i0[halves]] * 2), np.concatenate([j0[halves]] * 2))
+
+    if not tris:
+        return empty
+    return np.concatenate(tris).astype(np.int64), np.concatenate(owners).astype(np.int64)
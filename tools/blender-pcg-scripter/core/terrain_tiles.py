@@ -0,0 +1,156 @@
+"""Tiled terrain heightmaps computed in worker processes.
+
+The terrain grid is split into square blocks of :data:`TILE_CELLS` nodes.
+Each block is computed on its own -- fBm heightmap, spline distance field
+and the spline shaping stages -- and written back into one global
+array, so the result is exactly what a single pass would produce:
+
+* noise is a pure function of world position (:mod:`.noise`), so blocks
+  agree wherever they meet;
+* the distance field of a block is computed over the block grown by a halo
+  of ``halo`` nodes. Spline segments outside that window are not seen, so
+  distances are exact up to the halo width and only known to be larger
+  beyond it. Callers size the halo to the reach of the road shaping, past
+  which the shaping is a no-op anyway.
+
+Blocks run in a spawn-context :class:`~concurrent.futures.ProcessPoolExecutor`.
+Workers import this module through a package shim installed by the pool
+initializer, because the add-on's own ``__init__`` imports ``bpy``; nothing
+this module imports needs Blender. When no pool can be started the blocks
+are computed in-process.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .distance_field import polyline_distance_field
+from .heightfield import SplineShaping, noise_heightmap, shape_along_spline
+
+TILE_CELLS = 256
+
+# Not worth a pool (process start-up plus importing numpy per worker)
+# below this many grid nodes.
+MIN_POOL_NODES = 512 * 512
+
+
+@dataclass(frozen=True)
+class TileSettings:
+    """The slice of GenerationParams a tile needs; picklable without bpy."""
+
+    seed: int
+    height_variation: float
+    smoothness: float
+    stages: Tuple[SplineShaping, ...]   # applied in order inside the worker
+
+
+@dataclass(frozen=True)
+class TileJob:
+    key: Tuple[int, int]        # (tile column, tile row)
+    row0: int                   # first global row / column of the block
+    col0: int
+    rows: int
+    cols: int
+    halo: int                   # extra nodes each side for the distance field
+    origin: Tuple[float, float] # world XY of global node (0, 0)
+    resolution: float           # metres between nodes
+    grid_shape: Tuple[int, int] # global (rows, cols)
+    spline: np.ndarray          # (N, 3) spline polyline
+    settings: TileSettings
+
+
+@dataclass
+class TileResult:
+    key: Tuple[int, int]
+    row0: int
+    col0: int
+    heightmap: np.ndarray       # (rows, cols) float32, shaped
+    nearest_z: np.ndarray
+    nearest_dist: np.ndarray
+
+
+def plan_tiles(rows: int, cols: int, tile_cells: int = TILE_CELLS
+               ) -> List[Tuple[Tuple[int, int], int, int, int, int]]:
+    """Disjoint ``(key, row0, col0, rows, cols)`` blocks covering the grid."""
+    out = []
+    for ti, r0 in enumerate(range(0, rows, tile_cells)):
+        for tj, c0 in enumerate(range(0, cols, tile_cells)):
+            out.append(((tj, ti), r0, c0, min(tile_cells, rows - r0),
+                        min(tile_cells, cols - c0)))
+    return out
+
+
+def compute_tile(job: TileJob) -> TileResult:
+    """Heightmap, distance field and spline shaping for one block."""
+    res = job.resolution
+    ox, oy = job.origin
+    total_rows, total_cols = job.grid_shape
+    # Halo window, clamped to the global grid.
+    r_lo = max(0, job.row0 - job.halo)
+    c_lo = max(0, job.col0 - job.halo)
+    r_hi = min(total_rows, job.row0 + job.rows + job.halo)
+    c_hi = min(total_cols, job.col0 + job.cols + job.halo)
+    window = (ox + c_lo * res, ox + (c_hi - 1) * res,
+              oy + r_lo * res, oy + (r_hi - 1) * res)
+    nearest_z, nearest_dist = polyline_distance_field(
+        job.spline, window, r_hi - r_lo, c_hi - c_lo)
+    inner = (slice(job.row0 - r_lo, job.row0 - r_lo + job.rows),
+             slice(job.col0 - c_lo, job.col0 - c_lo + job.cols))
+    nearest_z = np.ascontiguousarray(nearest_z[inner])
+    nearest_dist = np.ascontiguousarray(nearest_dist[inner])
+
+    s = job.settings
+    bounds = (ox + job.col0 * res, ox + (job.col0 + job.cols - 1) * res,
+              oy + job.row0 * res, oy + (job.row0 + job.rows - 1) * res)
+    heightmap = noise_heightmap(bounds, job.rows, job.cols, s.seed,
+                                s.height_variation, s.smoothness)
+    shape_along_spline(heightmap, nearest_z, nearest_dist, s.stages)
+    return TileResult(job.key, job.row0, job.col0, heightmap, nearest_z, nearest_dist)
+
+
+def _worker_bootstrap_source() -> str:
+    """Source run in each worker before any job.
+
+    Registers every package above ``core`` as a bare module whose
+    ``__path__`` is its directory, so ``<addon>.core.terrain_tiles`` imports
+    without running the add-on ``__init__`` (which needs ``bpy``).
+    """
+    parts = __name__.split(".")[:-2]          # packages above core
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    lines = ["import sys, types"]
+    for depth in range(len(parts), 0, -1):
+        name = ".".join(parts[:depth])
+        lines.append(f"m = types.ModuleType({name!r}); m.__path__ = [{directory!r}]; "
+                     f"sys.modules.setdefault({name!r}, m)")
+        directory = os.path.dirname(directory)
+    return "\n".join(lines)
+
+
+def compute_tiles(jobs: List[TileJob], max_workers: Optional[int] = None
+                  ) -> List[TileResult]:
+    """Run ``jobs``, in worker processes when it pays off."""
+    nodes = sum(j.rows * j.cols for j in jobs)
+    workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+    workers = min(workers, len(jobs))
+    if workers > 1 and nodes >= MIN_POOL_NODES:
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=exec,
+                                     initargs=(_worker_bootstrap_source(),)) as pool:
+                return list(pool.map(compute_tile, jobs))
+        except Exception as e:
+            print(f"PCG: terrain tile pool unavailable, computing in-process - {e}")
+    return [compute_tile(job) for job in jobs]
+
+
+def tile_halo(reach: float, resolution: float) -> int:
+    """Halo in nodes so distances are exact out to ``reach`` metres."""
+    return int(math.ceil(reach / resolution)) + 1
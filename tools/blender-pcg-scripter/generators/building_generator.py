@@ -12,29 +12,41 @@ Performance design:
   pushes, no depsgraph eval, no viewport refresh per spawn.
 * Mesh sharing. All box-shaped pieces (floor, wall, half-wall, pillar) reuse a
   single per-generation unit-cube mesh; doorways / ramps / stairs are cached
-  per quantized dimension tuple. A 200-cell level typically ends up with 1
-  floor mesh, 1 wall mesh, 1 doorway mesh and ~few ramp meshes shared across
-  hundreds of objects.
+  per quantized dimension tuple and built as single profile extrusions with
+  shared vertices (no welded boxes, no hidden internal faces). A 200-cell
+  level typically ends up with 1 floor mesh, 1 wall mesh, 1 doorway mesh and
+  ~few ramp meshes shared across hundreds of objects.
 * Per-generation caches. Override-collection mesh lists, layer source
   collections and per-piece sub-collections are all looked up once and reused.
 * Per-cell trig and world position computed once and reused across the four
   cardinal edges.
-
-The decoration pass (existing layer system) lives in :py:meth:`populate_cell`
-and shares the same mesh / collection caches.
+* Plan, then realize. The passes emit lightweight :class:`Placement` records;
+  post-passes such as collinear wall merging shrink the plan before any
+  object exists, so a 200-cell straight corridor spawns a handful of long
+  wall segments instead of 400 unit walls, and a flat lateral room becomes a
+  few floor slabs instead of one tile per cell.
+
+The decoration pass (existing layer system) lives in :py:meth:`decorate`,
+which plans every layer across all cells at once (see
+:mod:`.decoration_engine`) and shares the same mesh / collection caches.
+:py:meth:`populate_cell` remains for callers that decorate one cell at a
+time.
 """
 
 from __future__ import annotations
 
 import math
+import os
 import random
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import bpy
 import mathutils
+import numpy as np
 
-from ..core.layer_system import CellTarget, LayerConfig, PlacementRule
+from ..core.layer_system import CellTarget, CollisionMode, LayerConfig, PlacementRule
+from ..core.naming import NameAllocator
 from ..core.parameters import (
     PIECE_DOORWAY,
     PIECE_FLOOR,
@@ -45,6 +57,15 @@ from ..core.parameters import (
     PIECE_WALL_HALF,
     GenerationParams,
 )
+from ..core.scene_manager import ChunkedCollections
+from ..core.shading import SHADING_ATTRIBUTE, apply_attribute_shading, shared_material
+from .decoration_engine import (
+    CellArrays,
+    PropBatch,
+    apply_budget,
+    coerce_collision_mode,
+    plan_decoration,
+)
 from .layout_generator import (
     CARDINALS,
     DIR_E,
@@ -52,8 +73,41 @@ from .layout_generator import (
     DIR_OFFSETS,
     DIR_S,
     DIR_W,
+    OPPOSITE,
     Cell,
 )
+from .occupancy import (
+    BLOCKING_KINDS,
+    OCC_CLEARANCE,
+    OCC_PROP,
+    OCC_STRUCTURE,
+    OccupancyIndex,
+)
+from .placement_plan import (
+    MERGEABLE_WALL_PIECES,
+    Placement,
+    merge_collinear_walls,
+    merge_coplanar_floors,
+)
+from .poisson_disk import poisson_disk_sample, radius_for_density
+from .wfc_solver import (
+    CONTEXTS,
+    CTX_CONNECTED,
+    CTX_EXTERIOR,
+    CTX_ROAD,
+    CTX_ROAD_STEP,
+    CTX_SEALED,
+    CTX_STEP,
+    DEFAULT_RULES_FILE,
+    PIECE_TRAVERSAL,
+    REL_ALONG,
+    REL_CORNER,
+    RELATIONS,
+    STEP_CONTEXTS,
+    WFCRules,
+    WFCSolver,
+    get_rules_directory,
+)
 
 
 class BlockType(Enum):
@@ -67,6 +121,17 @@ class BlockType(Enum):
     PILLAR = PIECE_PILLAR
 
 
+# Piece selection strategies for the wall / traversal passes.
+SOLVER_RULES = "RULES"
+SOLVER_WFC = "WFC"
+
+# Edge pairs sharing a cell corner, and the cardinals perpendicular to each.
+_CORNER_PAIRS = ((DIR_N, DIR_E), (DIR_E, DIR_S), (DIR_S, DIR_W), (DIR_W, DIR_N))
+_PERPENDICULAR: Dict[str, Tuple[str, str]] = {
+    DIR_N: (DIR_E, DIR_W), DIR_S: (DIR_E, DIR_W),
+    DIR_E: (DIR_N, DIR_S), DIR_W: (DIR_N, DIR_S),
+}
+
 # Yaw (Z-rotation) used to face a piece toward a cardinal direction.
 # Pieces are authored facing +Y (north) by default.
 _CARDINAL_YAW: Dict[str, float] = {
@@ -78,6 +143,13 @@ _CARDINAL_YAW: Dict[str, float] = {
 
 _EDGE_INDEX: Dict[str, int] = {DIR_N: 1, DIR_E: 2, DIR_S: 3, DIR_W: 4}
 
+# Object-level display settings carried from an override source to the
+# objects instanced from it (``objects.new`` starts from defaults).
+_INSTANCE_DISPLAY_ATTRS = (
+    "display_type", "display_bounds_type", "show_bounds", "show_wire",
+    "show_in_front", "show_name", "show_axis", "color", "hide_render",
+)
+
 # Unit cube vertex/face data; reused as the source for every box-shaped piece.
 # Vertex indexing: bit pattern is (x, y, z) sign with x outer-most loop.
 #   0=(−,−,−), 1=(−,−,+), 2=(−,+,−), 3=(−,+,+),
@@ -101,36 +173,60 @@ _UNIT_CUBE_FACES: Tuple[Tuple[int, int, int, int], ...] = (
 )
 
 
-def _box_face_block(verts: List[Tuple[float, float, float]],
-                    faces: List[Tuple[int, int, int, int]],
-                    cx: float, cy: float, cz: float,
-                    sx: float, sy: float, sz: float) -> None:
-    """Append one axis-aligned box's 8 verts + 6 quad faces to lists.
+# Placeholder proportions, shared with the collision pass (collision.py) so
+# colliders hug the same shapes.
+HALF_WALL_HEIGHT = 0.45   # cover height as a fraction of wall height
+
+
+def wall_thickness(grid_size: float) -> float:
+    return max(0.1, grid_size * 0.1)
+
+
+def floor_thickness(grid_size: float) -> float:
+    return max(0.05, grid_size * 0.05)
 
-    Used by composite primitives (doorway, stairs) that are several boxes
-    welded into a single mesh. Face windings match the unit-cube template
-    (outward-pointing normals).
+
+def pillar_radius(grid_size: float) -> float:
+    return max(0.1, grid_size * 0.08)
+
+
+def doorway_frame(dims_x: float, dims_z: float) -> Tuple[float, float]:
+    """``(post_width, lintel_height)`` of a doorway ``dims_x`` x ``dims_z``."""
+    return max(0.15, dims_x * 0.15), max(0.15, dims_z * 0.2)
+
+
+def _extrude_profile(profile: Sequence[Tuple[float, float]], depth: float
+                     ) -> Tuple[List[Tuple[float, float, float]],
+                                List[Tuple[int, ...]]]:
+    """Extrude a closed (x, z) outline along Y into a watertight prism.
+
+    Used by the composite primitives (doorway, ramp, stairs). Every outline
+    point becomes exactly two vertices (front cap at ``-depth/2``, back cap at
+    ``+depth/2``) shared by both caps and the side quads, so an ``n``-point
+    profile yields ``2n`` verts, ``n`` side quads and two ``n``-gon caps with
+    no hidden interior faces. Winding is normalised to CCW in the XZ plane so
+    every face normal points outward regardless of the caller's ordering.
     """
-    base = len(verts)
-    hx, hy, hz = sx * 0.5, sy * 0.5, sz * 0.5
-    verts.extend((
-        (cx - hx, cy - hy, cz - hz),  # 0 (-,-,-)
-        (cx - hx, cy - hy, cz + hz),  # 1 (-,-,+)
-        (cx - hx, cy + hy, cz - hz),  # 2 (-,+,-)
-        (cx - hx, cy + hy, cz + hz),  # 3 (-,+,+)
-        (cx + hx, cy - hy, cz - hz),  # 4 (+,-,-)
-        (cx + hx, cy - hy, cz + hz),  # 5 (+,-,+)
-        (cx + hx, cy + hy, cz - hz),  # 6 (+,+,-)
-        (cx + hx, cy + hy, cz + hz),  # 7 (+,+,+)
-    ))
-    faces.extend((
-        (base + 0, base + 1, base + 3, base + 2),  # -X
-        (base + 4, base + 6, base + 7, base + 5),  # +X
-        (base + 0, base + 4, base + 5, base + 1),  # -Y
-        (base + 2, base + 3, base + 7, base + 6),  # +Y
-        (base + 0, base + 2, base + 6, base + 4),  # -Z
-        (base + 1, base + 5, base + 7, base + 3),  # +Z
-    ))
+    pts = list(profile)
+    area2 = 0.0
+    for i, (x0, z0) in enumerate(pts):
+        x1, z1 = pts[(i + 1) % len(pts)]
+        area2 += x0 * z1 - x1 * z0
+    if area2 < 0.0:
+        pts.reverse()
+
+    n = len(pts)
+    hy = depth * 0.5
+    verts: List[Tuple[float, float, float]] = [(x, -hy, z) for x, z in pts]
+    verts.extend((x, hy, z) for x, z in pts)
+    faces: List[Tuple[int, ...]] = [
+        tuple(range(n)),                      # front cap (-Y)
+        tuple(range(2 * n - 1, n - 1, -1)),   # back cap (+Y)
+    ]
+    for i in range(n):
+        j = (i + 1) % n
+        faces.append((i, n + i, n + j, j))
+    return verts, faces
 
 
 class BuildingBlockGenerator:
@@ -141,9 +237,10 @@ class BuildingBlockGenerator:
     * :py:meth:`build_blockout` runs the FLOOR / WALL / TRAVERSAL / PILLAR
       passes and links each piece into a per-piece sub-collection beneath the
       ``parent_collection`` argument when provided.
-    * :py:meth:`populate_cell` runs the user-defined decoration layers on a
-      single cell, optionally linking each placed prop directly under a
-      ``Decoration`` parent collection.
+    * :py:meth:`decorate` runs the user-defined decoration layers across all
+      cells, optionally linking each placed prop directly under a
+      ``Decoration`` parent collection. :py:meth:`populate_cell` does the
+      same for a single cell.
     """
 
     # -------------------------------------------------- construction & utils
@@ -156,8 +253,38 @@ class BuildingBlockGenerator:
         self._mesh_cache: Dict[Any, bpy.types.Mesh] = {}
         self._override_cache: Dict[str, List[bpy.types.Object]] = {}
         self._layer_meshes_cache: Dict[str, List[bpy.types.Object]] = {}
-        # parent_id(int) -> {layer_name -> Collection}, populated by populate_cell.
+        # parent_id(int) -> {layer_name -> Collection}, filled by the decoration pass.
         self._layer_subcoll_cache: Dict[int, Dict[str, bpy.types.Collection]] = {}
+        # Per-generation name namespace; reserved by build_blockout.
+        self._names: Optional[NameAllocator] = None
+        # Raw (pre-merge) and final (post-merge) blockout plans of the last
+        # build_blockout; the decoration pass uses the final one for
+        # collision rejection, region regeneration needs both.
+        self._raw_blockout_plan: List[Placement] = []
+        self._blockout_plan: List[Placement] = []
+        # Batches realized by the last decorate().
+        self._decoration_plan: List[PropBatch] = []
+        # parent_id(int) -> {piece_id -> Collection}, filled by realize_plan.
+        self._piece_subcoll_cache: Dict[int, Dict[str, bpy.types.Collection]] = {}
+        # collection name -> (unscaled, scaled) per-source extents, see
+        # _source_extents.
+        self._source_extents_cache: Dict[str, Tuple[Any, Any]] = {}
+        # cell id -> Cell of the last build_blockout; realize_plan reads role
+        # and elevation from it for attribute shading.
+        self._cells_by_id: Dict[int, Cell] = {}
+        # Parsed WFC rules (piece_solver == "WFC"), loaded on first use.
+        self._wfc_rules: Optional[WFCRules] = None
+        # Backtracks the last WFC solve needed.
+        self.wfc_backtracks = 0
+        # Candidates dropped by the last plan_decoration, per layer name:
+        # {"budget": {...}, "collision": {...}}.
+        self.decoration_dropped: Dict[str, Dict[str, int]] = {
+            "budget": {}, "collision": {}}
+
+    def _name_allocator(self) -> NameAllocator:
+        if self._names is None:
+            self._names = NameAllocator(self.params.decoration_naming)
+        return self._names
 
     @staticmethod
     def align_to_grid(position: mathutils.Vector, grid_size: float) -> mathutils.Vector:
@@ -190,20 +317,22 @@ class BuildingBlockGenerator:
         cached = self._mesh_cache.get(key)
         if cached is not None:
             return cached
-        thickness = max(0.1, self.params.grid_size * 0.1)
-        post_w = max(0.15, dims_x * 0.15)
-        lintel_h = max(0.15, dims_z * 0.2)
+        thickness = wall_thickness(self.params.grid_size)
+        post_w, lintel_h = doorway_frame(dims_x, dims_z)
         opening_h = dims_z - lintel_h
-        side_offset = dims_x * 0.5 - post_w * 0.5
-
-        verts: List[Tuple[float, float, float]] = []
-        faces: List[Tuple[int, int, int, int]] = []
-        _box_face_block(verts, faces, -side_offset, 0.0, opening_h * 0.5,
-                        post_w, thickness, opening_h)
-        _box_face_block(verts, faces,  side_offset, 0.0, opening_h * 0.5,
-                        post_w, thickness, opening_h)
-        _box_face_block(verts, faces, 0.0, 0.0, opening_h + lintel_h * 0.5,
-                        dims_x, thickness, lintel_h)
+        hx = dims_x * 0.5
+
+        # Portal outline: two posts + lintel as one notched profile.
+        verts, faces = _extrude_profile((
+            (-hx, 0.0),
+            (-hx + post_w, 0.0),
+            (-hx + post_w, opening_h),
+            (hx - post_w, opening_h),
+            (hx - post_w, 0.0),
+            (hx, 0.0),
+            (hx, dims_z),
+            (-hx, dims_z),
+        ), thickness)
 
         mesh = bpy.data.meshes.new("PCG_Doorway")
         mesh.from_pydata(verts, [], faces)
@@ -218,23 +347,9 @@ class BuildingBlockGenerator:
             return cached
         # Wedge with bottom rectangle on z=0 and top edge raised on the -X side.
         # Slope descends toward +X, matching the original ramp orientation.
-        # Face winding is CCW viewed from outside so normals point outward.
-        hx, hy = dims_x * 0.5, dims_y * 0.5
-        verts = [
-            (-hx, -hy, 0.0),       # 0 -X -Y bottom
-            (-hx,  hy, 0.0),       # 1 -X +Y bottom
-            ( hx,  hy, 0.0),       # 2 +X +Y bottom
-            ( hx, -hy, 0.0),       # 3 +X -Y bottom
-            (-hx, -hy, dims_z),    # 4 -X -Y top
-            (-hx,  hy, dims_z),    # 5 -X +Y top
-        ]
-        faces = [
-            (0, 1, 2, 3),    # bottom (-Z normal)
-            (0, 4, 5, 1),    # back vertical (-X)
-            (4, 3, 2, 5),    # top slope (+X / +Z)
-            (0, 3, 4),       # -Y triangle
-            (1, 5, 2),       # +Y triangle
-        ]
+        hx = dims_x * 0.5
+        verts, faces = _extrude_profile(
+            ((-hx, 0.0), (hx, 0.0), (-hx, dims_z)), dims_y)
         mesh = bpy.data.meshes.new("PCG_Ramp")
         mesh.from_pydata(verts, [], faces)
         mesh.update()
@@ -250,13 +365,15 @@ class BuildingBlockGenerator:
         n_steps = max(3, int(round(dims_z / max(0.15, self.params.grid_size * 0.075))))
         step_run = dims_x / n_steps
         step_rise = dims_z / n_steps
-        verts: List[Tuple[float, float, float]] = []
-        faces: List[Tuple[int, int, int, int]] = []
-        for i in range(n_steps):
-            cx = (i + 0.5) * step_run - dims_x * 0.5
-            cz = step_rise * (n_steps - i - 0.5)
-            _box_face_block(verts, faces, cx, 0.0, cz,
-                            step_run, dims_y, step_rise)
+        hx = dims_x * 0.5
+        # Solid stepped profile, highest step on the -X side (same facing as
+        # the ramp): 2 floor corners + 2 corners per step = 4 * (n + 1) verts.
+        profile: List[Tuple[float, float]] = [(-hx, 0.0), (hx, 0.0)]
+        for k in range(1, n_steps + 1):
+            profile.append((hx - (k - 1) * step_run, k * step_rise))
+            profile.append((hx - k * step_run, k * step_rise))
+        profile[-1] = (-hx, dims_z)  # snap the last corner against FP drift
+        verts, faces = _extrude_profile(profile, dims_y)
         mesh = bpy.data.meshes.new("PCG_Stairs")
         mesh.from_pydata(verts, [], faces)
         mesh.update()
@@ -310,12 +427,18 @@ class BuildingBlockGenerator:
                         scale: Tuple[float, float, float],
                         target_coll: Optional[bpy.types.Collection]
                         ) -> Optional[bpy.types.Object]:
-        meshes = self._override_meshes(piece_id)
+        return self._spawn_from(self._override_meshes(piece_id), name,
+                                location, yaw, scale, target_coll)
+
+    def _spawn_from(self, meshes: Optional[List[bpy.types.Object]], name: str,
+                    location: Tuple[float, float, float], yaw: float,
+                    scale: Tuple[float, float, float],
+                    target_coll: Optional[bpy.types.Collection]
+                    ) -> Optional[bpy.types.Object]:
+        """Instance a random source of ``meshes`` scaled to ``scale``."""
         if not meshes:
             return None
-        src = self.rng.choice(meshes)
-        obj = src.copy()  # shallow copy: mesh datablock is shared
-        obj.name = name
+        obj = self._instance(self.rng.choice(meshes), name)
         obj.location = location
         obj.rotation_mode = 'XYZ'
         obj.rotation_euler = (0.0, 0.0, yaw)
@@ -323,6 +446,36 @@ class BuildingBlockGenerator:
         self._link(obj, target_coll)
         return obj
 
+    @staticmethod
+    def _instance(src: bpy.types.Object, name: str) -> bpy.types.Object:
+        """New object sharing ``src``'s mesh datablock, created as ``name``.
+
+        ``src.copy()`` first names the copy after ``src`` (forcing Blender to
+        resolve a ``.001`` clash) and is then renamed -- two unique-name
+        passes per spawn. Plain sources go through ``objects.new`` with the
+        final name instead and take over what ``copy()`` would have carried:
+        transform, object-linked materials, custom properties and display
+        settings. Sources with modifiers or constraints still use ``copy()``
+        so that stack comes along.
+        """
+        if src.modifiers or src.constraints:
+            obj = src.copy()  # shallow copy: mesh datablock is shared
+            obj.name = name
+            return obj
+        obj = bpy.data.objects.new(name, src.data)
+        obj.rotation_mode = src.rotation_mode
+        obj.rotation_euler = src.rotation_euler
+        obj.scale = src.scale
+        for slot, src_slot in zip(obj.material_slots, src.material_slots):
+            if src_slot.link == 'OBJECT':
+                slot.link = 'OBJECT'
+                slot.material = src_slot.material
+        for key in src.keys():
+            obj[key] = src[key]
+        for attr in _INSTANCE_DISPLAY_ATTRS:
+            setattr(obj, attr, getattr(src, attr))
+        return obj
+
     # ------------------------------------------------- single-piece API
 
     def generate_block(self, block_type: BlockType, position: mathutils.Vector,
@@ -338,72 +491,83 @@ class BuildingBlockGenerator:
         ``target_coll`` is None the object is linked into the active scene
         collection (legacy fallback).
         """
-        name = f"{block_type.value.capitalize()}_{space_id:04d}_{index:03d}"
-        loc = (position.x, position.y, position.z)
-        scale_xyz = (dimensions.x, dimensions.y, dimensions.z)
-
+        return self._spawn_piece(
+            block_type.value,
+            self._name_allocator().piece_name(block_type.value, space_id, index),
+            (position.x, position.y, position.z),
+            (dimensions.x, dimensions.y, dimensions.z),
+            yaw, target_coll)
+
+    def _spawn_piece(self, piece_id: str, name: str,
+                     loc: Tuple[float, float, float],
+                     dims: Tuple[float, float, float], yaw: float,
+                     target_coll: Optional[bpy.types.Collection]
+                     ) -> bpy.types.Object:
+        """Tuple-based core of :py:meth:`generate_block` used by the realizer."""
         # Override path: shared source mesh, scaled by user-supplied dims.
-        obj = self._spawn_override(block_type.value, name, loc, yaw,
-                                   scale_xyz, target_coll)
+        obj = self._spawn_override(piece_id, name, loc, yaw, dims, target_coll)
         if obj is not None:
             return obj
 
         gs = self.params.grid_size
-        if block_type == BlockType.FLOOR:
-            thickness = max(0.05, gs * 0.05)
+        if piece_id == PIECE_FLOOR:
+            thickness = floor_thickness(gs)
             return self._spawn(
                 self._unit_cube_mesh(), name,
                 (loc[0], loc[1], loc[2] - thickness * 0.5),
-                yaw, (dimensions.x, dimensions.y, thickness), target_coll)
+                yaw, (dims[0], dims[1], thickness), target_coll)
 
-        if block_type == BlockType.WALL or block_type == BlockType.WALL_HALF:
-            thickness = max(0.1, gs * 0.1)
-            full = block_type == BlockType.WALL
-            height = dimensions.z if full else dimensions.z * 0.45
+        if piece_id == PIECE_WALL or piece_id == PIECE_WALL_HALF:
+            thickness = wall_thickness(gs)
+            height = dims[2] if piece_id == PIECE_WALL else dims[2] * HALF_WALL_HEIGHT
             return self._spawn(
                 self._unit_cube_mesh(), name,
                 (loc[0], loc[1], loc[2] + height * 0.5),
-                yaw, (dimensions.x, thickness, height), target_coll)
+                yaw, (dims[0], thickness, height), target_coll)
 
-        if block_type == BlockType.DOORWAY:
+        if piece_id == PIECE_DOORWAY:
             return self._spawn(
-                self._doorway_mesh(dimensions.x, dimensions.z), name,
+                self._doorway_mesh(dims[0], dims[2]), name,
                 loc, yaw, None, target_coll)
 
-        if block_type == BlockType.RAMP:
+        if piece_id == PIECE_RAMP:
             return self._spawn(
-                self._ramp_mesh(dimensions.x, dimensions.y, dimensions.z), name,
+                self._ramp_mesh(dims[0], dims[1], dims[2]), name,
                 loc, yaw, None, target_coll)
 
-        if block_type == BlockType.STAIRS:
+        if piece_id == PIECE_STAIRS:
             return self._spawn(
-                self._stairs_mesh(dimensions.x, dimensions.y, dimensions.z), name,
+                self._stairs_mesh(dims[0], dims[1], dims[2]), name,
                 loc, yaw, None, target_coll)
 
-        if block_type == BlockType.PILLAR:
-            radius = max(0.1, gs * 0.08)
+        if piece_id == PIECE_PILLAR:
+            radius = pillar_radius(gs)
             return self._spawn(
                 self._unit_cube_mesh(), name,
-                (loc[0], loc[1], loc[2] + dimensions.z * 0.5),
-                0.0, (radius * 2, radius * 2, dimensions.z), target_coll)
+                (loc[0], loc[1], loc[2] + dims[2] * 0.5),
+                0.0, (radius * 2, radius * 2, dims[2]), target_coll)
 
         # Fallback: full wall.
-        thickness = max(0.1, gs * 0.1)
+        thickness = wall_thickness(gs)
         return self._spawn(
             self._unit_cube_mesh(), name,
-            (loc[0], loc[1], loc[2] + dimensions.z * 0.5),
-            yaw, (dimensions.x, thickness, dimensions.z), target_coll)
+            (loc[0], loc[1], loc[2] + dims[2] * 0.5),
+            yaw, (dims[0], thickness, dims[2]), target_coll)
 
     # ---------------------------------------------------- blockout pipeline
 
     def build_blockout(self, cells: List[Cell],
-                       parent_collection: Optional[bpy.types.Collection] = None
+                       parent_collection: Optional[bpy.types.Collection] = None,
+                       chunks: Optional[ChunkedCollections] = None
                        ) -> Dict[str, List[bpy.types.Object]]:
         """Run FLOOR / WALL / TRAVERSAL / PILLAR passes on the given cells.
 
-        When ``parent_collection`` is provided, per-piece sub-collections are
-        created lazily under it and pieces are linked in directly (no
-        unlink/relink round-trip via ``scene_manager.organize_objects``).
+        The passes only produce a placement plan (:py:meth:`plan_blockout`);
+        merge post-passes then rewrite the plan and :py:meth:`realize_plan`
+        spawns it. When ``parent_collection`` is provided, per-piece
+        sub-collections are created lazily under it and pieces are linked in
+        directly (no unlink/relink round-trip via
+        ``scene_manager.organize_objects``).
 
         Returns:
             Dict mapping piece-type id -> list of created objects.
@@ -412,7 +576,102 @@ class BuildingBlockGenerator:
         # reused safely across multiple Generate runs.
         self._mesh_cache.clear()
         self._override_cache.clear()
+        self._piece_subcoll_cache.clear()
+        # Fresh name namespace per generation so nothing clashes with the
+        # output of earlier runs still in the file.
+        self._names = NameAllocator(self.params.decoration_naming)
+
+        self._cells_by_id = {c.id: c for c in cells}
+        raw = self.plan_blockout(cells)
+        plan = self.merge_plan(raw)
+        self._raw_blockout_plan = raw
+        self._blockout_plan = plan
+        return self.realize_plan(plan, parent_collection, chunks)
+
+    @property
+    def raw_blockout_plan(self) -> List[Placement]:
+        """Pre-merge plan of the last :py:meth:`build_blockout`."""
+        return self._raw_blockout_plan
+
+    def merge_plan(self, plan: List[Placement]) -> List[Placement]:
+        """Apply the enabled merge post-passes to a raw plan."""
+        if self.params.merge_walls:
+            # Override kits are authored per grid slot; stretching them along
+            # a merged run would distort the asset, so leave those unmerged.
+            plan = merge_collinear_walls(
+                plan, self.params.grid_size,
+                pieces=[p for p in MERGEABLE_WALL_PIECES
+                        if not self._override_meshes(p)])
+        if self.params.merge_floors and not self._override_meshes(PIECE_FLOOR):
+            plan = merge_coplanar_floors(plan, self.params.grid_size)
+        return plan
+
+    def realize_plan(self, plan: List[Placement],
+                     parent_collection: Optional[bpy.types.Collection] = None,
+                     chunks: Optional[ChunkedCollections] = None
+                     ) -> Dict[str, List[bpy.types.Object]]:
+        """Spawn every placement in ``plan``; one object per placement.
+
+        With ``chunks`` each piece goes into the world-chunk collection
+        containing its anchor instead of a per-piece sub-collection. In
+        attribute shading mode every piece is tagged with its owning cell's
+        role and elevation and gets the shared material.
+        """
+        out: Dict[str, List[bpy.types.Object]] = {p.value: [] for p in BlockType}
+
+        # Lazy per-piece sub-collection lookup, kept per generation so later
+        # region patches land in the same sub-collections.
+        sub_colls: Dict[str, bpy.types.Collection] = {}
+        if parent_collection is not None:
+            sub_colls = self._piece_subcoll_cache.setdefault(
+                id(parent_collection), {})
+
+        def coll_for(piece_id: str) -> Optional[bpy.types.Collection]:
+            if parent_collection is None:
+                return None
+            existing = sub_colls.get(piece_id)
+            if existing is not None:
+                return existing
+            new_coll = bpy.data.collections.new(piece_id.capitalize())
+            parent_collection.children.link(new_coll)
+            sub_colls[piece_id] = new_coll
+            return new_coll
+
+        material = None
+        if self.params.shading_mode == SHADING_ATTRIBUTE:
+            material = shared_material()
+        cells_by_id = self._cells_by_id
+
+        names = self._name_allocator().piece_names(
+            [(p.piece, p.space_id, p.index) for p in plan])
+        for p, name in zip(plan, names):
+            if chunks is not None:
+                target = chunks.collection_for(p.location, "blockout", p.piece)
+            else:
+                target = coll_for(p.piece)
+            obj = None
+            if p.collection:
+                # WFC variant kit; falls back to the piece if it is empty.
+                obj = self._spawn_from(self._layer_meshes(p.collection), name,
+                                       p.location, p.yaw, p.dims, target)
+            if obj is None:
+                obj = self._spawn_piece(p.piece, name, p.location, p.dims,
+                                        p.yaw, target)
+            if material is not None:
+                cell = cells_by_id.get(p.space_id)
+                apply_attribute_shading(
+                    obj, material, p.piece,
+                    cell.role if cell is not None else "",
+                    cell.elevation if cell is not None else 0)
+            out[p.piece].append(obj)
+        return out
+
+    def plan_blockout(self, cells: List[Cell]) -> List[Placement]:
+        """Run the FLOOR / WALL / TRAVERSAL / PILLAR passes into a plan.
 
+        Makes all the random decisions (cover density) but creates no Blender
+        data, so the plan can be post-processed before it is realized.
+        """
         gs = self.params.grid_size
         wh = self.params.wall_height
         sh = self.params.step_height
@@ -422,64 +681,48 @@ class BuildingBlockGenerator:
         wall_on = self._piece_enabled(PIECE_WALL)
         wall_half_on = self._piece_enabled(PIECE_WALL_HALF)
         doorway_on = self._piece_enabled(PIECE_DOORWAY)
-        pillar_on = self._piece_enabled(PIECE_PILLAR)
-        ramp_piece = BlockType.STAIRS if self.params.use_stairs else BlockType.RAMP
-        ramp_piece_id = ramp_piece.value
+        ramp_piece_id = PIECE_STAIRS if self.params.use_stairs else PIECE_RAMP
         ramp_on = self._piece_enabled(ramp_piece_id)
         is_indoor = self.params.is_indoor()
         is_outdoor = self.params.is_outdoor()
         cover_density = self.params.cover_density
-        gen_pillars = self.params.generate_pillars
         rng = self.rng
 
-        out: Dict[str, List[bpy.types.Object]] = {p.value: [] for p in BlockType}
-
-        # Lazy per-piece sub-collection lookup.
-        sub_colls: Dict[str, bpy.types.Collection] = {}
-
-        def coll_for(piece_id: str) -> Optional[bpy.types.Collection]:
-            if parent_collection is None:
-                return None
-            existing = sub_colls.get(piece_id)
-            if existing is not None:
-                return existing
-            new_coll = bpy.data.collections.new(piece_id.capitalize())
-            parent_collection.children.link(new_coll)
-            sub_colls[piece_id] = new_coll
-            return new_coll
+        plan: List[Placement] = []
+        add = plan.append
 
         # Pre-cache per-cell trig + world position. Shared across passes.
         n = len(cells)
-        cell_pos: List[mathutils.Vector] = [None] * n  # type: ignore[list-item]
+        cell_pos: List[Tuple[float, float, float]] = [(0.0, 0.0, 0.0)] * n
         cell_cos: List[float] = [0.0] * n
         cell_sin: List[float] = [0.0] * n
-        cell_index: Dict[int, int] = {}
         for idx, cell in enumerate(cells):
-            cell_pos[idx] = cell.world_position(gs, sh)
+            cell_pos[idx] = (cell.world_xy[0], cell.world_xy[1],
+                             cell.base_z + cell.elevation * sh)
             cell_cos[idx] = math.cos(cell.orientation)
             cell_sin[idx] = math.sin(cell.orientation)
-            cell_index[cell.id] = idx
 
-        wall_dims = mathutils.Vector((gs, gs, wh))
+        wall_dims = (gs, gs, wh)
         gs_half = gs * 0.5
 
         # ---- FLOOR pass --------------------------------------------------
         if floor_on:
-            floor_coll = coll_for(PIECE_FLOOR)
             for idx, cell in enumerate(cells):
-                obj = self.generate_block(
-                    BlockType.FLOOR, cell_pos[idx], wall_dims,
-                    space_id=cell.id, index=0, yaw=cell.orientation,
-                    target_coll=floor_coll,
-                )
-                out[PIECE_FLOOR].append(obj)
+                add(Placement(PIECE_FLOOR, cell_pos[idx], wall_dims,
+                              cell.orientation, cell.id, 0, (cell.id,)))
+
+        if self.params.piece_solver == SOLVER_WFC:
+            # WALL + TRAVERSAL decisions come from the rules file instead.
+            plan.extend(self._plan_edges_wfc(cells))
+            self._plan_pillars(cells, cell_pos, cell_cos, cell_sin, add)
+            return plan
 
         # ---- WALL pass ---------------------------------------------------
         # Each cell-edge is processed once via the shared edge_consumed map.
         edge_consumed: Dict[Tuple, bool] = {}
 
         for idx, cell in enumerate(cells):
-            pos = cell_pos[idx]
+            px, py, pz = cell_pos[idx]
             cos_o = cell_cos[idx]
             sin_o = cell_sin[idx]
             base_yaw = cell.orientation
@@ -493,31 +736,21 @@ class BuildingBlockGenerator:
                 di, dj = DIR_OFFSETS[cardinal]
                 local_dx = di * gs_half
                 local_dy = dj * gs_half
-                world_dx = local_dx * cos_o - local_dy * sin_o
-                world_dy = local_dx * sin_o + local_dy * cos_o
-                wall_pos = mathutils.Vector(
-                    (pos.x + world_dx, pos.y + world_dy, pos.z))
+                wall_pos = (px + local_dx * cos_o - local_dy * sin_o,
+                            py + local_dx * sin_o + local_dy * cos_o,
+                            pz)
                 yaw = base_yaw + _CARDINAL_YAW[cardinal]
+                edge_index = _EDGE_INDEX[cardinal]
 
                 nb = cell.neighbors.get(cardinal)
                 if nb is None:
                     if is_indoor:
                         if wall_on:
-                            obj = self.generate_block(
-                                BlockType.WALL, wall_pos, wall_dims,
-                                space_id=cell.id,
-                                index=_EDGE_INDEX[cardinal],
-                                yaw=yaw, target_coll=coll_for(PIECE_WALL),
-                            )
-                            out[PIECE_WALL].append(obj)
+                            add(Placement(PIECE_WALL, wall_pos, wall_dims, yaw,
+                                          cell.id, edge_index, (cell.id,)))
                     elif wall_half_on and rng.random() < cover_density:
-                        obj = self.generate_block(
-                            BlockType.WALL_HALF, wall_pos, wall_dims,
-                            space_id=cell.id,
-                            index=_EDGE_INDEX[cardinal],
-                            yaw=yaw, target_coll=coll_for(PIECE_WALL_HALF),
-                        )
-                        out[PIECE_WALL_HALF].append(obj)
+                        add(Placement(PIECE_WALL_HALF, wall_pos, wall_dims, yaw,
+                                      cell.id, edge_index, (cell.id,)))
                     edge_consumed[edge_key] = True
                     continue
 
@@ -536,29 +769,19 @@ class BuildingBlockGenerator:
 
                 if connected:
                     if is_indoor and doorway_on:
-                        obj = self.generate_block(
-                            BlockType.DOORWAY, wall_pos, wall_dims,
-                            space_id=cell.id,
-                            index=_EDGE_INDEX[cardinal],
-                            yaw=yaw, target_coll=coll_for(PIECE_DOORWAY),
-                        )
-                        out[PIECE_DOORWAY].append(obj)
+                        add(Placement(PIECE_DOORWAY, wall_pos, wall_dims, yaw,
+                                      cell.id, edge_index, (cell.id, nb.id)))
                     edge_consumed[edge_key] = True
                 else:
                     if wall_on:
-                        obj = self.generate_block(
-                            BlockType.WALL, wall_pos, wall_dims,
-                            space_id=cell.id,
-                            index=_EDGE_INDEX[cardinal],
-                            yaw=yaw, target_coll=coll_for(PIECE_WALL),
-                        )
-                        out[PIECE_WALL].append(obj)
+                        add(Placement(PIECE_WALL, wall_pos, wall_dims, yaw,
+                                      cell.id, edge_index, (cell.id, nb.id)))
                     edge_consumed[edge_key] = True
 
         # ---- TRAVERSAL pass ---------------------------------------------
         ramp_run = gs * max(1, self.params.ramp_slope_cells)
         for idx, cell in enumerate(cells):
-            pos = cell_pos[idx]
+            px, py, pz = cell_pos[idx]
             cos_o = cell_cos[idx]
             sin_o = cell_sin[idx]
             base_yaw = cell.orientation
@@ -578,72 +801,246 @@ class BuildingBlockGenerator:
                 di, dj = DIR_OFFSETS[cardinal]
                 local_dx = di * gs_half
                 local_dy = dj * gs_half
-                world_dx = local_dx * cos_o - local_dy * sin_o
-                world_dy = local_dx * sin_o + local_dy * cos_o
-                wall_x = pos.x + world_dx
-                wall_y = pos.y + world_dy
+                edge_pos = (px + local_dx * cos_o - local_dy * sin_o,
+                            py + local_dx * sin_o + local_dy * cos_o,
+                            pz)
                 edge_yaw = base_yaw + _CARDINAL_YAW[cardinal]
+                edge_index = _EDGE_INDEX[cardinal]
                 rise = -delta * sh  # delta < 0 here
 
                 if ramp_on:
-                    obj = self.generate_block(
-                        ramp_piece,
-                        mathutils.Vector((wall_x, wall_y, pos.z)),
-                        mathutils.Vector((ramp_run, gs, rise)),
-                        space_id=cell.id,
-                        index=_EDGE_INDEX[cardinal] + 50,
-                        yaw=edge_yaw + math.pi,
-                        target_coll=coll_for(ramp_piece_id),
-                    )
-                    out[ramp_piece_id].append(obj)
+                    add(Placement(ramp_piece_id, edge_pos, (ramp_run, gs, rise),
+                                  edge_yaw + math.pi, cell.id, edge_index + 50,
+                                  (cell.id, nb.id)))
 
                 edge_consumed[edge_key] = True
 
                 road_internal = (cell.role == "path" and nb.role == "path")
                 if (not road_internal) and is_outdoor and wall_half_on \
                         and rng.random() < cover_density:
-                    obj = self.generate_block(
-                        BlockType.WALL_HALF,
-                        mathutils.Vector((wall_x, wall_y, pos.z)),
-                        mathutils.Vector((gs, gs, sh)),
-                        space_id=cell.id,
-                        index=_EDGE_INDEX[cardinal] + 100,
-                        yaw=edge_yaw,
-                        target_coll=coll_for(PIECE_WALL_HALF),
-                    )
-                    out[PIECE_WALL_HALF].append(obj)
-
-        # ---- Pillar pass -------------------------------------------------
-        if gen_pillars and pillar_on:
-            corner_pairs = ((DIR_N, DIR_E), (DIR_E, DIR_S),
-                            (DIR_S, DIR_W), (DIR_W, DIR_N))
-            for idx, cell in enumerate(cells):
-                if cell.role != "path" and cell.role != "lateral":
+                    add(Placement(PIECE_WALL_HALF, edge_pos, (gs, gs, sh),
+                                  edge_yaw, cell.id, edge_index + 100,
+                                  (cell.id, nb.id)))
+
+        self._plan_pillars(cells, cell_pos, cell_cos, cell_sin, add)
+        return plan
+
+    def _plan_pillars(self, cells: List[Cell],
+                      cell_pos: List[Tuple[float, float, float]],
+                      cell_cos: List[float], cell_sin: List[float],
+                      add) -> None:
+        """PILLAR pass: a pillar on every open corner of path / lateral cells."""
+        if not (self.params.generate_pillars and self._piece_enabled(PIECE_PILLAR)):
+            return
+        gs = self.params.grid_size
+        gs_half = gs * 0.5
+        wall_dims = (gs, gs, self.params.wall_height)
+        for idx, cell in enumerate(cells):
+            if cell.role != "path" and cell.role != "lateral":
+                continue
+            neighbors = cell.neighbors
+            px, py, pz = cell_pos[idx]
+            cos_o = cell_cos[idx]
+            sin_o = cell_sin[idx]
+            for cardA, cardB in _CORNER_PAIRS:
+                if neighbors.get(cardA) is not None: continue
+                if neighbors.get(cardB) is not None: continue
+                diA = DIR_OFFSETS[cardA]
+                diB = DIR_OFFSETS[cardB]
+                local_dx = (diA[0] + diB[0]) * gs_half
+                local_dy = (diA[1] + diB[1]) * gs_half
+                corner_pos = (px + local_dx * cos_o - local_dy * sin_o,
+                              py + local_dx * sin_o + local_dy * cos_o,
+                              pz)
+                add(Placement(PIECE_PILLAR, corner_pos, wall_dims,
+                              cell.orientation, cell.id, 200, (cell.id,)))
+
+    # ------------------------------------------------------ WFC edge pass
+
+    def _load_wfc_rules(self) -> WFCRules:
+        """Rules named by ``params.wfc_rules`` (empty = bundled default).
+
+        Bare names resolve inside the bundled ``wfc_rules`` directory,
+        ``//`` paths relative to the blend file.
+        """
+        if self._wfc_rules is not None:
+            return self._wfc_rules
+        name = self.params.wfc_rules or DEFAULT_RULES_FILE
+        if name.startswith("//"):
+            path = bpy.path.abspath(name)
+        elif os.path.isabs(name):
+            path = name
+        else:
+            if not name.endswith(".json"):
+                name += ".json"
+            path = os.path.join(get_rules_directory(), name)
+        self._wfc_rules = WFCRules.load(path)
+        return self._wfc_rules
+
+    def _plan_edges_wfc(self, cells: List[Cell]) -> List[Placement]:
+        """WALL + TRAVERSAL replacement driven by :mod:`.wfc_solver`.
+
+        Every edge of ``cells`` is one variable. Its context fixes the
+        initial domain (variants whose pieces are all enabled), the rules'
+        ``forbid`` lists link it to its ``along`` / ``corner`` neighbours,
+        and the solved variant is expanded into placements with the same
+        geometry as the rule tree: flat edges get wall-sized pieces on the
+        edge, step edges are anchored on the lower cell (ramps / stairs run
+        down into it, anything else sits on the step like cover).
+        """
+        params = self.params
+        rules = self._load_wfc_rules()
+        gs = params.grid_size
+        sh = params.step_height
+        wall_dims = (gs, gs, params.wall_height)
+        ramp_run = gs * max(1, params.ramp_slope_cells)
+        ramp_piece_id = PIECE_STAIRS if params.use_stairs else PIECE_RAMP
+
+        def resolve(piece: str) -> str:
+            return ramp_piece_id if piece == PIECE_TRAVERSAL else piece
+
+        usable = [all(self._piece_enabled(resolve(piece)) for piece in v.pieces)
+                  for v in rules.variants]
+        ctx_weights: Dict[str, Dict[int, float]] = {}
+        ctx_domain: Dict[str, int] = {}
+        for ctx in CONTEXTS:
+            weights = {i: w for i, w in rules.context_weights(
+                ctx, params.blockout_style, params).items() if usable[i]}
+            ctx_weights[ctx] = weights
+            ctx_domain[ctx] = sum(1 << i for i in weights)
+
+        # ---- Variables: one per edge, owned by the first cell to see it.
+        edge_var: Dict[Tuple, int] = {}
+        owners: List[Cell] = []
+        owner_cards: List[str] = []
+        contexts: List[str] = []
+        for cell in cells:
+            for cardinal in CARDINALS:
+                key = self._edge_key(cell.grid_coord, cardinal)
+                if key in edge_var:
                     continue
-                neighbors = cell.neighbors
-                pos = cell_pos[idx]
-                cos_o = cell_cos[idx]
-                sin_o = cell_sin[idx]
-                for cardA, cardB in corner_pairs:
-                    if neighbors.get(cardA) is not None: continue
-                    if neighbors.get(cardB) is not None: continue
-                    diA = DIR_OFFSETS[cardA]
-                    diB = DIR_OFFSETS[cardB]
-                    local_dx = (diA[0] + diB[0]) * gs_half
-                    local_dy = (diA[1] + diB[1]) * gs_half
-                    world_dx = local_dx * cos_o - local_dy * sin_o
-                    world_dy = local_dx * sin_o + local_dy * cos_o
-                    corner_pos = mathutils.Vector(
-                        (pos.x + world_dx, pos.y + world_dy, pos.z))
-                    obj = self.generate_block(
-                        BlockType.PILLAR, corner_pos, wall_dims,
-                        space_id=cell.id, index=200,
-                        yaw=cell.orientation,
-                        target_coll=coll_for(PIECE_PILLAR),
-                    )
-                    out[PIECE_PILLAR].append(obj)
-
-        return out
+                owner, owner_card = cell, cardinal
+                nb = cell.neighbors.get(cardinal)
+                if nb is None:
+                    ctx = CTX_EXTERIOR
+                else:
+                    step = abs(cell.elevation - nb.elevation) >= 1
+                    if cell.role == "path" and nb.role == "path":
+                        ctx = CTX_ROAD_STEP if step else CTX_ROAD
+                    elif step:
+                        ctx = CTX_STEP
+                    elif cardinal in cell.connections:
+                        ctx = CTX_CONNECTED
+                    else:
+                        ctx = CTX_SEALED
+                    if step and cell.elevation > nb.elevation:
+                        # Step pieces are anchored on the lower cell.
+                        owner, owner_card = nb, OPPOSITE[cardinal]
+                edge_var[key] = len(owners)
+                owners.append(owner)
+                owner_cards.append(owner_card)
+                contexts.append(ctx)
+
+        # ---- Relations, only for the ones the rules constrain.
+        compat: List[List[int]] = []
+        rel_ids: Dict[str, int] = {}
+        for rel in RELATIONS:
+            masks = rules.compat_masks(rel)
+            if masks is not None:
+                rel_ids[rel] = len(compat)
+                compat.append(masks)
+        links: List[set] = [set() for _ in owners]
+        if rel_ids:
+            along = rel_ids.get(REL_ALONG)
+            corner = rel_ids.get(REL_CORNER)
+            edge_key = self._edge_key
+            for cell in cells:
+                coord = cell.grid_coord
+                if along is not None:
+                    for cardinal in CARDINALS:
+                        v = edge_var[edge_key(coord, cardinal)]
+                        for perp in _PERPENDICULAR[cardinal]:
+                            nb = cell.neighbors.get(perp)
+                            if nb is None:
+                                continue
+                            w = edge_var.get(edge_key(nb.grid_coord, cardinal))
+                            if w is not None:
+                                links[v].add((w, along))
+                                links[w].add((v, along))
+                if corner is not None:
+                    for card_a, card_b in _CORNER_PAIRS:
+                        v = edge_var[edge_key(coord, card_a)]
+                        w = edge_var[edge_key(coord, card_b)]
+                        links[v].add((w, corner))
+                        links[w].add((v, corner))
+
+        solver = WFCSolver([ctx_domain[c] for c in contexts],
+                           [ctx_weights[c] for c in contexts],
+                           [list(link) for link in links], compat, self.rng,
+                           rules.max_backtracks)
+        chosen = solver.solve()
+        self.wfc_backtracks = solver.backtracks
+
+        # ---- Expand the solved variants into placements.
+        plan: List[Placement] = []
+        add = plan.append
+        gs_half = gs * 0.5
+        for v, variant_idx in enumerate(chosen):
+            variant = rules.variants[variant_idx]
+            if not variant.pieces:
+                continue
+            cell = owners[v]
+            cardinal = owner_cards[v]
+            ctx = contexts[v]
+            nb = cell.neighbors.get(cardinal)
+            cell_ids = (cell.id,) if nb is None else (cell.id, nb.id)
+            di, dj = DIR_OFFSETS[cardinal]
+            cos_o = math.cos(cell.orientation)
+            sin_o = math.sin(cell.orientation)
+            px, py = cell.world_xy
+            pos = (px + di * gs_half * cos_o - dj * gs_half * sin_o,
+                   py + di * gs_half * sin_o + dj * gs_half * cos_o,
+                   cell.base_z + cell.elevation * sh)
+            yaw = cell.orientation + _CARDINAL_YAW[cardinal]
+            edge_index = _EDGE_INDEX[cardinal]
+            stepped = ctx in STEP_CONTEXTS
+            k = 0
+            for piece in variant.pieces:
+                piece_id = resolve(piece)
+                if piece == PIECE_TRAVERSAL:
+                    rise = (nb.elevation - cell.elevation) * sh
+                    add(Placement(piece_id, pos, (ramp_run, gs, rise),
+                                  yaw + math.pi, cell.id, edge_index + 50,
+                                  cell_ids, variant.collection))
+                    continue
+                dims = (gs, gs, sh) if stepped and piece_id == PIECE_WALL_HALF \
+                    else wall_dims
+                add(Placement(piece_id, pos, dims, yaw, cell.id,
+                              edge_index + (100 if stepped else 0) + 10 * k,
+                              cell_ids, variant.collection))
+                k += 1
+        return plan
+
+    def plan_region(self, region: List[Cell], seed: int) -> List[Placement]:
+        """Raw placements for every cell and edge touching ``region``.
+
+        The passes run over the region plus its direct neighbours (so an edge
+        owned by an outside cell, e.g. a ramp climbing into the region, is
+        still produced) and everything not touching the region is filtered
+        out. Random decisions use ``seed``.
+        """
+        inside = {c.id for c in region}
+        ring: Dict[int, Cell] = {c.id: c for c in region}
+        for c in region:
+            for nb in c.neighbors.values():
+                ring.setdefault(nb.id, nb)
+        saved_rng = self.rng
+        self.rng = random.Random(seed)
+        try:
+            plan = self.plan_blockout(list(ring.values()))
+        finally:
+            self.rng = saved_rng
+        return [p for p in plan if not inside.isdisjoint(p.cell_ids)]
 
     # ---------------------- edge bookkeeping helpers ---------------------
 
@@ -706,6 +1103,217 @@ class BuildingBlockGenerator:
     # Back-compat name used by older callers.
     populate_space = populate_cell
 
+    def decorate(self, cells: List[Cell],
+                 parent_collection: Optional[bpy.types.Collection] = None,
+                 chunks: Optional[ChunkedCollections] = None
+                 ) -> Dict[str, List[bpy.types.Object]]:
+        """Run every decoration layer across all ``cells`` at once.
+
+        Layer-major replacement for calling :py:meth:`populate_cell` per cell:
+        :py:meth:`plan_decoration` builds one :class:`PropBatch` per layer and
+        :py:meth:`realize_decoration` spawns them.
+        """
+        self._decoration_plan = self.plan_decoration(cells)
+        return self.realize_decoration(self._decoration_plan,
+                                       parent_collection, chunks)
+
+    def plan_decoration(self, cells: List[Cell], seed: Optional[int] = None,
+                        max_props: Optional[int] = None,
+                        blockout_plan: Optional[List[Placement]] = None
+                        ) -> List[PropBatch]:
+        """Vectorized decoration plan; creates no Blender data.
+
+        Candidates are first thinned to the ``max_props`` budget (by layer
+        priority, evenly across cells), then filtered against the last
+        blockout plan (and against each other) according to each layer's
+        ``collision_mode``. Drop counts land in :py:attr:`decoration_dropped`.
+
+        ``seed``, ``max_props`` and ``blockout_plan`` default to the
+        generator's seed, the parameter budget and the last blockout plan;
+        region regeneration passes its own.
+        """
+        layers = self.params.layers
+        source_counts: Dict[str, int] = {}
+        for layer in layers:
+            if layer.enabled and layer.collection_name not in source_counts:
+                sources = self._layer_meshes(layer.collection_name)
+                source_counts[layer.collection_name] = len(sources or ())
+        arrays = CellArrays.from_cells(cells, self.params.step_height)
+        batches = plan_decoration(arrays, layers, self.params.grid_size,
+                                  self.seed if seed is None else seed,
+                                  source_counts)
+        batches, budget_dropped = apply_budget(
+            batches, self.params.max_props if max_props is None else max_props)
+        self.decoration_dropped = {"budget": budget_dropped, "collision": {}}
+        return self._reject_collisions(
+            batches,
+            self._blockout_plan if blockout_plan is None else blockout_plan)
+
+    # ------------------------------------------------ collision rejection
+
+    def _occupancy_from_plan(self, plan: List[Placement]) -> OccupancyIndex:
+        """Footprints of every blocking piece in ``plan``.
+
+        Box sizes mirror :py:meth:`_spawn_piece`. Floors never block (props
+        stand on them). Doorways are inflated across the opening so nothing
+        is placed in the passage on either side.
+        """
+        gs = self.params.grid_size
+        index = OccupancyIndex(gs)
+        wall_t = wall_thickness(gs)
+        pillar_r = pillar_radius(gs)
+        door_clearance = gs * 0.5
+        for p in plan:
+            piece = p.piece
+            x, y, z = p.location
+            dims = p.dims
+            if piece == PIECE_WALL:
+                index.add_box(OCC_STRUCTURE, x, y, p.yaw, dims[0] * 0.5,
+                              wall_t * 0.5, z, z + dims[2])
+            elif piece == PIECE_WALL_HALF:
+                index.add_box(OCC_STRUCTURE, x, y, p.yaw, dims[0] * 0.5,
+                              wall_t * 0.5, z, z + dims[2] * HALF_WALL_HEIGHT)
+            elif piece == PIECE_PILLAR:
+                index.add_box(OCC_STRUCTURE, x, y, 0.0, pillar_r, pillar_r,
+                              z, z + dims[2])
+            elif piece == PIECE_DOORWAY:
+                index.add_box(OCC_CLEARANCE, x, y, p.yaw, dims[0] * 0.5,
+                              wall_t * 0.5 + door_clearance, z, z + dims[2])
+            elif piece == PIECE_RAMP or piece == PIECE_STAIRS:
+                index.add_box(OCC_CLEARANCE, x, y, p.yaw, dims[0] * 0.5,
+                              dims[1] * 0.5, z, z + dims[2])
+        return index
+
+    def _source_extents(self, collection_name: str) -> Tuple[Any, Any]:
+        """Cached per-source ``[xy radius, z min, z max]`` rows.
+
+        Returns ``(unscaled, scaled)``: the first ignores the source object's
+        scale (random-scale layers replace it), the second includes it. The
+        XY radius bounds the mesh under any yaw, so one disc covers every
+        rotation of the prop. Layers without sources get the placeholder
+        cube's extents.
+        """
+        cached = self._source_extents_cache.get(collection_name)
+        if cached is not None:
+            return cached
+        sources = self._layer_meshes(collection_name) or []
+        if not sources:
+            row = np.array([[math.sqrt(0.5), -0.5, 0.5]])
+            cached = (row, row)
+        else:
+            unscaled = np.empty((len(sources), 3))
+            scaled = np.empty((len(sources), 3))
+            for i, src in enumerate(sources):
+                corners = np.array([tuple(c) for c in src.bound_box])
+                sx, sy, sz = src.scale
+                unscaled[i] = (np.hypot(corners[:, 0], corners[:, 1]).max(),
+                               corners[:, 2].min(), corners[:, 2].max())
+                scaled[i] = (np.hypot(corners[:, 0] * sx, corners[:, 1] * sy).max(),
+                             corners[:, 2].min() * sz, corners[:, 2].max() * sz)
+            cached = (unscaled, scaled)
+        self._source_extents_cache[collection_name] = cached
+        return cached
+
+    def _reject_collisions(self, batches: List[PropBatch],
+                           plan: List[Placement]) -> List[PropBatch]:
+        """Drop candidate props that overlap what their layer must avoid.
+
+        Layers are processed in order. Every accepted prop from a colliding
+        layer is registered, so ``ALL`` layers also avoid props from earlier
+        layers and from earlier props of their own layer.
+        """
+        if all(coerce_collision_mode(b.layer.collision_mode) == CollisionMode.NONE
+               for b in batches):
+            return batches
+        index = self._occupancy_from_plan(plan)
+        out: List[PropBatch] = []
+        for batch in batches:
+            layer = batch.layer
+            mode = coerce_collision_mode(layer.collision_mode)
+            if mode == CollisionMode.NONE:
+                out.append(batch)
+                continue
+            kinds = BLOCKING_KINDS[mode]
+            unscaled, scaled = self._source_extents(layer.collection_name)
+            rows = np.maximum(batch.source_index, 0)
+            if layer.random_scale:
+                ext = unscaled[rows] * batch.scale[:, None]
+            else:
+                ext = scaled[rows]
+            radius = ext[:, 0].tolist()
+            z0 = (batch.positions[:, 2] + ext[:, 1]).tolist()
+            z1 = (batch.positions[:, 2] + ext[:, 2]).tolist()
+            xs = batch.positions[:, 0].tolist()
+            ys = batch.positions[:, 1].tolist()
+
+            keep = np.zeros(len(batch), dtype=bool)
+            blocked = index.blocked
+            add_disc = index.add_disc
+            for i in range(len(batch)):
+                if blocked(xs[i], ys[i], radius[i], z0[i], z1[i], kinds):
+                    continue
+                keep[i] = True
+                add_disc(OCC_PROP, xs[i], ys[i], radius[i], z0[i], z1[i])
+            if keep.all():
+                out.append(batch)
+                continue
+            rejected = self.decoration_dropped["collision"]
+            rejected[layer.name] = (rejected.get(layer.name, 0)
+                                    + len(batch) - int(keep.sum()))
+            if keep.any():
+                out.append(batch.select(keep))
+        return out
+
+    def realize_decoration(self, batches: List[PropBatch],
+                           parent_collection: Optional[bpy.types.Collection] = None,
+                           chunks: Optional[ChunkedCollections] = None
+                           ) -> Dict[str, List[bpy.types.Object]]:
+        """Spawn each batch into its layer's sub-collection.
+
+        With ``chunks`` props go into the world-chunk collection containing
+        them instead.
+        """
+        out: Dict[str, List[bpy.types.Object]] = {}
+        names_for = self._name_allocator().prop_names
+        for batch in batches:
+            layer = batch.layer
+            target_coll: Optional[bpy.types.Collection] = None
+            if parent_collection is not None and chunks is None:
+                target_coll = self._get_layer_subcoll(parent_collection, layer.name)
+            sources = self._layer_meshes(layer.collection_name) or []
+            placeholder = None if sources else self._unit_cube_mesh()
+            # Non-random layers keep each source's own scale (as populate_cell
+            # does); random ones replace it. The batch yaw (cell orientation,
+            # plus the random spin if enabled) turns the source's own yaw.
+            random_scl = layer.random_scale
+            # Plain Python scalars: indexing numpy arrays per object is slow.
+            cell_ids = batch.cell_ids.tolist()
+            positions = batch.positions.tolist()
+            yaws = batch.yaw.tolist()
+            scales = batch.scale.tolist()
+            source_index = batch.source_index.tolist()
+            names = names_for(layer.name, cell_ids)
+
+            blocks = out.setdefault(layer.name, [])
+            for i, name in enumerate(names):
+                s = scales[i]
+                if chunks is not None:
+                    target_coll = chunks.collection_for(
+                        positions[i], "decoration", layer.name)
+                if sources:
+                    src = sources[source_index[i]]
+                    obj = self._instance(src, name)
+                    obj.location = positions[i]
+                    obj.rotation_euler.z = src.rotation_euler.z + yaws[i]
+                    if random_scl:
+                        obj.scale = (s, s, s)
+                    self._link(obj, target_coll)
+                else:
+                    obj = self._spawn(placeholder, name, positions[i], yaws[i],
+                                      (s, s, s), target_coll)
+                blocks.append(obj)
+        return out
+
     def _get_layer_subcoll(self, parent: bpy.types.Collection,
                            name: str) -> bpy.types.Collection:
         parent_id = id(parent)
@@ -816,6 +1424,13 @@ class BuildingBlockGenerator:
                     rng.uniform(-half, half),
                     0.0,
                 )))
+        elif layer.rule == PlacementRule.POISSON_DISK:
+            # Single-cell run of the level-wide sampler (see decorate()).
+            radius = layer.min_distance or radius_for_density(density)
+            local_xy, _ = poisson_disk_sample(
+                [(0.0, 0.0)], [1.0], [0.0], gs * 0.5, radius, rng)
+            for x, y in local_xy:
+                points.append(mathutils.Vector((x, y, 0.0)))
         elif layer.rule == PlacementRule.CENTER_LINE:
             num_points = max(1, int(gs * density * 0.1))
             half_d = gs * 0.5
@@ -841,17 +1456,17 @@ class BuildingBlockGenerator:
 
         # Pre-resolve the "no override" placeholder mesh once.
         placeholder = None if sources else self._unit_cube_mesh()
+        names = self._name_allocator().prop_names(
+            layer.name, [cell.id] * len(points))
 
         blocks: List[bpy.types.Object] = []
         for i, local_pos in enumerate(points):
             wx = cell_pos.x + local_pos.x
             wy = cell_pos.y + local_pos.y
             wz = cell_pos.z + local_pos.z + z_off
-            name = f"{layer.name}_{cell.id}_{i}"
+            name = names[i]
             if sources:
-                src = rng.choice(sources)
-                obj = src.copy()
-                obj.name = name
+                obj = self._instance(rng.choice(sources), name)
                 obj.location = (wx, wy, wz)
                 self._link(obj, target_coll)
             else:
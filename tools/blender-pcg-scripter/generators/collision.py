@@ -0,0 +1,284 @@
+"""Convex collision proxies computed from the blockout plan.
+
+Engines cook collision per object, and a blockout of thousands of wall and
+floor pieces makes that slow. This pass derives a small set of convex
+colliders straight from the raw :class:`Placement` plan, without reading any
+Blender geometry:
+
+1. the plan is bucketed into the world chunks of :mod:`..core.chunking` by
+   piece anchor,
+2. inside each chunk, floors are covered with rectangles (the blockout's
+   own merge pass, always on here and regardless of override kits),
+3. every piece becomes convex hulls: a box per floor slab, wall and pillar,
+   three per doorway (two posts and a lintel spanning the full width, so
+   it overlaps the posts) and a single wedge per ramp or stairs -- stairs
+   collide as their slope,
+4. boxes on one line with the same cross-section that touch or overlap end
+   to end are fused. That merges wall runs, swallows doorway posts into the
+   walls and posts beside them and joins the lintels of a row of doorways.
+
+Hull vertices for a whole batch of pieces are computed with numpy in one
+go. Each hull is its own mesh object named ``UCX_Chunk_<x>_<y>_<NN>``, the
+prefix engines such as Unreal use to pair convex colliders with the render
+mesh ``Chunk_<x>_<y>``. Hulls live in per-chunk ``Collision_<x>_<y>``
+collections under ``Collision``, draw as wireframe and never render.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import bpy
+import numpy as np
+
+from ..core.chunking import ChunkCoord, chunk_coord, chunk_name
+from ..core.parameters import (
+    PIECE_DOORWAY,
+    PIECE_FLOOR,
+    PIECE_PILLAR,
+    PIECE_RAMP,
+    PIECE_STAIRS,
+    PIECE_WALL_HALF,
+)
+from .building_generator import (
+    HALF_WALL_HEIGHT,
+    doorway_frame,
+    floor_thickness,
+    pillar_radius,
+    wall_thickness,
+)
+from .placement_plan import Placement, merge_coplanar_floors
+
+COLLISION_COLLECTION_NAME = "Collision"
+UCX_PREFIX = "UCX_"
+
+# Unit box: bottom ring 0-3 then top ring 4-7, both CCW seen from above.
+_BOX_UNIT = np.array((
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+), dtype=float)
+_BOX_FACES = (
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+)
+# Unit wedge matching the ramp placeholder: XZ outline (-x, 0), (+x, 0),
+# (-x, top) on the -Y cap, then the same on the +Y cap. Z is scaled by the
+# full rise, X / Y by the half extents.
+_WEDGE_UNIT = np.array((
+    (-1, -1, 0), (1, -1, 0), (-1, -1, 1),
+    (-1, 1, 0), (1, 1, 0), (-1, 1, 1),
+), dtype=float)
+_WEDGE_FACES = (
+    (0, 1, 2), (5, 4, 3),
+    (0, 3, 4, 1), (1, 4, 5, 2), (2, 5, 3, 0),
+)
+
+
+def collider_plan(plan: Iterable[Placement], grid_size: float,
+                  chunk_size: float,
+                  coords: Optional[Iterable[ChunkCoord]] = None
+                  ) -> Dict[ChunkCoord, List[Placement]]:
+    """Bucket ``plan`` by chunk and merge the floors inside each bucket.
+
+    Kit collections are ignored (colliders follow the placeholder shape)
+    and stairs are planned as ramps. With ``coords`` only those chunks are
+    returned.
+    """
+    wanted = set(coords) if coords is not None else None
+    buckets: Dict[ChunkCoord, List[Placement]] = {}
+    for p in plan:
+        coord = chunk_coord(p.location[0], p.location[1], chunk_size)
+        if wanted is not None and coord not in wanted:
+            continue
+        if p.collection or p.piece == PIECE_STAIRS:
+            p = replace(p, collection="",
+                        piece=PIECE_RAMP if p.piece == PIECE_STAIRS else p.piece)
+        buckets.setdefault(coord, []).append(p)
+    for coord, pieces in buckets.items():
+        buckets[coord] = merge_coplanar_floors(pieces, grid_size)
+    return buckets
+
+
+def collider_hulls(placements: Iterable[Placement], grid_size: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+    """World-space hull vertices: ``(boxes (N, 8, 3), wedges (M, 6, 3))``.
+
+    Shapes mirror :py:meth:`BuildingBlockGenerator._spawn_piece`.
+    """
+    wall_t = wall_thickness(grid_size)
+    floor_t = floor_thickness(grid_size)
+    pillar_r = pillar_radius(grid_size)
+    # Rows of (x, y, z, sx, sy, sz, yaw): centre + half extents for boxes,
+    # anchor + (half run, half width, rise) for wedges.
+    boxes: List[Tuple[float, ...]] = []
+    wedges: List[Tuple[float, ...]] = []
+    for p in placements:
+        x, y, z = p.location
+        dx, dy, dz = p.dims
+        piece = p.piece
+        if piece == PIECE_FLOOR:
+            boxes.append((x, y, z - floor_t * 0.5,
+                          dx * 0.5, dy * 0.5, floor_t * 0.5, p.yaw))
+        elif piece == PIECE_RAMP:
+            wedges.append((x, y, z, dx * 0.5, dy * 0.5, dz, p.yaw))
+        elif piece == PIECE_PILLAR:
+            boxes.append((x, y, z + dz * 0.5,
+                          pillar_r, pillar_r, dz * 0.5, 0.0))
+        elif piece == PIECE_DOORWAY:
+            post_w, lintel_h = doorway_frame(dx, dz)
+            c = math.cos(p.yaw)
+            s = math.sin(p.yaw)
+            off = dx * 0.5 - post_w * 0.5
+            for o in (-off, off):
+                boxes.append((x + o * c, y + o * s, z + dz * 0.5,
+                              post_w * 0.5, wall_t * 0.5, dz * 0.5, p.yaw))
+            boxes.append((x, y, z + dz - lintel_h * 0.5,
+                          dx * 0.5, wall_t * 0.5, lintel_h * 0.5, p.yaw))
+        else:
+            # Wall, cover wall and anything unknown (spawned as a wall).
+            h = dz * HALF_WALL_HEIGHT if piece == PIECE_WALL_HALF else dz
+            boxes.append((x, y, z + h * 0.5,
+                          dx * 0.5, wall_t * 0.5, h * 0.5, p.yaw))
+    boxes = _fuse_collinear(boxes, max(1e-6, grid_size * 1e-3))
+    return _transform(_BOX_UNIT, boxes), _transform(_WEDGE_UNIT, wedges)
+
+
+def _fuse_collinear(rows: List[Tuple[float, ...]], tol: float
+                    ) -> List[Tuple[float, ...]]:
+    """Fuse box rows that share a line and cross-section and touch.
+
+    Same bucketing as :func:`merge_collinear_walls`: boxes are symmetric,
+    so the line key uses yaw modulo pi. Lengths may differ; a box whose
+    start is within ``tol`` of (or before) the previous box's end extends it.
+    """
+    lines: Dict[Tuple, List[Tuple[float, float, Tuple[float, ...]]]] = {}
+    line_axes: Dict[Tuple, Tuple[float, float, float, float]] = {}
+    for r in rows:
+        axis = r[6] % math.pi
+        if math.pi - axis < 1e-6:
+            axis = 0.0
+        dx = math.cos(axis)
+        dy = math.sin(axis)
+        along = r[0] * dx + r[1] * dy
+        across = -r[0] * dy + r[1] * dx
+        key = (round(axis, 4), round(across / tol), round(r[2] / tol),
+               round(r[4] / tol), round(r[5] / tol))
+        spans = lines.get(key)
+        if spans is None:
+            spans = lines[key] = []
+            line_axes[key] = (axis, dx, dy, across)
+        spans.append((along - r[3], along + r[3], r))
+
+    out: List[Tuple[float, ...]] = []
+    for key, spans in lines.items():
+        if len(spans) == 1:
+            out.append(spans[0][2])
+            continue
+        spans.sort(key=lambda s: s[0])
+        axis, dx, dy, across = line_axes[key]
+        first = spans[0][2]
+        lo, hi, run = spans[0][0], spans[0][1], [first]
+        for start, end, r in spans[1:] + [(math.inf, math.inf, None)]:
+            if start <= hi + tol:
+                hi = max(hi, end)
+                run.append(r)
+                continue
+            if len(run) == 1:
+                out.append(run[0])
+            else:
+                mid = (lo + hi) * 0.5
+                out.append((mid * dx - across * dy, mid * dy + across * dx,
+                            first[2], (hi - lo) * 0.5, first[4], first[5],
+                            axis))
+            if r is not None:
+                lo, hi, run, first = start, end, [r], r
+    return out
+
+
+def _transform(unit: np.ndarray, rows: List[Tuple[float, ...]]) -> np.ndarray:
+    if not rows:
+        return np.zeros((0, len(unit), 3))
+    r = np.asarray(rows, dtype=float)
+    local = unit[None, :, :] * r[:, None, 3:6]
+    c = np.cos(r[:, 6])[:, None]
+    s = np.sin(r[:, 6])[:, None]
+    out = np.empty_like(local)
+    out[..., 0] = local[..., 0] * c - local[..., 1] * s + r[:, None, 0]
+    out[..., 1] = local[..., 0] * s + local[..., 1] * c + r[:, None, 1]
+    out[..., 2] = local[..., 2] + r[:, None, 2]
+    return out
+
+
+class CollisionProxies:
+    """The ``Collision`` collection of one generation, built chunk by chunk."""
+
+    def __init__(self, parent: bpy.types.Collection, grid_size: float,
+                 chunk_size: float):
+        self.grid_size = grid_size
+        self.chunk_size = chunk_size
+        self.collection = bpy.data.collections.new(COLLISION_COLLECTION_NAME)
+        parent.children.link(self.collection)
+        self._colls: Dict[ChunkCoord, bpy.types.Collection] = {}
+        self._objects: Dict[ChunkCoord, List[bpy.types.Object]] = {}
+
+    @property
+    def hull_count(self) -> int:
+        return sum(len(objs) for objs in self._objects.values())
+
+    @property
+    def chunk_count(self) -> int:
+        return sum(1 for objs in self._objects.values() if objs)
+
+    def build(self, plan: Iterable[Placement],
+              coords: Optional[Iterable[ChunkCoord]] = None) -> int:
+        """Create colliders for ``plan``; returns the number of hulls made.
+
+        With ``coords`` only those chunks are rebuilt: their old hulls are
+        deleted and replaced from the pieces of ``plan`` anchored in them.
+        ``plan`` is the raw (pre-merge) blockout plan.
+        """
+        if coords is not None:
+            coords = set(coords)
+            for coord in coords:
+                self._clear(coord)
+        made = 0
+        for coord, pieces in collider_plan(plan, self.grid_size,
+                                           self.chunk_size, coords).items():
+            boxes, wedges = collider_hulls(pieces, self.grid_size)
+            coll = self._chunk_collection(coord)
+            objs = self._objects.setdefault(coord, [])
+            base = UCX_PREFIX + chunk_name(coord)
+            for hulls, faces in ((boxes, _BOX_FACES), (wedges, _WEDGE_FACES)):
+                for verts in hulls.tolist():
+                    name = f"{base}_{len(objs):02d}"
+                    mesh = bpy.data.meshes.new(name)
+                    mesh.from_pydata(verts, [], faces)
+                    mesh.update()
+                    obj = bpy.data.objects.new(name, mesh)
+                    obj.display_type = 'WIRE'
+                    obj.hide_render = True
+                    coll.objects.link(obj)
+                    objs.append(obj)
+            made += len(boxes) + len(wedges)
+        return made
+
+    def _chunk_collection(self, coord: ChunkCoord) -> bpy.types.Collection:
+        coll = self._colls.get(coord)
+        if coll is None:
+            coll = bpy.data.collections.new(chunk_name(coord, "Collision"))
+            self.collection.children.link(coll)
+            self._colls[coord] = coll
+        return coll
+
+    def _clear(self, coord: ChunkCoord) -> None:
+        doomed = []
+        for obj in self._objects.pop(coord, ()):
+            try:
+                doomed.append(obj.data)
+            except ReferenceError:
+                continue  # deleted by the user
+            doomed.append(obj)
+        if doomed:
+            bpy.data.batch_remove(doomed)
@@ -0,0 +1,357 @@
+"""Layer-major decoration planning.
+
+The legacy decoration path (:py:meth:`BuildingBlockGenerator.populate_cell`)
+walks cells in the outer loop and layers in the inner one: it reseeds the RNG,
+re-checks every layer's ``cell_target`` and rebuilds ``mathutils.Vector``
+point lists for every single cell. This module flips that around. For each
+enabled layer it:
+
+1. selects the target cells with one vectorized role mask,
+2. generates the rule's points for *all* selected cells in one array
+   operation (rotated into each cell's frame, so EDGE_LOOP props follow
+   ribbon cells along the road) -- or, for POISSON_DISK, one level-wide
+   blue-noise pass over the union of those cells (:mod:`.poisson_disk`),
+3. draws rotation / scale / source choice in bulk from a per-layer
+   ``numpy`` generator,
+
+and hands the result to the realizer as a single :class:`PropBatch`.
+
+Because every candidate exists as array rows before any object is created,
+a global prop budget is cheap to enforce: :func:`apply_budget` splits
+``max_props`` across layers by priority and thins each batch evenly across
+its cells.
+
+Nothing here touches ``bpy``; the generator owns realization.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.layer_system import CellTarget, CollisionMode, LayerConfig, PlacementRule
+from .poisson_disk import poisson_disk_sample, radius_for_density
+
+# Integer role codes used by the vectorized masks.
+ROLE_PATH = 0
+ROLE_LATERAL = 1
+ROLE_ROOM = 2
+
+_ROLE_CODES = {"path": ROLE_PATH, "lateral": ROLE_LATERAL}
+
+
+@dataclass
+class CellArrays:
+    """Struct-of-arrays view of a cell list, built once per generation."""
+
+    ids: np.ndarray          # (n,) int64
+    xyz: np.ndarray          # (n, 3) float64 -- floor-top world position
+    cos_o: np.ndarray        # (n,) cos(orientation)
+    sin_o: np.ndarray        # (n,) sin(orientation)
+    orientation: np.ndarray  # (n,) yaw
+    roles: np.ndarray        # (n,) int8 ROLE_* code
+
+    @classmethod
+    def from_cells(cls, cells: Sequence, step_height: float) -> CellArrays:
+        n = len(cells)
+        ids = np.fromiter((c.id for c in cells), dtype=np.int64, count=n)
+        xyz = np.empty((n, 3), dtype=np.float64)
+        orientation = np.empty(n, dtype=np.float64)
+        roles = np.empty(n, dtype=np.int8)
+        for i, c in enumerate(cells):
+            xyz[i, 0] = c.world_xy[0]
+            xyz[i, 1] = c.world_xy[1]
+            xyz[i, 2] = c.base_z + c.elevation * step_height
+            orientation[i] = c.orientation
+            roles[i] = _ROLE_CODES.get(c.role, ROLE_ROOM)
+        return cls(ids, xyz, np.cos(orientation), np.sin(orientation),
+                   orientation, roles)
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+
+@dataclass
+class PropBatch:
+    """Every prop one layer wants to place, as parallel arrays.
+
+    ``source_index`` indexes into the layer's source mesh list and is ``-1``
+    when the layer has no usable source (placeholder cubes are spawned).
+    """
+
+    layer: LayerConfig
+    layer_index: int
+    cell_ids: np.ndarray      # (n,) int64
+    positions: np.ndarray     # (n, 3) world space
+    yaw: np.ndarray           # (n,)
+    scale: np.ndarray         # (n,) uniform scale
+    source_index: np.ndarray  # (n,) int64
+
+    def __len__(self) -> int:
+        return int(self.cell_ids.shape[0])
+
+    def select(self, keep: np.ndarray) -> PropBatch:
+        """Return a batch restricted to ``keep`` (bool mask or index array)."""
+        return PropBatch(self.layer, self.layer_index, self.cell_ids[keep],
+                         self.positions[keep], self.yaw[keep],
+                         self.scale[keep], self.source_index[keep])
+
+
+def coerce_cell_target(target) -> CellTarget:
+    if isinstance(target, CellTarget):
+        return target
+    try:
+        return CellTarget(target)
+    except ValueError:
+        return CellTarget.OFF_ROAD
+
+
+def coerce_collision_mode(mode) -> CollisionMode:
+    if isinstance(mode, CollisionMode):
+        return mode
+    try:
+        return CollisionMode(mode)
+    except ValueError:
+        return CollisionMode.STRUCTURE
+
+
+def role_mask(target, roles: np.ndarray) -> np.ndarray:
+    """Vectorized equivalent of ``BuildingBlockGenerator._layer_targets_cell``."""
+    target = coerce_cell_target(target)
+    if target == CellTarget.OFF_ROAD:
+        return roles != ROLE_PATH
+    if target == CellTarget.ROAD_ONLY:
+        return roles == ROLE_PATH
+    if target == CellTarget.LATERAL_ONLY:
+        return roles == ROLE_LATERAL
+    return np.ones(roles.shape, dtype=bool)
+
+
+def perimeter_points(width: float, depth: float, t: np.ndarray) -> np.ndarray:
+    """Points at normalized arc length ``t`` along a ``width x depth`` rect.
+
+    Walks clockwise from the top-left corner, matching
+    ``BuildingBlockGenerator._perimeter_point``.
+    """
+    dist = t * ((width + depth) * 2.0)
+    hw = width * 0.5
+    hd = depth * 0.5
+    e1 = width
+    e2 = e1 + depth
+    e3 = e2 + width
+    x = np.select(
+        [dist < e1, dist < e2, dist < e3],
+        [-hw + dist, np.full_like(dist, hw), hw - (dist - e2)],
+        -hw)
+    y = np.select(
+        [dist < e1, dist < e2, dist < e3],
+        [np.full_like(dist, hd), hd - (dist - e1), np.full_like(dist, -hd)],
+        -hd + (dist - e3))
+    return np.stack([x, y], axis=1)
+
+
+def rule_local_points(rule: PlacementRule, grid_size: float,
+                      density: float) -> np.ndarray:
+    """Cell-local ``(k, 2)`` points for the deterministic rules.
+
+    Every cell gets the same pattern, so it is built once per layer and
+    broadcast. SCATTER and POISSON_DISK are random and handled separately.
+    """
+    gs = grid_size
+    if rule == PlacementRule.EDGE_LOOP:
+        num = max(1, int((gs + gs) * 2 * density * 0.1))
+        return perimeter_points(gs, gs, np.arange(num, dtype=np.float64) / num)
+    if rule == PlacementRule.FILL_GRID:
+        step = max(0.25, gs / max(0.001, density))
+        steps = max(1, int(gs / step))
+        axis = (np.arange(steps, dtype=np.float64) - steps * 0.5 + 0.5) * step
+        gx, gy = np.meshgrid(axis, axis, indexing="ij")
+        return np.stack([gx.ravel(), gy.ravel()], axis=1)
+    if rule == PlacementRule.CENTER_LINE:
+        num = max(1, int(gs * density * 0.1))
+        if num == 1:
+            return np.zeros((1, 2), dtype=np.float64)
+        y = np.arange(num, dtype=np.float64) * (gs / (num - 1)) - gs * 0.5
+        return np.stack([np.zeros(num), y], axis=1)
+    return np.zeros((0, 2), dtype=np.float64)
+
+
+def layer_rng(seed: int, layer_index: int) -> np.random.Generator:
+    """Independent, reproducible stream per (seed, layer)."""
+    return np.random.default_rng([seed & 0xFFFFFFFF, layer_index])
+
+
+def plan_layer(layer: LayerConfig, layer_index: int, cells: CellArrays,
+               grid_size: float, n_sources: int, seed: int
+               ) -> Optional[PropBatch]:
+    """Build the :class:`PropBatch` for one layer across every target cell."""
+    sel = np.flatnonzero(role_mask(layer.cell_target, cells.roles))
+    if sel.size == 0:
+        return None
+    rng = layer_rng(seed, layer_index)
+
+    if layer.rule == PlacementRule.POISSON_DISK:
+        owner, world_xy = _poisson_points(layer, layer_index, cells, sel,
+                                          grid_size, seed)
+        if owner.size == 0:
+            return None
+        positions = cells.xyz[owner].copy()
+        positions[:, :2] = world_xy
+    else:
+        if layer.rule == PlacementRule.SCATTER:
+            per_cell = max(1, int(grid_size * grid_size * layer.density * 0.1))
+            half = grid_size * 0.5
+            local = rng.uniform(-half, half, size=(sel.size * per_cell, 2))
+        else:
+            pattern = rule_local_points(layer.rule, grid_size, layer.density)
+            per_cell = pattern.shape[0]
+            if per_cell == 0:
+                return None
+            local = np.tile(pattern, (sel.size, 1))
+        owner = np.repeat(sel, per_cell)
+        c = cells.cos_o[owner]
+        s = cells.sin_o[owner]
+        positions = cells.xyz[owner].copy()
+        positions[:, 0] += local[:, 0] * c - local[:, 1] * s
+        positions[:, 1] += local[:, 0] * s + local[:, 1] * c
+
+    n = owner.size
+    positions[:, 2] += layer.z_offset
+
+    yaw = cells.orientation[owner].copy()
+    if layer.random_rotation:
+        yaw += rng.uniform(0.0, math.tau, size=n)
+    if layer.random_scale:
+        scale = rng.uniform(layer.scale_min, layer.scale_max, size=n)
+    else:
+        scale = np.ones(n, dtype=np.float64)
+    if n_sources > 0:
+        source_index = rng.integers(0, n_sources, size=n)
+    else:
+        source_index = np.full(n, -1, dtype=np.int64)
+
+    return PropBatch(layer, layer_index, cells.ids[owner], positions, yaw,
+                     scale, source_index)
+
+
+def _poisson_points(layer: LayerConfig, layer_index: int, cells: CellArrays,
+                    sel: np.ndarray, grid_size: float, seed: int):
+    """Run the level-wide Bridson sampler over the selected cells.
+
+    Samples are sorted by owning cell so per-cell naming stays grouped.
+    """
+    radius = layer.min_distance
+    if radius <= 0.0:
+        radius = radius_for_density(layer.density)
+    rng = random.Random(f"{seed}:{layer_index}:poisson")
+    points, owners = poisson_disk_sample(
+        cells.xyz[sel, :2].tolist(), cells.cos_o[sel].tolist(),
+        cells.sin_o[sel].tolist(), grid_size * 0.5, radius, rng)
+    if not points:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 2))
+    owner = sel[np.asarray(owners, dtype=np.int64)]
+    order = np.argsort(owner, kind="stable")
+    return owner[order], np.asarray(points, dtype=np.float64)[order]
+
+
+def plan_decoration(cells: CellArrays, layers: Sequence[LayerConfig],
+                    grid_size: float, seed: int,
+                    source_counts: Dict[str, int]) -> List[PropBatch]:
+    """Plan every enabled layer; one :class:`PropBatch` per non-empty layer."""
+    batches: List[PropBatch] = []
+    if len(cells) == 0:
+        return batches
+    for layer_index, layer in enumerate(layers):
+        if not layer.enabled:
+            continue
+        batch = plan_layer(layer, layer_index, cells, grid_size,
+                           source_counts.get(layer.collection_name, 0), seed)
+        if batch is not None and len(batch):
+            batches.append(batch)
+    return batches
+
+
+# ------------------------------------------------------------------ budget
+
+def allocate_budget(demands: Sequence[int], weights: Sequence[float],
+                    budget: int) -> List[int]:
+    """Split ``budget`` across layers in proportion to ``weights``.
+
+    Water-filling: a layer never gets more than it asked for, and whatever
+    a satisfied layer leaves unused is shared among the rest. Zero-weight
+    layers only get what is left after every weighted layer is full. The
+    split is deterministic: integer leftovers go to the largest fractional
+    shares, ties to the earlier layer.
+    """
+    n = len(demands)
+    quotas = [0] * n
+    remaining = max(0, int(budget))
+    positive = [i for i in range(n) if weights[i] > 0.0]
+    zero = [i for i in range(n) if weights[i] <= 0.0]
+    for tier, tier_w in ((positive, weights), (zero, [1.0] * n)):
+        active = [i for i in tier if demands[i] > 0]
+        while active and remaining > 0:
+            total_w = sum(tier_w[i] for i in active)
+            share = {i: remaining * tier_w[i] / total_w for i in active}
+            full = [i for i in active if demands[i] - quotas[i] <= share[i]]
+            if full:
+                for i in full:
+                    remaining -= demands[i] - quotas[i]
+                    quotas[i] = demands[i]
+                active = [i for i in active if i not in full]
+                continue
+            # Nobody can be filled: hand out floors, then the remainder.
+            floors = {i: int(share[i]) for i in active}
+            for i in active:
+                quotas[i] += floors[i]
+            left = remaining - sum(floors.values())
+            by_fraction = sorted(active, key=lambda i: (floors[i] - share[i], i))
+            for i in by_fraction[:left]:
+                quotas[i] += 1
+            remaining = 0
+    return quotas
+
+
+def thin_stratified(batch: PropBatch, keep: int) -> PropBatch:
+    """Keep ``keep`` props, spread evenly over the batch's cells.
+
+    Batch rows are grouped by cell, so systematic sampling over the rows
+    gives every cell ``floor`` or ``ceil`` of its proportional share and,
+    within a cell, keeps props spread along the rule's pattern instead of
+    truncating it. Deterministic; no random draws.
+    """
+    n = len(batch)
+    if keep >= n:
+        return batch
+    if keep <= 0:
+        return batch.select(np.zeros(0, dtype=np.int64))
+    idx = ((np.arange(keep, dtype=np.float64) + 0.5) * (n / keep)).astype(np.int64)
+    return batch.select(idx)
+
+
+def apply_budget(batches: List[PropBatch], max_props: int
+                 ) -> Tuple[List[PropBatch], Dict[str, int]]:
+    """Thin ``batches`` so their total fits ``max_props`` (0 = unlimited).
+
+    Returns the surviving batches and the number of candidates dropped per
+    layer name.
+    """
+    dropped: Dict[str, int] = {}
+    total = sum(len(b) for b in batches)
+    if max_props <= 0 or total <= max_props:
+        return batches, dropped
+    quotas = allocate_budget([len(b) for b in batches],
+                             [max(0.0, b.layer.priority) for b in batches],
+                             max_props)
+    out: List[PropBatch] = []
+    for batch, quota in zip(batches, quotas):
+        if quota < len(batch):
+            name = batch.layer.name
+            dropped[name] = dropped.get(name, 0) + len(batch) - quota
+        if quota > 0:
+            out.append(thin_stratified(batch, quota))
+    return out, dropped
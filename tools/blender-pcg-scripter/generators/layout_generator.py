@@ -19,10 +19,19 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Set, Tuple
 
 import mathutils
+import numpy as np
 
+from ..core.noise import fbm
 from ..core.parameters import ElevationSource, GenerationParams
 from ..core.spline_sampler import SplinePoint
 
+# NOISE elevation: one base-octave cycle spans this many cells, and noise
+# values are stretched by the contrast before being cut into steps (fBm
+# rarely strays far from zero, so unstretched the middle step would win).
+ELEVATION_NOISE_CELLS = 6.0
+ELEVATION_NOISE_OCTAVES = 3
+ELEVATION_NOISE_CONTRAST = 2.5
+
 # Cardinal direction helpers ------------------------------------------------
 
 DIR_N = "N"
@@ -154,6 +163,9 @@ class LayoutGenerator:
         P5  Decide which edges are connections (doorways/open) per style.
             Path-to-path edges are always forced open so the road never
             gets fenced off.
+
+    :py:meth:`reroll_region` re-runs P3-P5 for a subset of cells after
+    ``generate``; the region regenerator uses it.
     """
 
     def __init__(self, seed: int, params: GenerationParams,
@@ -391,6 +403,19 @@ class LayoutGenerator:
                 c.base_z = min_base
             return
 
+        if source == ElevationSource.NOISE.value:
+            cells = list(self._cells.values())
+            xy = np.array([c.world_xy for c in cells], dtype=np.float64)
+            gs = self.params.grid_size if self.params.grid_size > 0 else 1.0
+            n = fbm(xy[:, 0], xy[:, 1], seed=self.seed or 0,
+                    octaves=ELEVATION_NOISE_OCTAVES,
+                    frequency=1.0 / (ELEVATION_NOISE_CELLS * gs))
+            level = n * (ELEVATION_NOISE_CONTRAST * 0.5) + 0.5
+            steps = np.clip(np.floor(level * (max_steps + 1)), 0, max_steps)
+            for c, s in zip(cells, steps.tolist()):
+                c.elevation = int(s)
+            return
+
         # RANDOM_SMOOTHED
         for c in self._cells.values():
             c.elevation = self.rng.randint(0, max_steps)
@@ -459,6 +484,70 @@ class LayoutGenerator:
                     cell.connections.add(cardinal)
                     nb.connections.add(OPPOSITE[cardinal])
 
+    # ---------------- Region reroll ---------------------------------------
+
+    def reroll_region(self, region: List[Cell], seed: int) -> None:
+        """Re-run P3-P5 for ``region`` only, with a fresh ``seed``.
+
+        Cells outside the region keep their elevation and act as fixed
+        boundary values for smoothing and the neighbour-delta clamp. Only
+        ``RANDOM_SMOOTHED`` elevation is re-rolled (the other sources are
+        deterministic). Every edge touching the region gets its connection
+        decided again, on both sides. Cost is proportional to the region.
+        """
+        if not region:
+            return
+        rng = random.Random(seed)
+        inside = {c.id for c in region}
+        max_steps = max(0, int(self.params.max_elevation_steps))
+
+        if (self.params.elevation_source == ElevationSource.RANDOM_SMOOTHED.value
+                and max_steps > 0):
+            for c in region:
+                c.elevation = rng.randint(0, max_steps)
+            for _ in range(max(0, int(self.params.elevation_smoothing))):
+                new_values = {}
+                for c in region:
+                    total = c.elevation
+                    count = 1
+                    for nb in c.neighbors.values():
+                        total += nb.elevation
+                        count += 1
+                    new_values[c.id] = max(0, min(max_steps,
+                                                  int(round(total / count))))
+                for c in region:
+                    c.elevation = new_values[c.id]
+            limit = max(1, max_steps)
+            for c in region:
+                for nb in c.neighbors.values():
+                    if nb.id in inside:
+                        continue
+                    if c.elevation > nb.elevation + limit:
+                        c.elevation = nb.elevation + limit
+                    elif c.elevation < nb.elevation - limit:
+                        c.elevation = nb.elevation - limit
+
+        indoor = self.params.is_indoor()
+        seal_chance = 0.0 if not indoor else max(0.0, 1.0 - self.params.lateral_density)
+        done: Set[Tuple[int, int]] = set()
+        for c in region:
+            for cardinal, nb in c.neighbors.items():
+                key = (c.id, nb.id) if c.id < nb.id else (nb.id, c.id)
+                if key in done:
+                    continue
+                done.add(key)
+                path_to_path = (c.role == "path" and nb.role == "path")
+                connect = True
+                if not path_to_path and seal_chance > 0.0 \
+                        and rng.random() < seal_chance:
+                    connect = False
+                if connect:
+                    c.connections.add(cardinal)
+                    nb.connections.add(OPPOSITE[cardinal])
+                else:
+                    c.connections.discard(cardinal)
+                    nb.connections.discard(OPPOSITE[cardinal])
+
     # ---------------- Diagnostics -----------------------------------------
 
     def ensure_connectivity(self, cells: List[Cell]) -> bool:
@@ -0,0 +1,97 @@
+"""Occupancy index for decoration collision rejection.
+
+Holds two kinds of footprints in a :class:`~..core.spatial_hash.SpatialHash`:
+
+* oriented boxes for blockout pieces (walls, pillars, doorway passages,
+  ramps / stairs), taken straight from the placement plan, and
+* discs for decoration props that have already been accepted.
+
+A candidate prop is a disc (its source mesh's XY bounding radius) plus a Z
+interval. :py:meth:`OccupancyIndex.blocked` checks it only against the
+footprints in the buckets it touches, so each test is O(1) no matter how
+large the level is. Each footprint carries a *kind* so layers can choose
+what they are allowed to overlap (see :class:`CollisionMode`).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import FrozenSet, Tuple
+
+from ..core.layer_system import CollisionMode
+from ..core.spatial_hash import SpatialHash
+
+# Footprint kinds.
+OCC_STRUCTURE = "STRUCTURE"   # walls, half walls, pillars
+OCC_CLEARANCE = "CLEARANCE"   # doorway passages, ramps, stairs
+OCC_PROP = "PROP"             # accepted decoration props
+
+# What each layer collision mode refuses to overlap.
+BLOCKING_KINDS = {
+    CollisionMode.NONE: frozenset(),
+    CollisionMode.STRUCTURE: frozenset((OCC_STRUCTURE, OCC_CLEARANCE)),
+    CollisionMode.ALL: frozenset((OCC_STRUCTURE, OCC_CLEARANCE, OCC_PROP)),
+}
+
+# Footprint records are plain tuples for speed:
+#   box:  (kind, cx, cy, cos, sin, hx, hy, z0, z1)
+#   disc: (kind, cx, cy, None, None, radius, radius, z0, z1)
+_Footprint = Tuple
+
+
+class OccupancyIndex:
+    """Spatial hash of blockout / prop footprints with exact overlap tests."""
+
+    def __init__(self, cell_size: float):
+        self._hash: SpatialHash[_Footprint] = SpatialHash(cell_size)
+
+    def __len__(self) -> int:
+        return len(self._hash)
+
+    def add_box(self, kind: str, cx: float, cy: float, yaw: float,
+                hx: float, hy: float, z0: float, z1: float) -> None:
+        """Register an oriented ``2hx x 2hy`` box centred on ``(cx, cy)``."""
+        c = math.cos(yaw)
+        s = math.sin(yaw)
+        ex = abs(c) * hx + abs(s) * hy
+        ey = abs(s) * hx + abs(c) * hy
+        self._hash.insert((kind, cx, cy, c, s, hx, hy, z0, z1),
+                          cx - ex, cy - ey, cx + ex, cy + ey)
+
+    def add_disc(self, kind: str, x: float, y: float, radius: float,
+                 z0: float, z1: float) -> None:
+        self._hash.insert((kind, x, y, None, None, radius, radius, z0, z1),
+                          x - radius, y - radius, x + radius, y + radius)
+
+    def blocked(self, x: float, y: float, radius: float, z0: float, z1: float,
+                kinds: FrozenSet[str]) -> bool:
+        """True if a disc at ``(x, y)`` overlaps a footprint of ``kinds``.
+
+        Touching is allowed; only strict interpenetration counts.
+        """
+        if not kinds:
+            return False
+        r2 = radius * radius
+        for kind, cx, cy, c, s, hx, hy, fz0, fz1 in self._hash.query(
+                x - radius, y - radius, x + radius, y + radius):
+            if kind not in kinds or z1 <= fz0 or z0 >= fz1:
+                continue
+            dx = x - cx
+            dy = y - cy
+            if c is None:
+                reach = radius + hx
+                if dx * dx + dy * dy < reach * reach:
+                    return True
+                continue
+            # Closest point of the box to the disc centre, in box space.
+            u = dx * c + dy * s
+            v = dy * c - dx * s
+            du = abs(u) - hx
+            dv = abs(v) - hy
+            if du <= 0.0 and dv <= 0.0:
+                return True
+            du = du if du > 0.0 else 0.0
+            dv = dv if dv > 0.0 else 0.0
+            if du * du + dv * dv < r2:
+                return True
+        return False
@@ -0,0 +1,226 @@
+"""Blockout placement plan.
+
+The FLOOR / WALL / TRAVERSAL / PILLAR passes in
+:py:meth:`BuildingBlockGenerator.build_blockout` do not spawn objects
+directly; they append :class:`Placement` records to a flat plan. Post-passes
+(merging, etc.) rewrite the plan and the generator realizes it in a single
+spawn loop afterwards.
+
+Nothing in this module touches ``bpy.data`` or allocates ``mathutils``
+objects, so plan passes stay cheap and can run on plans that are never
+realized.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from ..core.pieces import PIECE_FLOOR, PIECE_WALL, PIECE_WALL_HALF
+
+
+@dataclass
+class Placement:
+    """One blockout piece, before it becomes a Blender object.
+
+    ``location`` / ``dims`` / ``yaw`` use the same conventions as
+    :py:meth:`BuildingBlockGenerator.generate_block`: the location is the
+    piece anchor (floor top / wall base / ramp foot), ``dims`` is the
+    (length, depth, height) triple in the piece's local frame. A non-empty
+    ``collection`` (set by WFC rule variants) spawns instances from that
+    collection instead of the piece's placeholder / override; such pieces
+    are never merged.
+    """
+
+    piece: str                               # PIECE_* id
+    location: Tuple[float, float, float]
+    dims: Tuple[float, float, float]
+    yaw: float
+    space_id: int                            # owning cell id (naming)
+    index: int                               # per-cell piece index (naming)
+    cell_ids: Tuple[int, ...] = ()           # every cell this piece covers
+    collection: str = ""                     # variant source collection
+
+
+# Pieces the collinear-wall pass is allowed to fuse.
+MERGEABLE_WALL_PIECES: Tuple[str, ...] = (PIECE_WALL, PIECE_WALL_HALF)
+
+
+def merge_collinear_walls(plan: List[Placement], grid_size: float,
+                          pieces: Iterable[str] = MERGEABLE_WALL_PIECES
+                          ) -> List[Placement]:
+    """Greedily fuse runs of adjacent, collinear wall placements.
+
+    Two walls are fused when they are the same piece type, share the same
+    line (yaw modulo pi, perpendicular offset and base Z), have identical
+    length / height, and sit exactly one wall length apart along that line.
+    Anything occupying a slot on the line -- a doorway, a ramp, an open
+    edge -- leaves a gap, so runs never bridge across it.
+
+    The test is done in world space, so it works the same for world-aligned
+    lateral rooms and for ribbon cells: a straight stretch of road where the
+    tangent yaw is constant merges, a curve does not.
+
+    Returns a new plan; non-wall placements keep their relative order and the
+    merged walls are appended after them.
+    """
+    mergeable = set(pieces)
+    if not mergeable:
+        return list(plan)
+    tol = max(1e-6, grid_size * 1e-3)
+
+    out: List[Placement] = []
+    lines: Dict[Tuple, List[Tuple[float, Placement]]] = {}
+    line_axes: Dict[Tuple, Tuple[float, float, float]] = {}
+
+    for p in plan:
+        if p.piece not in mergeable or p.collection:
+            out.append(p)
+            continue
+        # Walls are symmetric about their centre line, so a wall facing N and
+        # one facing S on the same line are interchangeable.
+        axis = p.yaw % math.pi
+        if math.pi - axis < 1e-6:
+            axis = 0.0
+        dx = math.cos(axis)
+        dy = math.sin(axis)
+        x, y, z = p.location
+        along = x * dx + y * dy
+        across = -x * dy + y * dx
+        key = (p.piece, round(axis, 4), round(across / tol), round(z / tol),
+               round(p.dims[0] / tol), round(p.dims[1] / tol),
+               round(p.dims[2] / tol))
+        bucket = lines.get(key)
+        if bucket is None:
+            bucket = []
+            lines[key] = bucket
+            line_axes[key] = (dx, dy, across)
+        bucket.append((along, p))
+
+    for key, bucket in lines.items():
+        if len(bucket) == 1:
+            out.append(bucket[0][1])
+            continue
+        dx, dy, across = line_axes[key]
+        bucket.sort(key=lambda item: item[0])
+        run: List[Tuple[float, Placement]] = [bucket[0]]
+        for item in bucket[1:]:
+            prev_along, prev = run[-1]
+            if abs(item[0] - prev_along - prev.dims[0]) <= tol:
+                run.append(item)
+                continue
+            out.append(_fuse_run(run, dx, dy, across))
+            run = [item]
+        out.append(_fuse_run(run, dx, dy, across))
+    return out
+
+
+def _fuse_run(run: List[Tuple[float, Placement]], dx: float, dy: float,
+              across: float) -> Placement:
+    first = run[0][1]
+    if len(run) == 1:
+        return first
+    mid = (run[0][0] + run[-1][0]) * 0.5
+    cell_ids: List[int] = []
+    for _, p in run:
+        cell_ids.extend(p.cell_ids)
+    return Placement(
+        piece=first.piece,
+        location=(mid * dx - across * dy, mid * dy + across * dx,
+                  first.location[2]),
+        dims=(first.dims[0] * len(run), first.dims[1], first.dims[2]),
+        yaw=first.yaw,
+        space_id=first.space_id,
+        index=first.index,
+        cell_ids=tuple(cell_ids),
+    )
+
+
+def merge_coplanar_floors(plan: List[Placement], grid_size: float,
+                          piece: str = PIECE_FLOOR) -> List[Placement]:
+    """Cover connected same-elevation floor tiles with as few slabs as we can.
+
+    Floors are grouped by base Z and by lattice orientation (yaw modulo
+    90 degrees -- a square tile looks the same after a quarter turn). Inside a
+    group every tile is projected onto the group's local lattice; tiles that
+    do not land on an integer lattice slot (e.g. ribbon samples spaced
+    differently from the grid size) are passed through untouched. The rest
+    are covered greedily: grow a row along local +X as far as it goes, then
+    grow the strip along local +Y while the whole row below is free. Each
+    rectangle becomes one floor placement scaled to ``w x h`` cells, so the
+    realized shape is identical to the per-cell tiles it replaces.
+    """
+    tol = 1e-3
+    quarter = math.pi * 0.5
+
+    out: List[Placement] = []
+    groups: Dict[Tuple, List[Placement]] = {}
+    for p in plan:
+        if p.piece != piece or p.collection:
+            out.append(p)
+            continue
+        axis = p.yaw % quarter
+        if quarter - axis < 1e-6:
+            axis = 0.0
+        key = (round(axis, 4), round(p.location[2] / (grid_size * tol)),
+               round(p.dims[0] / (grid_size * tol)),
+               round(p.dims[1] / (grid_size * tol)))
+        groups.setdefault(key, []).append(p)
+
+    for tiles in groups.values():
+        if len(tiles) == 1:
+            out.append(tiles[0])
+            continue
+        first = tiles[0]
+        axis = first.yaw % quarter
+        if quarter - axis < 1e-6:
+            axis = 0.0
+        step_x = first.dims[0]
+        step_y = first.dims[1]
+        rx, ry = math.cos(axis), math.sin(axis)       # local +X
+        fx, fy = -ry, rx                               # local +Y
+        ox, oy, oz = first.location
+
+        slots: Dict[Tuple[int, int], Placement] = {}
+        for p in tiles:
+            dx = p.location[0] - ox
+            dy = p.location[1] - oy
+            u = (dx * rx + dy * ry) / step_x
+            v = (dx * fx + dy * fy) / step_y
+            iu = round(u)
+            iv = round(v)
+            if abs(u - iu) > tol or abs(v - iv) > tol or (iu, iv) in slots:
+                out.append(p)
+                continue
+            slots[(iu, iv)] = p
+
+        for (u0, v0) in sorted(slots, key=lambda k: (k[1], k[0])):
+            start = slots.get((u0, v0))
+            if start is None:
+                continue  # already covered by an earlier rectangle
+            w = 1
+            while (u0 + w, v0) in slots:
+                w += 1
+            h = 1
+            while all((u0 + i, v0 + h) in slots for i in range(w)):
+                h += 1
+            cell_ids: List[int] = []
+            for j in range(h):
+                for i in range(w):
+                    cell_ids.extend(slots.pop((u0 + i, v0 + j)).cell_ids)
+            if w == 1 and h == 1:
+                out.append(start)
+                continue
+            cu = (u0 + (w - 1) * 0.5) * step_x
+            cv = (v0 + (h - 1) * 0.5) * step_y
+            out.append(Placement(
+                piece=piece,
+                location=(ox + rx * cu + fx * cv, oy + ry * cu + fy * cv, oz),
+                dims=(step_x * w, step_y * h, first.dims[2]),
+                yaw=axis,
+                space_id=start.space_id,
+                index=start.index,
+                cell_ids=tuple(cell_ids),
+            ))
+    return out
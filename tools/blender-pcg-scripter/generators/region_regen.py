@@ -0,0 +1,406 @@
+"""Region-limited regeneration of the last generation.
+
+Generate leaves a :class:`GenerationSession` behind: the cells, the layout
+and blockout generators, the raw and merged blockout plans and which object
+realizes each placement / decoration prop, all indexed by cell id. A
+:class:`CellIndex` (uniform spatial hash over the cell squares) maps world
+points and regions back to cells.
+
+:py:meth:`GenerationSession.regenerate` then re-rolls just a set of cells
+with a fresh sub-seed:
+
+1. elevation and connections (:py:meth:`LayoutGenerator.reroll_region`),
+2. blockout: every placement touching the region is deleted and re-planned
+   (:py:meth:`BuildingBlockGenerator.plan_region`). Merged walls / floor
+   slabs that reach outside the region are deleted too, and their outside
+   parts are re-merged and respawned from the raw plan, so cells outside
+   the region end up with the same geometry as before,
+3. decoration: the region's props are deleted and re-planned against the
+   nearby blockout only, within what is left of the prop budget,
+4. collision proxies, when the run has them, are rebuilt for the chunks
+   whose raw pieces changed.
+
+Every step only touches the region, its direct neighbours and the pieces
+that cover them, so the cost follows the region size, not the level size.
+Generation parameters are the ones the session was generated with.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import bpy
+from bpy.app.handlers import persistent
+
+from ..core.chunking import chunk_coord
+from ..core.scene_manager import ChunkedCollections
+from ..core.spatial_hash import SpatialHash
+from .building_generator import BuildingBlockGenerator
+from .collision import CollisionProxies
+from .decoration_engine import PropBatch
+from .layout_generator import Cell, LayoutGenerator
+from .placement_plan import Placement
+
+# Footprint tolerance (fraction of grid size) when matching raw placements
+# to the merged placement that covers them.
+_MATCH_TOL = 1e-3
+
+
+class CellIndex:
+    """Spatial hash over the (oriented) cell squares of a layout."""
+
+    def __init__(self, cells: Iterable[Cell], grid_size: float):
+        self.half = grid_size * 0.5
+        self._hash: SpatialHash[Cell] = SpatialHash(grid_size)
+        reach = self.half * math.sqrt(2.0)
+        for c in cells:
+            x, y = c.world_xy
+            self._hash.insert(c, x - reach, y - reach, x + reach, y + reach)
+
+    def _distance(self, cell: Cell, x: float, y: float) -> float:
+        """Distance from ``(x, y)`` to ``cell``'s square (0 inside)."""
+        dx = x - cell.world_xy[0]
+        dy = y - cell.world_xy[1]
+        c = math.cos(cell.orientation)
+        s = math.sin(cell.orientation)
+        du = max(abs(dx * c + dy * s) - self.half, 0.0)
+        dv = max(abs(dy * c - dx * s) - self.half, 0.0)
+        return math.hypot(du, dv)
+
+    def cells_in_radius(self, x: float, y: float, radius: float) -> List[Cell]:
+        """Cells whose square comes within ``radius`` of ``(x, y)``."""
+        return [c for c in self._hash.query(x - radius, y - radius,
+                                            x + radius, y + radius)
+                if self._distance(c, x, y) <= radius]
+
+    def cell_at(self, x: float, y: float) -> Optional[Cell]:
+        """The cell containing ``(x, y)``; the nearest centre on overlaps."""
+        hits = self.cells_in_radius(x, y, 0.0)
+        if not hits:
+            return None
+        return min(hits, key=lambda c: (c.world_xy[0] - x) ** 2
+                   + (c.world_xy[1] - y) ** 2)
+
+
+def _covers(merged: Placement, raw: Placement, tol: float) -> bool:
+    """True if ``raw``'s footprint lies inside ``merged``'s (same piece)."""
+    if raw.piece != merged.piece or abs(raw.location[2] - merged.location[2]) > tol:
+        return False
+    dx = raw.location[0] - merged.location[0]
+    dy = raw.location[1] - merged.location[1]
+    c = math.cos(merged.yaw)
+    s = math.sin(merged.yaw)
+    # Half extents of the raw rectangle along the merged piece's axes.
+    rc = abs(math.cos(raw.yaw - merged.yaw))
+    rs = abs(math.sin(raw.yaw - merged.yaw))
+    eu = rc * raw.dims[0] * 0.5 + rs * raw.dims[1] * 0.5
+    ev = rs * raw.dims[0] * 0.5 + rc * raw.dims[1] * 0.5
+    return (abs(dx * c + dy * s) + eu <= merged.dims[0] * 0.5 + tol
+            and abs(dy * c - dx * s) + ev <= merged.dims[1] * 0.5 + tol)
+
+
+def _remove_objects(objects: List[bpy.types.Object]) -> int:
+    """Delete ``objects``, skipping any the user already deleted."""
+    alive = []
+    for obj in objects:
+        try:
+            obj.name
+        except ReferenceError:
+            continue
+        alive.append(obj)
+    if alive:
+        bpy.data.batch_remove(alive)
+    return len(alive)
+
+
+class GenerationSession:
+    """Everything region regeneration needs about one Generate run."""
+
+    def __init__(self, root: bpy.types.Collection, layout: LayoutGenerator,
+                 generator: BuildingBlockGenerator, cells: List[Cell],
+                 blockout_by_piece: Dict[str, List[bpy.types.Object]],
+                 decor_blocks: Dict[str, List[bpy.types.Object]],
+                 blockout_parent: Optional[bpy.types.Collection] = None,
+                 decoration_parent: Optional[bpy.types.Collection] = None,
+                 chunks: Optional[ChunkedCollections] = None,
+                 collision: Optional[CollisionProxies] = None):
+        self.root = root
+        self.layout = layout
+        self.generator = generator
+        self.blockout_parent = blockout_parent
+        self.decoration_parent = decoration_parent
+        self.chunks = chunks
+        self.collision = collision
+        self.cells: Dict[int, Cell] = {c.id: c for c in cells}
+        self.index = CellIndex(cells, generator.params.grid_size)
+        self._next_key = 0
+
+        # Raw (pre-merge) placements by key, and keys by cell id.
+        self._raw: Dict[int, Placement] = {}
+        self._raw_by_cell: Dict[int, Set[int]] = {}
+        for p in generator._raw_blockout_plan:
+            self._add_raw(p)
+
+        # Realized (post-merge) placements: (placement, object, pointer).
+        self._placed: Dict[int, Tuple[Placement, bpy.types.Object, int]] = {}
+        self._placed_by_cell: Dict[int, Set[int]] = {}
+        # obj.as_pointer() -> placement key, for selection lookups.
+        self._placed_by_object: Dict[int, int] = {}
+        self._add_placed(generator._blockout_plan, blockout_by_piece)
+
+        # Decoration props per cell: (layer name, object, location).
+        self._props: Dict[int, List[Tuple[str, bpy.types.Object, Tuple]]] = {}
+        self.prop_count = 0
+        self._add_props(generator._decoration_plan, decor_blocks)
+
+    # ------------------------------------------------------------ registry
+
+    def is_alive(self) -> bool:
+        """False once the generation's data is gone (deleted, undo, reload)."""
+        try:
+            return self.root.name in bpy.data.collections
+        except ReferenceError:
+            return False
+
+    def _key(self) -> int:
+        self._next_key += 1
+        return self._next_key
+
+    def _add_raw(self, p: Placement) -> None:
+        key = self._key()
+        self._raw[key] = p
+        for cid in p.cell_ids:
+            self._raw_by_cell.setdefault(cid, set()).add(key)
+
+    def _add_placed(self, plan: List[Placement],
+                    by_piece: Dict[str, List[bpy.types.Object]]) -> None:
+        # realize_plan keeps plan order within each piece list.
+        iters = {piece: iter(objs) for piece, objs in by_piece.items()}
+        for p in plan:
+            obj = next(iters[p.piece])
+            key = self._key()
+            ptr = obj.as_pointer()
+            self._placed[key] = (p, obj, ptr)
+            self._placed_by_object[ptr] = key
+            for cid in p.cell_ids:
+                self._placed_by_cell.setdefault(cid, set()).add(key)
+
+    def _add_props(self, batches: List[PropBatch],
+                   blocks: Dict[str, List[bpy.types.Object]]) -> None:
+        # realize_decoration appends each batch's props in batch order.
+        iters = {name: iter(objs) for name, objs in blocks.items()}
+        for batch in batches:
+            name = batch.layer.name
+            for cid, pos in zip(batch.cell_ids.tolist(),
+                                batch.positions.tolist()):
+                self._props.setdefault(cid, []).append(
+                    (name, next(iters[name]), tuple(pos)))
+                self.prop_count += 1
+
+    # ------------------------------------------------------------- queries
+
+    def cells_for_objects(self, objects: Iterable[bpy.types.Object]) -> Set[int]:
+        """Cells covered by generated pieces, or under any other object."""
+        out: Set[int] = set()
+        for obj in objects:
+            key = self._placed_by_object.get(obj.as_pointer())
+            if key is not None:
+                out.update(self._placed[key][0].cell_ids)
+                continue
+            cell = self.index.cell_at(obj.location.x, obj.location.y)
+            if cell is not None:
+                out.add(cell.id)
+        return out
+
+    def cells_in_radius(self, x: float, y: float, radius: float) -> Set[int]:
+        return {c.id for c in self.index.cells_in_radius(x, y, radius)}
+
+    # -------------------------------------------------------- regeneration
+
+    def regenerate(self, cell_ids: Iterable[int], seed: int) -> Dict[str, int]:
+        """Re-roll ``cell_ids`` with ``seed`` and patch the scene in place.
+
+        Returns counts: ``cells``, ``pieces_removed``, ``pieces_added``,
+        ``props_removed``, ``props_added``.
+        """
+        region = [self.cells[i] for i in sorted(set(cell_ids)) if i in self.cells]
+        stats = {"cells": len(region), "pieces_removed": 0, "pieces_added": 0,
+                 "props_removed": 0, "props_added": 0}
+        if not region:
+            return stats
+        inside = {c.id for c in region}
+        ring = set(inside)
+        for c in region:
+            ring.update(nb.id for nb in c.neighbors.values())
+
+        self.layout.reroll_region(region, seed)
+        self._regenerate_blockout(region, inside, seed, stats)
+        self._regenerate_decoration(region, ring, seed, stats)
+        if self.chunks is not None:
+            self.chunks.write_manifest()
+        return stats
+
+    def _regenerate_blockout(self, region: List[Cell], inside: Set[int],
+                             seed: int, stats: Dict[str, int]) -> None:
+        gen = self.generator
+        tol = gen.params.grid_size * _MATCH_TOL
+
+        removed: Set[int] = set()
+        for cid in inside:
+            removed.update(self._placed_by_cell.get(cid, ()))
+
+        # Raw pieces under a removed placement that do not touch the region
+        # were only collateral of a merge; they are respawned unchanged.
+        collateral: List[Placement] = []
+        seen: Set[int] = set()
+        for key in removed:
+            merged = self._placed[key][0]
+            for cid in set(merged.cell_ids) - inside:
+                for rkey in self._raw_by_cell.get(cid, ()):
+                    if rkey in seen:
+                        continue
+                    raw = self._raw[rkey]
+                    if inside.isdisjoint(raw.cell_ids) and _covers(merged, raw, tol):
+                        seen.add(rkey)
+                        collateral.append(raw)
+
+        # Swap the region's raw pieces for freshly planned ones.
+        stale: Set[int] = set()
+        for cid in inside:
+            stale.update(self._raw_by_cell.get(cid, ()))
+        touched: List[Placement] = []
+        for rkey in stale:
+            p = self._raw.pop(rkey)
+            touched.append(p)
+            for cid in p.cell_ids:
+                self._raw_by_cell[cid].discard(rkey)
+        fresh = gen.plan_region(region, seed)
+        for p in fresh:
+            self._add_raw(p)
+        if self.collision is not None:
+            size = self.collision.chunk_size
+            coords = {chunk_coord(p.location[0], p.location[1], size)
+                      for p in touched + fresh}
+            self.collision.build(self._raw.values(), coords)
+
+        doomed = []
+        for key in removed:
+            p, obj, ptr = self._placed.pop(key)
+            for cid in p.cell_ids:
+                self._placed_by_cell[cid].discard(key)
+            self._placed_by_object.pop(ptr, None)
+            if self.chunks is not None:
+                self.chunks.release(p.location, "blockout", p.piece)
+            doomed.append(obj)
+        stats["pieces_removed"] = _remove_objects(doomed)
+
+        patch = gen.merge_plan(fresh + collateral)
+        by_piece = gen.realize_plan(patch, self.blockout_parent, self.chunks)
+        self._add_placed(patch, by_piece)
+        stats["pieces_added"] = len(patch)
+
+    def _regenerate_decoration(self, region: List[Cell], ring: Set[int],
+                               seed: int, stats: Dict[str, int]) -> None:
+        gen = self.generator
+        doomed = []
+        for c in region:
+            for name, obj, pos in self._props.pop(c.id, ()):
+                if self.chunks is not None:
+                    self.chunks.release(pos, "decoration", name)
+                doomed.append(obj)
+        self.prop_count -= len(doomed)
+        stats["props_removed"] = _remove_objects(doomed)
+
+        if not any(layer.enabled for layer in gen.params.layers):
+            return
+        budget = gen.params.max_props
+        if budget > 0:
+            budget -= self.prop_count
+            if budget <= 0:
+                return
+        keys: Set[int] = set()
+        for cid in ring:
+            keys.update(self._placed_by_cell.get(cid, ()))
+        nearby = [self._placed[k][0] for k in keys]
+
+        batches = gen.plan_decoration(region, seed=seed, max_props=budget,
+                                      blockout_plan=nearby)
+        blocks = gen.realize_decoration(batches, self.decoration_parent,
+                                        self.chunks)
+        before = self.prop_count
+        self._add_props(batches, blocks)
+        stats["props_added"] = self.prop_count - before
+
+    # ------------------------------------------------------------------ naming
+
+    def name_props(self, objects: Optional[Iterable[bpy.types.Object]] = None) -> int:
+        """Give props their descriptive names, as ``LAZY`` prop naming defers.
+
+        Only props among ``objects`` are renamed, every prop when None.
+        Names stay in the generation's token namespace and count props per
+        layer within a cell, exactly as ``FULL`` naming would have named them.
+
+        Returns:
+            Number of props renamed
+        """
+        names = self.generator._name_allocator()
+        wanted = None if objects is None else {o.as_pointer() for o in objects}
+        renamed = 0
+        for cid, props in self._props.items():
+            by_layer: Dict[str, List[bpy.types.Object]] = {}
+            for layer_name, obj, _ in props:
+                by_layer.setdefault(layer_name, []).append(obj)
+            for layer_name, objs in by_layer.items():
+                new_names = names.descriptive_prop_names(layer_name, [cid] * len(objs))
+                for obj, name in zip(objs, new_names):
+                    try:
+                        if wanted is not None and obj.as_pointer() not in wanted:
+                            continue
+                        if obj.name != name:
+                            obj.name = name
+                            renamed += 1
+                    except ReferenceError:
+                        continue    # deleted by the user
+        return renamed
+
+
+# The last Generate run; replaced by every Generate.
+_session: Optional[GenerationSession] = None
+
+
+def remember(session: Optional[GenerationSession]) -> None:
+    global _session
+    _session = session
+
+
+def current_session() -> Optional[GenerationSession]:
+    """The last generation, or None if it no longer exists in the file."""
+    global _session
+    if _session is not None and not _session.is_alive():
+        _session = None
+    return _session
+
+
+@persistent
+def _forget(*_args) -> None:
+    # Undo / redo / file load swap the data out from under the session.
+    remember(None)
+
+
+_HANDLERS = ("undo_post", "redo_post", "load_post")
+
+
+def register() -> None:
+    for name in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _forget not in handlers:
+            handlers.append(_forget)
+
+
+def unregister() -> None:
+    for name in _HANDLERS:
+        handlers = getattr(bpy.app.handlers, name)
+        if _forget in handlers:
+            handlers.remove(_forget)
+    remember(None)
@@ -1,14 +1,47 @@
-"""Terrain generator for creating ground meshes with elevation variation."""
+"""Terrain generator for creating ground meshes with elevation variation.
+
+Heightmaps are float32 NumPy arrays of shape ``(rows, cols)``; row ``i`` runs
+along +Y and column ``j`` along +X across the terrain bounds.
+"""
 
-import math
 import random
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
 import bpy
 import mathutils
-
+import numpy as np
+
+from ..core.distance_field import polyline_distance_field
+from ..core.heightfield import (
+    FlatZones,
+    SplineShaping,
+    blend_to_spline,
+    carve_trench,
+    flatten_road,
+    flatten_zones,
+    grid_axes,
+    grid_normals,
+    noise_heightmap,
+    road_flatten,
+    road_trench,
+    shape_along_spline,
+    spline_blend,
+    trench_reach,
+)
+from ..core.mesh_builder import build_mesh
 from ..core.parameters import GenerationParams
+from ..core.shading import PIECE_ROAD, SHADING_ATTRIBUTE, apply_attribute_shading, shared_material
 from ..core.spline_sampler import SplinePoint
+from ..core.terrain_cache import TerrainCache, cache_key
+from ..core.terrain_quadtree import adaptive_triangles
+from ..core.terrain_tiles import (
+    TILE_CELLS,
+    TileJob,
+    TileSettings,
+    compute_tiles,
+    plan_tiles,
+    tile_halo,
+)
 
 
 class TerrainGenerator:
@@ -26,12 +59,16 @@ class TerrainGenerator:
         self.seed = seed
         self.params = params
         self.spline_points = spline_points
+        self.cache = TerrainCache()
         random.seed(seed)
 
     def generate_heightmap(self, bounds: Tuple[float, float, float, float],
-                           rows: int = None, cols: int = None) -> List[List[float]]:
+                           rows: int = None, cols: int = None) -> np.ndarray:
         """
-        Generate a 2D heightmap using Perlin-like noise.
+        Generate a 2D heightmap from fBm gradient noise.
+
+        Samples are taken at their world positions, so the same point gets
+        the same height at any resolution and in any tile of the bounds.
 
         Args:
             bounds: (min_x, max_x, min_y, max_y) terrain boundaries
@@ -39,7 +76,7 @@ class TerrainGenerator:
             cols: Pre-computed column count (optional, auto-calculated if None)
 
         Returns:
-            2D list of height values
+            float32 array of height values, shape (rows, cols)
         """
         min_x, max_x, min_y, max_y = bounds
 
@@ -50,340 +87,456 @@ class TerrainGenerator:
             cols = int(width / resolution) + 1
             rows = int(height / resolution) + 1
 
-        # Initialize heightmap
-        heightmap = [[0.0 for _ in range(cols)] for _ in range(rows)]
-
-        # Generate noise-based terrain
-        # Using simple random variation for now (can be replaced with proper Perlin noise)
-        smoothness_factor = self.params.smoothness
-        height_var = self.params.height_variation
-
-        for i in range(rows):
-            for j in range(cols):
-                # Simple noise generation
-                noise_value = random.random() * 2.0 - 1.0  # -1 to 1
-                heightmap[i][j] = noise_value * height_var * (1.0 - smoothness_factor)
-
-        # Apply smoothing based on smoothness parameter
-        if smoothness_factor > 0.1:
-            heightmap = self._smooth_heightmap(heightmap, int(smoothness_factor * 5))
-
-        return heightmap
-
-    def _smooth_heightmap(self, heightmap: List[List[float]], iterations: int) -> List[List[float]]:
-        """
-        Apply smoothing to the heightmap.
-        
-        Args:
-            heightmap: The heightmap to smooth
-            iterations: Number of smoothing passes
-        
-        Returns:
-            Smoothed heightmap
-        """
-        rows = len(heightmap)
-        cols = len(heightmap[0]) if rows > 0 else 0
-
-        for _ in range(iterations):
-            new_heightmap = [[0.0 for _ in range(cols)] for _ in range(rows)]
-
-            for i in range(rows):
-                for j in range(cols):
-                    # Average with neighbors
-                    total = heightmap[i][j]
-                    count = 1
-
-                    for di in [-1, 0, 1]:
-                        for dj in [-1, 0, 1]:
-                            if di == 0 and dj == 0:
-                                continue
-                            ni, nj = i + di, j + dj
-                            if 0 <= ni < rows and 0 <= nj < cols:
-                                total += heightmap[ni][nj]
-                                count += 1
-
-                    new_heightmap[i][j] = total / count
-
-            heightmap = new_heightmap
-
-        return heightmap
+        return noise_heightmap(bounds, rows, cols, self.seed,
+                               self.params.height_variation, self.params.smoothness)
 
 
     def _precompute_spline_distance(self, bounds: Tuple[float, float, float, float],
-                                     rows: int, cols: int) -> Tuple[List[List[float]], List[List[float]]]:
+                                     rows: int, cols: int) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Precompute nearest spline-point Z and distance for every terrain cell.
+        Precompute nearest spline Z and distance for every terrain cell.
 
-        Called once per generation run. All terrain methods read from this cache
-        instead of re-scanning every spline point for every cell.
+        Called once per generation run. The spline polyline is rasterized
+        into the grid and an exact Euclidean distance transform finds each
+        cell's nearest spline segment in O(rows * cols); all terrain methods
+        read from this cache instead of scanning the spline per cell.
         """
-        min_x, max_x, min_y, max_y = bounds
-        nearest_z = [[0.0 for _ in range(cols)] for _ in range(rows)]
-        nearest_dist = [[float('inf') for _ in range(cols)] for _ in range(rows)]
-
-        for i in range(rows):
-            for j in range(cols):
-                world_x = min_x + (j / (cols - 1)) * (max_x - min_x) if cols > 1 else min_x
-                world_y = min_y + (i / (rows - 1)) * (max_y - min_y) if rows > 1 else min_y
-
-                min_d = float('inf')
-                near_z = 0.0
-                for point in self.spline_points:
-                    dx = point.position.x - world_x
-                    dy = point.position.y - world_y
-                    d2 = dx * dx + dy * dy
-                    if d2 < min_d:
-                        min_d = d2
-                        near_z = point.position.z
-
-                nearest_dist[i][j] = math.sqrt(min_d) if min_d < float('inf') else float('inf')
-                nearest_z[i][j] = near_z
-
-        return nearest_z, nearest_dist
-
-    def align_to_spline_path(self, heightmap: List[List[float]],
+        points = np.array([tuple(p.position) for p in self.spline_points],
+                          dtype=np.float64).reshape(-1, 3)
+        return polyline_distance_field(points, bounds, rows, cols)
+
+    def align_to_spline_path(self, heightmap: np.ndarray,
                              bounds: Tuple[float, float, float, float],
-                             nearest_z: List[List[float]],
-                             nearest_dist: List[List[float]]) -> List[List[float]]:
+                             nearest_z: np.ndarray,
+                             nearest_dist: np.ndarray) -> np.ndarray:
         """Blend heightmap with spline elevation using precomputed distance cache."""
-        rows = len(heightmap)
-        cols = len(heightmap[0]) if rows > 0 else 0
-        blend_distance = self.params.path_width
-
-        for i in range(rows):
-            for j in range(cols):
-                dist = nearest_dist[i][j]
-                if dist < blend_distance:
-                    blend_factor = 1.0 - (dist / blend_distance)
-                    heightmap[i][j] = heightmap[i][j] * (1.0 - blend_factor) + nearest_z[i][j] * blend_factor
+        return blend_to_spline(heightmap, nearest_z, nearest_dist, self.params.path_width)
 
-        return heightmap
-
-    def create_road_surface(self, heightmap: List[List[float]],
+    def create_road_surface(self, heightmap: np.ndarray,
                            bounds: Tuple[float, float, float, float],
-                           nearest_z: List[List[float]],
-                           nearest_dist: List[List[float]]) -> List[List[float]]:
+                           nearest_z: np.ndarray,
+                           nearest_dist: np.ndarray) -> np.ndarray:
         """Flatten road surface using precomputed distance cache."""
         if not self.params.road_mode_enabled:
             return heightmap
+        return flatten_road(heightmap, nearest_z, nearest_dist, self.params.road_width)
 
-        rows = len(heightmap)
-        cols = len(heightmap[0]) if rows > 0 else 0
-        road_width = self.params.road_width
-
-        for i in range(rows):
-            for j in range(cols):
-                dist = nearest_dist[i][j]
-                if dist < road_width / 2:
-                    heightmap[i][j] = nearest_z[i][j]
-                elif dist < road_width:
-                    blend_factor = (dist - road_width / 2) / (road_width / 2)
-                    heightmap[i][j] = nearest_z[i][j] * (1 - blend_factor) + heightmap[i][j] * blend_factor
-
-        return heightmap
-
-    def carve_road_trench(self, heightmap: List[List[float]],
+    def carve_road_trench(self, heightmap: np.ndarray,
                          bounds: Tuple[float, float, float, float],
-                         nearest_z: List[List[float]],
-                         nearest_dist: List[List[float]]) -> List[List[float]]:
+                         nearest_z: np.ndarray,
+                         nearest_dist: np.ndarray) -> np.ndarray:
         """Lower terrain under road mesh using precomputed distance cache."""
         if not self.spline_points or len(self.spline_points) < 2:
             return heightmap
-
-        rows = len(heightmap)
-        cols = len(heightmap[0]) if rows > 0 else 0
         road_width = getattr(self.params, 'road_mesh_width', self.params.road_width)
-        trench_half_width = road_width / 2 + 0.5
-        trench_depth = self.params.road_height_offset + 0.2
-        blend_margin = 1.5
+        return carve_trench(heightmap, nearest_z, nearest_dist, road_width,
+                            self.params.road_height_offset)
 
-        for i in range(rows):
-            for j in range(cols):
-                dist = nearest_dist[i][j]
-                if dist < trench_half_width:
-                    heightmap[i][j] = nearest_z[i][j] - trench_depth
-                elif dist < trench_half_width + blend_margin:
-                    t = (dist - trench_half_width) / blend_margin
-                    lowered = nearest_z[i][j] - trench_depth
-                    heightmap[i][j] = lowered * (1 - t) + heightmap[i][j] * t
 
-        return heightmap
+    def _shaping_stages(self) -> Tuple[List[SplineShaping], List[SplineShaping]]:
+        """Spline shaping stages run before and after the flat zones.
 
-
-    def create_terrain_mesh(self, heightmap: List[List[float]], bounds: Tuple[float, float, float, float]) -> bpy.types.Object:
+        Before: the path blend and, in road mode, the road flattening.
+        After: the trench under the road mesh, which has to win over the
+        flat zones.
+        """
+        before = [spline_blend(self.params.path_width)]
+        if self.params.road_mode_enabled:
+            before.append(road_flatten(self.params.road_width))
+        after = []
+        if self.params.road_mesh_enabled and len(self.spline_points) >= 2:
+            road_width = getattr(self.params, 'road_mesh_width', self.params.road_width)
+            after.append(road_trench(road_width, self.params.road_height_offset))
+        return before, after
+
+    def create_terrain_mesh(self, heightmap: np.ndarray, bounds: Tuple[float, float, float, float],
+                            name: str = "Terrain",
+                            triangles: Optional[np.ndarray] = None,
+                            normals: Optional[np.ndarray] = None,
+                            uv_bounds: Optional[Tuple[float, float, float, float]] = None
+                            ) -> bpy.types.Object:
         """
         Convert 2D heightmap to Blender mesh.
-        
+
         Args:
             heightmap: 2D array of height values
             bounds: (min_x, max_x, min_y, max_y) terrain boundaries
-        
+            name: Object name; the mesh is named ``<name>Mesh``
+            triangles: Optional ``(T, 3)`` grid vertex indices from
+                :meth:`_lod_triangles`. Only the vertices they use are
+                created, and no subdivision is added: smoothing would move
+                the surface off the heights the error bound was checked
+                against.
+            normals: ``(rows, cols, 3)`` vertex normals; computed from
+                ``heightmap`` when omitted. Tiles pass a slice of the
+                full-terrain normals so shading matches across their edges.
+            uv_bounds: Area mapped onto UV 0..1 (defaults to ``bounds``),
+                so tiles share one planar UV layout
+
         Returns:
             Created terrain mesh object
         """
-        min_x, max_x, min_y, max_y = bounds
         rows = len(heightmap)
         cols = len(heightmap[0]) if rows > 0 else 0
 
         if rows == 0 or cols == 0:
             return None
+        if triangles is not None and len(triangles) == 0:
+            return None
 
-        # Create mesh and object
-        mesh = bpy.data.meshes.new("TerrainMesh")
-        obj = bpy.data.objects.new("Terrain", mesh)
+        heightmap = np.asarray(heightmap, dtype=np.float32)
+        if normals is None:
+            normals = grid_normals(heightmap, bounds)
+        xs, ys = grid_axes(bounds, rows, cols)
+        u_min, u_max, v_min, v_max = uv_bounds or bounds
+        us = (xs - u_min) / ((u_max - u_min) or 1.0)
+        vs = (ys - v_min) / ((v_max - v_min) or 1.0)
+
+        if triangles is not None:
+            used = np.unique(triangles)
+            i, j = np.divmod(used, cols)
+            faces = np.searchsorted(used, triangles)
+        else:
+            i, j = np.divmod(np.arange(rows * cols), cols)
+            # One quad per grid cell, counter-clockwise seen from above.
+            corner = (np.arange(rows - 1)[:, None] * cols + np.arange(cols - 1)[None, :]).ravel()
+            faces = np.stack([corner, corner + 1, corner + cols + 1, corner + cols], axis=1)
+            used = None
+        vertices = np.column_stack([xs[j], ys[i],
+                                    heightmap.ravel() if used is None else heightmap.ravel()[used]])
+
+        mesh = build_mesh(f"{name}Mesh", vertices, faces,
+                          normals=normals.reshape(-1, 3)[i * cols + j],
+                          uvs=np.column_stack([us[j], vs[i]]))
+        obj = bpy.data.objects.new(name, mesh)
 
         # Link to scene
         bpy.context.collection.objects.link(obj)
 
-        # Create vertices
-        vertices = []
-        for i in range(rows):
-            for j in range(cols):
-                x = min_x + (j / (cols - 1)) * (max_x - min_x) if cols > 1 else min_x
-                y = min_y + (i / (rows - 1)) * (max_y - min_y) if rows > 1 else min_y
-                z = heightmap[i][j]
-                vertices.append((x, y, z))
-
-        # Create faces (quads)
-        faces = []
-        for i in range(rows - 1):
-            for j in range(cols - 1):
-                # Vertex indices for this quad
-                v1 = i * cols + j
-                v2 = i * cols + (j + 1)
-                v3 = (i + 1) * cols + (j + 1)
-                v4 = (i + 1) * cols + j
-                faces.append((v1, v2, v3, v4))
-
-        # Create mesh from data
-        mesh.from_pydata(vertices, [], faces)
-        mesh.update()
-
         # Apply subdivision modifier for smoothness
-        if self.params.smoothness > 0.3:
+        if triangles is None and self.params.smoothness > 0.3:
             modifier = obj.modifiers.new(name="Subdivision", type='SUBSURF')
             modifier.levels = 1
             modifier.render_levels = 2
 
         return obj
 
-
-    def create_flat_zones(self, heightmap: List[List[float]], zones: List[Tuple[mathutils.Vector, float]],
-                         bounds: Tuple[float, float, float, float]) -> List[List[float]]:
+    def create_flat_zones(self, heightmap: np.ndarray, zones: FlatZones,
+                         bounds: Tuple[float, float, float, float]) -> np.ndarray:
         """
         Flatten designated areas in the heightmap.
 
         Args:
             heightmap: The heightmap to modify
-            zones: List of (center_position, radius) tuples for flat zones.
-                   ``center_position.z`` is taken as the target ground level.
+            zones: Oriented footprints to level; ``centers[:, 2]`` is taken
+                   as the target ground level
             bounds: (min_x, max_x, min_y, max_y) terrain boundaries
 
         Returns:
             Modified heightmap with flat zones
         """
-        min_x, max_x, min_y, max_y = bounds
-        rows = len(heightmap)
-        cols = len(heightmap[0]) if rows > 0 else 0
-
-        for zone_center, zone_radius in zones:
-            target_height = zone_center.z
-
-            for i in range(rows):
-                for j in range(cols):
-                    # Calculate world position
-                    world_x = min_x + (j / (cols - 1)) * (max_x - min_x) if cols > 1 else min_x
-                    world_y = min_y + (i / (rows - 1)) * (max_y - min_y) if rows > 1 else min_y
-
-                    # Check distance to zone center
-                    dist = math.sqrt((world_x - zone_center.x)**2 + (world_y - zone_center.y)**2)
-
-                    if dist < zone_radius:
-                        # Inside zone - flatten
-                        blend_factor = 1.0 - (dist / zone_radius)
-                        heightmap[i][j] = heightmap[i][j] * (1.0 - blend_factor) + target_height * blend_factor
-
-        return heightmap
-
-    def generate(self, spaces: List = None) -> Optional[bpy.types.Object]:
-        if not self.params.terrain_enabled:
-            return None
-        if not self.spline_points:
-            return None
+        return flatten_zones(heightmap, zones, bounds)
 
-        wm = bpy.context.window_manager
-        wm.progress_begin(0, 100)
+    def _terrain_bounds(self) -> Tuple[float, float, float, float]:
+        pad = self.params.terrain_width
+        xs = [p.position.x for p in self.spline_points]
+        ys = [p.position.y for p in self.spline_points]
+        return (min(xs) - pad, max(xs) + pad, min(ys) - pad, max(ys) + pad)
 
-        min_x = min(p.position.x for p in self.spline_points) - self.params.terrain_width
-        max_x = max(p.position.x for p in self.spline_points) + self.params.terrain_width
-        min_y = min(p.position.y for p in self.spline_points) - self.params.terrain_width
-        max_y = max(p.position.y for p in self.spline_points) + self.params.terrain_width
-
-        width = max_x - min_x
-        height = max_y - min_y
-        resolution = max(2.0, min(width, height) / 200.0)
-        cols = min(int(width / resolution) + 1, 200)
-        rows = min(int(height / resolution) + 1, 200)
+    def _road_reach(self) -> float:
+        """Distance from the spline the road flattening and trench reach."""
+        reach = 0.0
+        if self.params.road_mode_enabled:
+            reach = self.params.road_width
+        if self.params.road_mesh_enabled:
+            reach = max(reach, trench_reach(self.params.road_mesh_width))
+        return reach
 
-        bounds = (min_x, max_x, min_y, max_y)
+    def _lod_triangles(self, heightmap: np.ndarray,
+                       nearest_dist: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Adaptive triangles over the whole grid, tagged with their tile.
 
+        Roots are :data:`TILE_CELLS` wide, the tile size of
+        :meth:`generate_tiled`, so no triangle crosses a tile edge; the
+        road corridor is kept at full resolution.
+        """
+        return adaptive_triangles(heightmap, nearest_dist,
+                                  self.params.terrain_max_error,
+                                  detail_radius=self._road_reach(),
+                                  max_size=TILE_CELLS)
+
+    def _flat_zones(self, spaces: List) -> FlatZones:
+        n = len(spaces)
+        centers = np.empty((n, 3), dtype=np.float64)
+        half_extents = np.empty((n, 2), dtype=np.float64)
+        yaw = np.zeros(n, dtype=np.float64)
+        gs = self.params.grid_size
+        sh = self.params.step_height
+        for k, space in enumerate(spaces):
+            # Cells expose world_position(); legacy Space objects expose .position.
+            if hasattr(space, "world_position") and callable(space.world_position):
+                centers[k] = tuple(space.world_position(gs, sh))
+                half_extents[k] = (gs * 0.5, gs * 0.5)
+                yaw[k] = getattr(space, "orientation", 0.0)
+            else:
+                centers[k] = tuple(space.position)
+                half_extents[k] = (space.size.x * 0.5, space.size.y * 0.5)
+        return FlatZones(centers, half_extents, yaw)
+
+    def _compute_heightmap(self, bounds: Tuple[float, float, float, float],
+                           rows: int, cols: int, zones: Optional[FlatZones],
+                           wm) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Shaped heightmap and distance field in one pass; None if cancelled."""
         heightmap = self.generate_heightmap(bounds, rows, cols)
         if wm.progress_is_cancel:
-            wm.progress_end()
             return None
         wm.progress_update(20)
 
         nearest_z, nearest_dist = self._precompute_spline_distance(bounds, rows, cols)
         if wm.progress_is_cancel:
-            wm.progress_end()
             return None
         wm.progress_update(40)
 
-        heightmap = self.align_to_spline_path(heightmap, bounds, nearest_z, nearest_dist)
+        # Spline stages run fused over the cells within their reach; flat
+        # zones, when there are any, split them into a before and after pass.
+        before, after = self._shaping_stages()
+        if zones is None:
+            before, after = before + after, []
+        heightmap = shape_along_spline(heightmap, nearest_z, nearest_dist, before)
         if wm.progress_is_cancel:
-            wm.progress_end()
             return None
-        wm.progress_update(55)
-
-        if self.params.road_mode_enabled:
-            heightmap = self.create_road_surface(heightmap, bounds, nearest_z, nearest_dist)
-            if wm.progress_is_cancel:
-                wm.progress_end()
-                return None
         wm.progress_update(70)
 
-        if spaces:
-            flat_zones = []
-            gs = self.params.grid_size
-            sh = self.params.step_height
-            for space in spaces:
-                # Cells expose world_position(); legacy Space objects expose .position.
-                if hasattr(space, "world_position") and callable(space.world_position):
-                    center = space.world_position(gs, sh)
-                    zone_radius = gs * 0.7
-                else:
-                    center = space.position
-                    zone_radius = max(space.size.x, space.size.y) * 0.7
-                flat_zones.append((center, zone_radius))
-            heightmap = self.create_flat_zones(heightmap, flat_zones, bounds)
+        if zones is not None:
+            heightmap = self.create_flat_zones(heightmap, zones, bounds)
             if wm.progress_is_cancel:
-                wm.progress_end()
                 return None
         wm.progress_update(85)
 
-        if self.params.road_mesh_enabled:
-            heightmap = self.carve_road_trench(heightmap, bounds, nearest_z, nearest_dist)
+        heightmap = shape_along_spline(heightmap, nearest_z, nearest_dist, after)
+        return heightmap, nearest_z, nearest_dist
+
+    def _compute_tiled_heightmap(self, bounds: Tuple[float, float, float, float],
+                                 rows: int, cols: int, resolution: float,
+                                 zones: Optional[FlatZones],
+                                 wm) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Like :meth:`_compute_heightmap`, block by block in worker processes."""
+        min_x, _, min_y, _ = bounds
+        reach = max(self.params.path_width, self._road_reach())
+        before, after = self._shaping_stages()
+        settings = TileSettings(
+            seed=self.seed or 0,
+            height_variation=self.params.height_variation,
+            smoothness=self.params.smoothness,
+            stages=tuple(before),
+        )
+        spline = np.array([tuple(p.position) for p in self.spline_points],
+                          dtype=np.float64).reshape(-1, 3)
+        jobs = [TileJob(key, r0, c0, nr, nc, tile_halo(reach, resolution),
+                        (min_x, min_y), resolution, (rows, cols), spline, settings)
+                for key, r0, c0, nr, nc in plan_tiles(rows, cols)]
+
+        heightmap = np.empty((rows, cols), dtype=np.float32)
+        nearest_z = np.empty((rows, cols), dtype=np.float32)
+        nearest_dist = np.empty((rows, cols), dtype=np.float32)
+        for result in compute_tiles(jobs):
+            block = (slice(result.row0, result.row0 + result.heightmap.shape[0]),
+                     slice(result.col0, result.col0 + result.heightmap.shape[1]))
+            heightmap[block] = result.heightmap
+            nearest_z[block] = result.nearest_z
+            nearest_dist[block] = result.nearest_dist
+        if wm.progress_is_cancel:
+            return None
+        wm.progress_update(60)
+
+        if zones is not None:
+            heightmap = self.create_flat_zones(heightmap, zones, bounds)
             if wm.progress_is_cancel:
-                wm.progress_end()
                 return None
+        wm.progress_update(75)
+
+        heightmap = shape_along_spline(heightmap, nearest_z, nearest_dist, after)
+        return heightmap, nearest_z, nearest_dist
+
+    def _cached_terrain(self, bounds: Tuple[float, float, float, float],
+                        rows: int, cols: int, zones: Optional[FlatZones],
+                        tiled: bool, compute: Callable[[], Optional[Tuple]]
+                        ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Heightmap and distance field from the terrain cache, or ``compute()``d
+        and stored. The key covers everything the result depends on."""
+        settings = {
+            "seed": self.seed or 0, "bounds": list(bounds), "rows": rows, "cols": cols,
+            "tiled": tiled,
+            **{name: getattr(self.params, name) for name in (
+                "height_variation", "smoothness", "path_width",
+                "road_mode_enabled", "road_width", "road_mesh_enabled",
+                "road_mesh_width", "road_height_offset")},
+        }
+        spline = np.array([tuple(p.position) for p in self.spline_points],
+                          dtype=np.float64).reshape(-1, 3)
+        zone_arrays = () if zones is None else (zones.centers, zones.half_extents, zones.yaw)
+        key = cache_key(settings, spline, *zone_arrays)
+
+        cached = self.cache.load(key)
+        if cached is not None:
+            return cached.heightmap, cached.nearest_z, cached.nearest_dist
+        fields = compute()
+        if fields is not None:
+            self.cache.store(key, *fields, bounds)
+        return fields
+
+    def _grid(self, tiled: bool) -> Tuple[Tuple[float, float, float, float], int, int, float]:
+        """``(bounds, rows, cols, resolution)`` of the terrain grid.
+
+        The single-mesh grid is capped at 200x200 nodes. The tiled grid has
+        ``terrain_resolution`` spacing and no cap; its far edge is snapped
+        to the node grid so every tile shares its spacing.
+        """
+        min_x, max_x, min_y, max_y = self._terrain_bounds()
+        width = max_x - min_x
+        height = max_y - min_y
+        if not tiled:
+            resolution = max(2.0, min(width, height) / 200.0)
+            cols = min(int(width / resolution) + 1, 200)
+            rows = min(int(height / resolution) + 1, 200)
+            return (min_x, max_x, min_y, max_y), rows, cols, resolution
+        resolution = max(0.05, self.params.terrain_resolution)
+        cols = int(width / resolution) + 1
+        rows = int(height / resolution) + 1
+        bounds = (min_x, min_x + (cols - 1) * resolution,
+                  min_y, min_y + (rows - 1) * resolution)
+        return bounds, rows, cols, resolution
+
+    def compute_heightmap(self, spaces: List = None
+                          ) -> Optional[Tuple[np.ndarray, Tuple[float, float, float, float]]]:
+        """
+        The finished heightmap without building a mesh, e.g. for export.
+
+        Uses the same grid, shaping and cache as :meth:`generate` or, with
+        ``terrain_tiled``, :meth:`generate_tiled`, but runs whether or not
+        the terrain mesh is enabled.
+
+        Returns:
+            ``(heightmap, bounds)``, or None without a spline or when cancelled
+        """
+        if not self.spline_points:
+            return None
+        tiled = self.params.terrain_tiled
+        bounds, rows, cols, resolution = self._grid(tiled)
+        zones = self._flat_zones(spaces) if spaces else None
+
+        wm = bpy.context.window_manager
+        wm.progress_begin(0, 100)
+
+        def compute():
+            if tiled:
+                return self._compute_tiled_heightmap(bounds, rows, cols, resolution, zones, wm)
+            return self._compute_heightmap(bounds, rows, cols, zones, wm)
+
+        fields = self._cached_terrain(bounds, rows, cols, zones, tiled=tiled, compute=compute)
+        wm.progress_end()
+        return None if fields is None else (fields[0], bounds)
+
+    def generate(self, spaces: List = None) -> Optional[bpy.types.Object]:
+        if not self.params.terrain_enabled:
+            return None
+        if not self.spline_points:
+            return None
+
+        wm = bpy.context.window_manager
+        wm.progress_begin(0, 100)
+
+        bounds, rows, cols, _ = self._grid(tiled=False)
+        zones = self._flat_zones(spaces) if spaces else None
+
+        fields = self._cached_terrain(
+            bounds, rows, cols, zones, tiled=False,
+            compute=lambda: self._compute_heightmap(bounds, rows, cols, zones, wm))
+        if fields is None:
+            wm.progress_end()
+            return None
+        heightmap, nearest_z, nearest_dist = fields
         wm.progress_update(95)
 
-        terrain_obj = self.create_terrain_mesh(heightmap, bounds)
+        triangles = None
+        if self.params.terrain_adaptive:
+            triangles, _ = self._lod_triangles(heightmap, nearest_dist)
+        terrain_obj = self.create_terrain_mesh(heightmap, bounds, triangles=triangles)
         wm.progress_update(100)
         wm.progress_end()
 
         return terrain_obj
 
+    def generate_tiled(self, spaces: List = None) -> List[bpy.types.Object]:
+        """
+        Generate terrain at ``terrain_resolution`` as one mesh per tile.
+
+        There is no grid cap: the grid is split into blocks whose heightmap,
+        spline distance field, spline blend and road flattening are computed
+        in worker processes (see :mod:`..core.terrain_tiles`) and stitched
+        into one array. Flat zones and the road trench then run on the
+        stitched grid, and every tile mesh is cut from it including the row
+        and column it shares with its neighbours, so tile edges match
+        exactly. With ``terrain_adaptive`` one quadtree mesh is built over
+        the stitched grid and split along tile edges instead.
+
+        Returns:
+            Tile objects named ``Terrain_Tile_<x>_<y>``; empty when disabled
+            or cancelled
+        """
+        if not self.params.terrain_enabled or not self.spline_points:
+            return []
+
+        wm = bpy.context.window_manager
+        wm.progress_begin(0, 100)
+
+        bounds, rows, cols, resolution = self._grid(tiled=True)
+        min_x, _, min_y, _ = bounds
+        zones = self._flat_zones(spaces) if spaces else None
+        fields = self._cached_terrain(
+            bounds, rows, cols, zones, tiled=True,
+            compute=lambda: self._compute_tiled_heightmap(bounds, rows, cols, resolution,
+                                                          zones, wm))
+        if fields is None:
+            wm.progress_end()
+            return []
+        heightmap, nearest_z, nearest_dist = fields
+        wm.progress_update(80)
+
+        blocks = plan_tiles(rows, cols)
+        tiles = []
+        normals = grid_normals(heightmap, bounds)
+        if self.params.terrain_adaptive:
+            # One quadtree over the stitched grid, cut along its roots, so the
+            # T-junction stitching also runs across tile edges.
+            triangles, roots = self._lod_triangles(heightmap, nearest_dist)
+            for n, (key, r0, c0, nr, nc) in enumerate(blocks):
+                mine = (roots[:, 0] == r0 // TILE_CELLS) & (roots[:, 1] == c0 // TILE_CELLS)
+                obj = self.create_terrain_mesh(heightmap, bounds,
+                                               name=f"Terrain_Tile_{key[0]}_{key[1]}",
+                                               triangles=triangles[mine],
+                                               normals=normals)
+                if obj:
+                    tiles.append(obj)
+                wm.progress_update(80 + 20 * (n + 1) // len(blocks))
+            wm.progress_end()
+            return tiles
+
+        for n, (key, r0, c0, nr, nc) in enumerate(blocks):
+            r1 = min(rows, r0 + nr + 1)
+            c1 = min(cols, c0 + nc + 1)
+            if r1 - r0 < 2 or c1 - c0 < 2:
+                continue
+            tile_bounds = (min_x + c0 * resolution, min_x + (c1 - 1) * resolution,
+                           min_y + r0 * resolution, min_y + (r1 - 1) * resolution)
+            tiles.append(self.create_terrain_mesh(
+                heightmap[r0:r1, c0:c1], tile_bounds,
+                name=f"Terrain_Tile_{key[0]}_{key[1]}",
+                normals=normals[r0:r1, c0:c1], uv_bounds=bounds))
+            wm.progress_update(80 + 20 * (n + 1) // len(blocks))
+        wm.progress_end()
+        return tiles
+
     def generate_road_mesh(self) -> Optional[bpy.types.Object]:
         """
         Create a road mesh along the spline path with mitered corner joins.
@@ -452,25 +605,32 @@ class TerrainGenerator:
             left_edge[i] = inner_pt
             right_edge[i] = outer_pt
 
-        vertices = []
-        faces = []
-
-        for i in range(n):
-            vertices.append(left_edge[i])
-            vertices.append(right_edge[i])
-
-        for i in range(n - 1):
-            v0 = i * 2
-            v1 = i * 2 + 1
-            v2 = (i + 1) * 2 + 1
-            v3 = (i + 1) * 2
-            faces.append((v0, v1, v2, v3))
-
-        mesh = bpy.data.meshes.new("RoadSurface")
+        # Vertex 2i is the left edge of ring i, 2i + 1 the right edge.
+        vertices = np.empty((n, 2, 3), dtype=np.float64)
+        vertices[:, 0] = [tuple(v) for v in left_edge]
+        vertices[:, 1] = [tuple(v) for v in right_edge]
+        ring = np.arange(n - 1) * 2
+        faces = np.stack([ring, ring + 1, ring + 3, ring + 2], axis=1)
+
+        # U across the road, V along it in road widths so textures keep
+        # their aspect ratio.
+        centers = np.array([tuple(c) for c in center_pt], dtype=np.float64)
+        along = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(centers, axis=0), axis=1))])
+        uvs = np.empty((n, 2, 2), dtype=np.float64)
+        uvs[:, 0, 0] = 0.0
+        uvs[:, 1, 0] = 1.0
+        uvs[:, :, 1] = (along / max(road_width, 1e-6))[:, None]
+        normals = np.repeat([tuple(p.normal.normalized()) for p in self.spline_points], 2, axis=0)
+
+        mesh = build_mesh("RoadSurface", vertices.reshape(-1, 3), faces,
+                          normals=normals, uvs=uvs.reshape(-1, 2))
         obj = bpy.data.objects.new("Road", mesh)
         bpy.context.collection.objects.link(obj)
-        mesh.from_pydata(vertices, [], faces)
-        mesh.update()
+
+        if self.params.shading_mode == SHADING_ATTRIBUTE:
+            apply_attribute_shading(obj, shared_material(), PIECE_ROAD,
+                                    "path", 0, self.params.road_material_color)
+            return obj
 
         mat_name = "PCG_Road_Material"
         mat = bpy.data.materials.get(mat_name)
@@ -0,0 +1,336 @@
+"""Wave Function Collapse piece selection for blockout edges.
+
+An alternative to the fixed WALL / TRAVERSAL rule tree in
+:py:meth:`BuildingBlockGenerator.plan_blockout`. Every cell edge becomes a
+variable whose domain is a bitset of *variants* (``open``, ``wall``,
+``doorway``, ``ramp`` ... or anything a rules file defines). The domain
+starts as the variants the rules allow for the edge's *context* (exterior,
+road, connected, sealed, step ...), adjacency rules between neighbouring
+edges prune it further, and the solver collapses the lowest-entropy edge
+with a weighted random pick until every edge has exactly one variant.
+
+Rules are plain JSON (see ``wfc_rules/default.json``, which reproduces the
+legacy rule tree, and ``wfc_rules/varied_cover.json``)::
+
+    {
+      "variants": {"wall": {"pieces": ["wall"]},
+                   "window": {"pieces": ["wall"], "collection": "Kit_Window"},
+                   "ramp": {"pieces": ["traversal"]}, ...},
+      "contexts": {"sealed": {"wall": 1, "window": 0.3},
+                   "exterior": {"INDOOR": {...}, "OUTDOOR": {...}}, ...},
+      "forbid": {"along": [["doorway", "doorway"]], "corner": [...]},
+      "max_backtracks": 1000
+    }
+
+* ``pieces`` are ``PIECE_*`` ids; ``traversal`` means the ramp or stairs
+  piece (per ``use_stairs``) and is only valid in step contexts. An
+  optional ``collection`` replaces the variant's pieces with instances from
+  that collection.
+* A context maps variant -> weight, optionally split per blockout style.
+  Weights are numbers, ``"cover_density"`` or ``"1-cover_density"``; a
+  weight of 0 means "only if nothing else fits".
+* ``forbid`` lists variant pairs that may not meet on ``along`` neighbours
+  (consecutive edges on one line) or ``corner`` neighbours (two edges of one
+  cell sharing a corner).
+
+Domains are Python ints used as bitsets. Propagation is an AC-3 style
+worklist with a per-(relation, domain) support cache; contradictions are
+undone from a trail with chronological backtracking. No ``bpy``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core.errors import GenerationError, ParameterError
+
+# Edge contexts (unary constraints), decided from the layout.
+CTX_EXTERIOR = "exterior"     # no neighbour across the edge
+CTX_ROAD = "road"             # path <-> path, same level
+CTX_ROAD_STEP = "road_step"   # path <-> path, elevation step
+CTX_CONNECTED = "connected"   # same level, connected
+CTX_SEALED = "sealed"         # same level, not connected
+CTX_STEP = "step"             # elevation step
+CONTEXTS: Tuple[str, ...] = (CTX_EXTERIOR, CTX_ROAD, CTX_ROAD_STEP,
+                             CTX_CONNECTED, CTX_SEALED, CTX_STEP)
+STEP_CONTEXTS = frozenset((CTX_ROAD_STEP, CTX_STEP))
+
+# Relations between edge variables.
+REL_ALONG = "along"
+REL_CORNER = "corner"
+RELATIONS: Tuple[str, ...] = (REL_ALONG, REL_CORNER)
+
+# Pseudo piece id resolved to PIECE_RAMP / PIECE_STAIRS.
+PIECE_TRAVERSAL = "traversal"
+
+MAX_VARIANTS = 64
+DEFAULT_MAX_BACKTRACKS = 1000
+DEFAULT_RULES_FILE = "default.json"
+
+_WEIGHT_REFS = {
+    "cover_density": lambda params: params.cover_density,
+    "1-cover_density": lambda params: 1.0 - params.cover_density,
+}
+
+
+class WFCContradictionError(GenerationError):
+    """Raised when the rules leave an edge without any variant."""
+
+
+def get_rules_directory() -> str:
+    """Directory holding the bundled ``*.json`` rule sets."""
+    addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(addon_dir, "wfc_rules")
+
+
+@dataclass
+class WFCVariant:
+    name: str
+    pieces: Tuple[str, ...] = ()
+    collection: str = ""          # optional override collection
+
+
+@dataclass
+class WFCRules:
+    """Parsed rule set; see the module docstring for the JSON layout."""
+
+    variants: List[WFCVariant]
+    # context -> style ("*" = any) -> {variant name: weight spec}
+    contexts: Dict[str, Dict[str, Dict[str, Any]]]
+    forbid: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    max_backtracks: int = DEFAULT_MAX_BACKTRACKS
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> WFCRules:
+        raw_variants = data.get("variants") or {}
+        if not raw_variants:
+            raise ParameterError("WFC rules define no variants")
+        if len(raw_variants) > MAX_VARIANTS:
+            raise ParameterError(f"WFC rules define more than {MAX_VARIANTS} variants")
+        variants = [WFCVariant(name, tuple(spec.get("pieces", ())),
+                               str(spec.get("collection", "")))
+                    for name, spec in raw_variants.items()]
+        known = {v.name for v in variants}
+        traversal = {v.name for v in variants if PIECE_TRAVERSAL in v.pieces}
+
+        contexts: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for ctx, spec in (data.get("contexts") or {}).items():
+            if ctx not in CONTEXTS:
+                raise ParameterError(f"Unknown WFC context '{ctx}'")
+            # Either {variant: weight} or {style: {variant: weight}}.
+            if spec and all(isinstance(v, dict) for v in spec.values()):
+                by_style = {style.upper(): dict(w) for style, w in spec.items()}
+            else:
+                by_style = {"*": dict(spec)}
+            for style, weights in by_style.items():
+                for name in weights:
+                    if name not in known:
+                        raise ParameterError(
+                            f"WFC context '{ctx}' uses unknown variant '{name}'")
+                    if name in traversal and ctx not in STEP_CONTEXTS:
+                        raise ParameterError(
+                            f"WFC variant '{name}' needs an elevation step "
+                            f"but is allowed in context '{ctx}'")
+            contexts[ctx] = by_style
+        missing = [c for c in CONTEXTS if c not in contexts]
+        if missing:
+            raise ParameterError(f"WFC rules miss contexts: {', '.join(missing)}")
+
+        forbid: Dict[str, List[Tuple[str, str]]] = {}
+        for rel, pairs in (data.get("forbid") or {}).items():
+            if rel not in RELATIONS:
+                raise ParameterError(f"Unknown WFC relation '{rel}'")
+            for a, b in pairs:
+                if a not in known or b not in known:
+                    raise ParameterError(
+                        f"WFC forbid rule [{a}, {b}] uses an unknown variant")
+            forbid[rel] = [(a, b) for a, b in pairs]
+        return cls(variants, contexts, forbid,
+                   int(data.get("max_backtracks", DEFAULT_MAX_BACKTRACKS)))
+
+    @classmethod
+    def load(cls, path: str) -> WFCRules:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ParameterError(f"Cannot read WFC rules '{path}': {e}") from e
+        return cls.from_dict(data)
+
+    def index(self, name: str) -> int:
+        for i, v in enumerate(self.variants):
+            if v.name == name:
+                return i
+        raise KeyError(name)
+
+    def context_weights(self, ctx: str, style: str, params: Any) -> Dict[int, float]:
+        """``{variant index: weight}`` allowed in ``ctx`` for ``style``."""
+        by_style = self.contexts[ctx]
+        spec = by_style.get(style.upper(), by_style.get("*"))
+        if spec is None:
+            raise ParameterError(f"WFC context '{ctx}' has no entry for {style}")
+        out: Dict[int, float] = {}
+        for name, weight in spec.items():
+            if isinstance(weight, str):
+                ref = _WEIGHT_REFS.get(weight)
+                if ref is None:
+                    raise ParameterError(f"Unknown WFC weight '{weight}'")
+                weight = ref(params)
+            out[self.index(name)] = max(0.0, float(weight))
+        return out
+
+    def compat_masks(self, relation: str) -> Optional[List[int]]:
+        """Per-variant mask of variants allowed next to it, or None if free."""
+        pairs = self.forbid.get(relation)
+        if not pairs:
+            return None
+        full = (1 << len(self.variants)) - 1
+        masks = [full] * len(self.variants)
+        for a, b in pairs:
+            ia, ib = self.index(a), self.index(b)
+            masks[ia] &= ~(1 << ib)
+            masks[ib] &= ~(1 << ia)
+        return masks
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+def _bits(x: int):
+    while x:
+        low = x & -x
+        yield low.bit_length() - 1
+        x ^= low
+
+
+class WFCSolver:
+    """Bitset-domain constraint solver with propagation and backtracking.
+
+    Args:
+        domains: initial bitset per variable.
+        weights: per variable, ``{variant index: weight}`` used when
+            collapsing it.
+        neighbors: per variable, ``(other variable, relation id)`` pairs.
+            Must be symmetric.
+        compat: per relation id, per variant, the bitset of variants allowed
+            on a neighbour.
+    """
+
+    def __init__(self, domains: List[int], weights: Sequence[Dict[int, float]],
+                 neighbors: Sequence[Sequence[Tuple[int, int]]],
+                 compat: Sequence[Sequence[int]], rng: random.Random,
+                 max_backtracks: int = DEFAULT_MAX_BACKTRACKS):
+        self.domains = list(domains)
+        self.weights = weights
+        self.neighbors = neighbors
+        self.compat = compat
+        self.rng = rng
+        self.max_backtracks = max_backtracks
+        self.backtracks = 0
+        self._trail: List[Tuple[int, int]] = []
+        self._support: List[Dict[int, int]] = [{} for _ in compat]
+
+    def _supported(self, rel: int, dom: int) -> int:
+        cache = self._support[rel]
+        mask = cache.get(dom)
+        if mask is None:
+            table = self.compat[rel]
+            mask = 0
+            for a in _bits(dom):
+                mask |= table[a]
+            cache[dom] = mask
+        return mask
+
+    def _propagate(self, queue: deque) -> bool:
+        domains = self.domains
+        neighbors = self.neighbors
+        trail = self._trail
+        supported = self._supported
+        while queue:
+            v = queue.popleft()
+            dom = domains[v]
+            for w, rel in neighbors[v]:
+                old = domains[w]
+                new = old & supported(rel, dom)
+                if new != old:
+                    if not new:
+                        return False
+                    trail.append((w, old))
+                    domains[w] = new
+                    queue.append(w)
+        return True
+
+    def _pick(self, v: int) -> int:
+        choices = list(_bits(self.domains[v]))
+        table = self.weights[v]
+        w = [table.get(a, 0.0) for a in choices]
+        if sum(w) <= 0.0:
+            return self.rng.choice(choices)
+        return self.rng.choices(choices, weights=w)[0]
+
+    def solve(self) -> List[int]:
+        """Collapse every variable; returns the chosen variant per variable."""
+        domains = self.domains
+        for v, dom in enumerate(domains):
+            if not dom:
+                raise WFCContradictionError(f"Edge {v} has no allowed variant")
+        if not self._propagate(deque(range(len(domains)))):
+            raise WFCContradictionError("WFC rules contradict each other on this layout")
+        self._trail.clear()
+
+        rng = self.rng
+        heap = [(_popcount(d), rng.random(), v) for v, d in enumerate(domains)
+                if d & (d - 1)]
+        heapq.heapify(heap)
+        # (trail length before the decision, variable, chosen bit)
+        decisions: List[Tuple[int, int, int]] = []
+        while heap:
+            count, _, v = heapq.heappop(heap)
+            dom = domains[v]
+            if not dom & (dom - 1):
+                continue
+            current = _popcount(dom)
+            if current != count:
+                heapq.heappush(heap, (current, rng.random(), v))
+                continue
+            bit = 1 << self._pick(v)
+            decisions.append((len(self._trail), v, bit))
+            self._trail.append((v, dom))
+            domains[v] = bit
+            ok = self._propagate(deque((v,)))
+            while not ok:
+                ok = self._backtrack(decisions, heap)
+        return [d.bit_length() - 1 for d in domains]
+
+    def _backtrack(self, decisions: List[Tuple[int, int, int]], heap: List) -> bool:
+        """Undo the last decision and ban its choice; False if that fails too."""
+        if not decisions:
+            raise WFCContradictionError("WFC search space exhausted")
+        self.backtracks += 1
+        if self.backtracks > self.max_backtracks:
+            raise WFCContradictionError(
+                f"WFC gave up after {self.max_backtracks} backtracks")
+        mark, v, bit = decisions.pop()
+        domains = self.domains
+        trail = self._trail
+        rng = self.rng
+        while len(trail) > mark:
+            w, old = trail.pop()
+            domains[w] = old
+            if old & (old - 1):
+                heapq.heappush(heap, (_popcount(old), rng.random(), w))
+        remaining = domains[v] & ~bit
+        if not remaining:
+            return False
+        trail.append((v, domains[v]))
+        domains[v] = remaining
+        if remaining & (remaining - 1):
+            heapq.heappush(heap, (_popcount(remaining), rng.random(), v))
+        return self._propagate(deque((v,)))
@@ -0,0 +1,18 @@
+"""Shared test setup.
+
+The add-on ``__init__`` imports ``bpy``, so the tests never import it: the
+add-on directory is registered as a bare package (the same trick the terrain
+tile workers use) and ``core`` / ``generators`` modules load beneath it.
+Modules that need ``bpy`` themselves are skipped outside Blender.
+"""
+
+import os
+import sys
+import types
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "pcg_blockout"
+
+_package = types.ModuleType(PACKAGE)
+_package.__path__ = [ADDON_DIR]
+sys.modules.setdefault(PACKAGE, _package)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from pcg_blockout.core.layer_system import LayerConfig
+from pcg_blockout.generators.decoration_engine import (
+    PropBatch,
+    allocate_budget,
+    apply_budget,
+    thin_stratified,
+)
+
+
+def batch(cell_counts, name="Rocks", priority=1.0):
+    cells = np.repeat(np.arange(len(cell_counts), dtype=np.int64), cell_counts)
+    n = len(cells)
+    return PropBatch(LayerConfig(name=name, priority=priority), 0, cells,
+                     np.arange(n * 3, dtype=np.float64).reshape(n, 3),
+                     np.zeros(n), np.ones(n), np.full(n, -1, dtype=np.int64))
+
+
+def test_budget_split_follows_weights():
+    assert allocate_budget([100, 100], [3.0, 1.0], 80) == [60, 20]
+
+
+def test_satisfied_layer_passes_its_leftover_on():
+    assert allocate_budget([10, 100], [1.0, 1.0], 60) == [10, 50]
+
+
+def test_zero_weight_layers_only_get_the_remainder():
+    assert allocate_budget([50, 50], [1.0, 0.0], 40) == [40, 0]
+    assert allocate_budget([30, 50], [1.0, 0.0], 40) == [30, 10]
+
+
+def test_rounding_is_exact_and_deterministic():
+    quotas = allocate_budget([100, 100, 100], [1.0, 1.0, 1.0], 10)
+    assert sum(quotas) == 10
+    assert quotas == [4, 3, 3]
+
+
+def test_budget_never_exceeds_demand():
+    demands = [5, 0, 7]
+    quotas = allocate_budget(demands, [1.0, 2.0, 0.5], 1000)
+    assert quotas == demands
+
+
+def test_thinning_spreads_over_cells():
+    b = batch([10, 10, 10, 10])
+    kept = thin_stratified(b, 8)
+    assert len(kept) == 8
+    assert np.bincount(kept.cell_ids).tolist() == [2, 2, 2, 2]
+    assert np.all(np.diff(kept.positions[:, 0]) > 0)  # order preserved
+
+
+def test_thinning_edge_cases():
+    b = batch([3, 3])
+    assert thin_stratified(b, 6) is b
+    assert len(thin_stratified(b, 0)) == 0
+
+
+def test_apply_budget_reports_drops():
+    rocks = batch([20, 20], name="Rocks", priority=1.0)
+    trees = batch([20], name="Trees", priority=0.0)
+    out, dropped = apply_budget([rocks, trees], 30)
+    assert [b.layer.name for b in out] == ["Rocks"]
+    assert len(out[0]) == 30
+    assert dropped == {"Rocks": 10, "Trees": 20}
+
+
+@pytest.mark.parametrize("max_props", [0, 100])
+def test_apply_budget_leaves_fitting_plans_alone(max_props):
+    batches = [batch([5, 5])]
+    out, dropped = apply_budget(batches, max_props)
+    assert out is batches
+    assert dropped == {}
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from pcg_blockout.core.distance_field import (
+    distance_transform,
+    polyline_distance_field,
+    rasterize_polyline,
+)
+
+
+def brute_force(mask, dx, dy):
+    fi, fj = np.nonzero(mask)
+    i, j = np.indices(mask.shape)
+    d2 = ((i[..., None] - fi) * dy) ** 2 + ((j[..., None] - fj) * dx) ** 2
+    return np.sqrt(d2.min(axis=-1))
+
+
+@pytest.mark.parametrize("spacing", [(1.0, 1.0), (0.5, 2.0)])
+def test_transform_is_exact(spacing):
+    rng = np.random.default_rng(4)
+    mask = rng.random((37, 53)) < 0.02
+    dist, nearest_row, nearest_col = distance_transform(mask, spacing)
+    expected = brute_force(mask, *spacing)
+    np.testing.assert_allclose(dist, expected, rtol=1e-6, atol=1e-6)
+    assert mask[nearest_row, nearest_col].all()
+    i, j = np.indices(mask.shape)
+    via_index = np.hypot((i - nearest_row) * spacing[1], (j - nearest_col) * spacing[0])
+    np.testing.assert_allclose(via_index, expected, rtol=1e-6, atol=1e-6)
+
+
+def test_single_feature_and_empty_mask():
+    mask = np.zeros((5, 7), dtype=bool)
+    dist, _, _ = distance_transform(mask)
+    assert np.isinf(dist).all()
+    mask[2, 3] = True
+    dist, _, _ = distance_transform(mask)
+    assert dist[2, 3] == 0.0
+    assert dist[0, 0] == pytest.approx(np.hypot(2, 3))
+
+
+def test_rasterized_polyline_is_connected():
+    points = np.array([[0.0, 0.0, 0.0], [30.0, 12.0, 0.0], [5.0, 25.0, 0.0]])
+    segment = rasterize_polyline(points, (0.0, 30.0, 0.0, 25.0), 26, 31)
+    i, j = np.nonzero(segment >= 0)
+    assert set(segment[i, j].tolist()) == {0, 1}
+    assert segment[0, 0] == 0 and segment[25, 5] == 1
+    # 8-connected: every feature node touches another one.
+    for a, b in zip(i, j):
+        block = segment[max(a - 1, 0):a + 2, max(b - 1, 0):b + 2]
+        assert (block >= 0).sum() >= 2
+
+
+def test_polyline_distance_and_height_match_brute_force():
+    t = np.linspace(0.0, np.pi, 40)
+    points = np.stack([40 + 25 * np.cos(t), 10 + 25 * np.sin(t), 3 * t], axis=1)
+    bounds = (0.0, 80.0, -10.0, 50.0)
+    rows, cols = 61, 81
+    nearest_z, nearest_dist = polyline_distance_field(points, bounds, rows, cols)
+
+    x = np.linspace(0.0, 80.0, cols)[None, :, None]
+    y = np.linspace(-10.0, 50.0, rows)[:, None, None]
+    start, end = points[:-1], points[1:]
+    delta = end - start
+    s = ((x - start[:, 0]) * delta[:, 0] + (y - start[:, 1]) * delta[:, 1]) \
+        / (delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    s = np.clip(s, 0.0, 1.0)
+    d = np.hypot(x - start[:, 0] - delta[:, 0] * s, y - start[:, 1] - delta[:, 1] * s)
+    best = d.argmin(axis=-1)
+    expected = d.min(axis=-1)
+    z = (start[:, 2] + delta[:, 2] * s)
+    expected_z = np.take_along_axis(z, best[..., None], axis=-1)[..., 0]
+    # Exact within a few nodes of the curve. Further out on the concave side
+    # the nearest feature node can belong to another segment than the
+    # nearest point, which overestimates by at most the node snap (1 m
+    # spacing here).
+    near = expected < 3.0
+    np.testing.assert_allclose(nearest_dist[near], expected[near], atol=1e-4)
+    np.testing.assert_allclose(nearest_z[near], expected_z[near], atol=1e-3)
+    assert np.all(nearest_dist >= expected - 1e-4)
+    assert np.all(nearest_dist - expected <= np.sqrt(0.5))
+
+
+def test_polyline_off_grid_is_far():
+    points = np.array([[500.0, 500.0, 1.0], [600.0, 500.0, 1.0]])
+    nearest_z, nearest_dist = polyline_distance_field(points, (0.0, 10.0, 0.0, 10.0), 11, 11)
+    assert np.isinf(nearest_dist).all()
+    assert not nearest_z.any()
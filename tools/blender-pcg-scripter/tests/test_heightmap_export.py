@@ -0,0 +1,97 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from pcg_blockout.core.heightmap_export import (
+    FORMAT_PNG16,
+    FORMAT_RAW16,
+    export_heightmap,
+)
+
+BOUNDS = (-20.0, 30.0, 0.0, 35.0)
+
+
+def heightmap(rows=71, cols=101):
+    y, x = np.mgrid[0:rows, 0:cols].astype(np.float32)
+    return np.sin(x / 9.0) * 4.0 + y * 0.1 - 2.0
+
+
+def read_png16(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, []
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        kind, body = data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(kind + body) & 0xFFFFFFFF
+        chunks.append((kind, body))
+        pos += 12 + length
+    assert chunks[0][0] == b"IHDR" and chunks[-1] == (b"IEND", b"")
+    cols, rows, depth, color = struct.unpack(">IIBB", chunks[0][1][:10])
+    assert (depth, color) == (16, 0)
+    raw = zlib.decompress(b"".join(body for kind, body in chunks if kind == b"IDAT"))
+    lines = np.frombuffer(raw, dtype=np.uint8).reshape(rows, cols * 2 + 1)
+    assert np.all(lines[:, 0] == 2)                          # Up filter
+    unfiltered = np.cumsum(lines[:, 1:], axis=0, dtype=np.uint64) % 256
+    return unfiltered.astype(np.uint8).view(">u2").reshape(rows, cols)
+
+
+@pytest.fixture
+def exported(tmp_path):
+    h = heightmap()
+    paths = export_heightmap(h, BOUNDS, str(tmp_path / "out" / "terrain"), strip_rows=16)
+    return h, paths
+
+
+def test_writes_both_images_and_the_sidecar(exported, tmp_path):
+    _, paths = exported
+    names = [p[len(str(tmp_path / "out")) + 1:] for p in paths]
+    assert names == ["terrain.r16", "terrain.png", "terrain.json"]
+
+
+def test_raw_and_png_round_trip_north_up(exported):
+    h, paths = exported
+    with open(paths[2]) as f:
+        meta = json.load(f)
+    raw = np.fromfile(paths[0], dtype="<u2").reshape(meta["height"], meta["width"])
+    np.testing.assert_array_equal(read_png16(paths[1]), raw)
+
+    restored = meta["z_min"] + raw[::-1].astype(np.float64) * meta["z_scale"]
+    np.testing.assert_allclose(restored, h, atol=meta["z_scale"] * 0.5 + 1e-6)
+    assert raw.min() == 0 and raw.max() == 65535
+
+
+def test_sidecar_describes_the_grid(exported):
+    h, paths = exported
+    with open(paths[2]) as f:
+        meta = json.load(f)
+    assert (meta["height"], meta["width"]) == h.shape
+    assert meta["spacing"] == pytest.approx([0.5, 0.5])
+    assert meta["z_min"] == pytest.approx(float(h.min()))
+    assert meta["z_max"] == pytest.approx(float(h.max()))
+    assert meta["files"] == {FORMAT_RAW16: "terrain.r16", FORMAT_PNG16: "terrain.png"}
+
+
+@pytest.mark.parametrize("strip_rows", [1, 7, 256])
+def test_strip_size_does_not_change_the_output(tmp_path, exported, strip_rows):
+    _, reference = exported
+    h = heightmap()
+    np.save(tmp_path / "h.npy", h)
+    mapped = np.load(tmp_path / "h.npy", mmap_mode="r")
+    paths = export_heightmap(mapped, BOUNDS, str(tmp_path / "strips"),
+                             formats=(FORMAT_RAW16,), strip_rows=strip_rows)
+    with open(paths[0], "rb") as a, open(reference[0], "rb") as b:
+        assert a.read() == b.read()
+    np.testing.assert_array_equal(read_png16(reference[1]),
+                                  np.fromfile(paths[0], dtype="<u2").reshape(h.shape))
+
+
+def test_flat_heightmap_exports_zeros(tmp_path):
+    flat = np.full((5, 6), 3.0, dtype=np.float32)
+    paths = export_heightmap(flat, BOUNDS, str(tmp_path / "flat"))
+    assert not np.fromfile(paths[0], dtype="<u2").any()
+    assert not read_png16(paths[1]).any()
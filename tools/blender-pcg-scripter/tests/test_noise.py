@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from pcg_blockout.core.noise import fbm, perlin2, ridged
+
+# Exactly representable world coordinates, 0.25 m apart.
+XS = np.arange(-64, 192) * 0.25
+YS = np.arange(-32, 96) * 0.25
+
+
+def test_tiles_are_bit_identical_to_the_whole_grid():
+    whole = fbm(XS[None, :], YS[:, None], seed=11, frequency=1 / 16)
+    for r0 in range(0, len(YS), 48):
+        for c0 in range(0, len(XS), 80):
+            xs, ys = XS[c0:c0 + 80], YS[r0:r0 + 48]
+            tile = fbm(xs[None, :], ys[:, None], seed=11, frequency=1 / 16)
+            np.testing.assert_array_equal(tile, whole[r0:r0 + 48, c0:c0 + 80])
+
+
+def test_coarser_grid_samples_the_same_points():
+    fine = fbm(XS[None, :], YS[:, None], seed=3, frequency=1 / 8)
+    coarse = fbm(XS[None, ::4], YS[::4, None], seed=3, frequency=1 / 8)
+    np.testing.assert_array_equal(coarse, fine[::4, ::4])
+
+
+def test_broadcast_matches_full_coordinate_arrays():
+    x, y = np.meshgrid(XS[:40], YS[:30])
+    np.testing.assert_array_equal(perlin2(x, y, seed=5),
+                                  perlin2(XS[None, :40], YS[:30, None], seed=5))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+def test_value_ranges_and_dtype(seed):
+    n = fbm(XS[None, :], YS[:, None], seed=seed, frequency=0.1)
+    r = ridged(XS[None, :], YS[:, None], seed=seed, frequency=0.1)
+    assert n.dtype == np.float32 and r.dtype == np.float32
+    assert n.min() >= -1.0 and n.max() <= 1.0
+    assert r.min() >= 0.0 and r.max() <= 1.0
+    assert n.std() > 0.05
+
+
+def test_seed_changes_the_field():
+    a = fbm(XS[None, :], YS[:, None], seed=1, frequency=0.1)
+    b = fbm(XS[None, :], YS[:, None], seed=2, frequency=0.1)
+    assert not np.allclose(a, b)
+
+
+def test_noise_is_continuous():
+    x = np.linspace(0.0, 50.0, 50001)
+    n = perlin2(x, np.full_like(x, 3.3), seed=7)
+    assert np.abs(np.diff(n)).max() < 0.01
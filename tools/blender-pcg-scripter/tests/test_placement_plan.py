@@ -0,0 +1,133 @@
+import math
+
+import pytest
+from pcg_blockout.core.pieces import (
+    PIECE_DOORWAY,
+    PIECE_FLOOR,
+    PIECE_WALL,
+    PIECE_WALL_HALF,
+)
+from pcg_blockout.generators.placement_plan import (
+    Placement,
+    merge_collinear_walls,
+    merge_coplanar_floors,
+)
+
+GRID = 4.0
+
+
+def wall(x, y, yaw=0.0, piece=PIECE_WALL, z=0.0, cell=0, length=GRID):
+    return Placement(piece, (x, y, z), (length, 0.2, 3.0), yaw, cell, 0, (cell,))
+
+
+def floor(i, j, z=0.0, yaw=0.0, cell=None):
+    c, s = math.cos(yaw), math.sin(yaw)
+    x, y = i * GRID, j * GRID
+    cell = i * 100 + j if cell is None else cell
+    return Placement(PIECE_FLOOR, (x * c - y * s, x * s + y * c, z),
+                     (GRID, GRID, 0.2), yaw, cell, 0, (cell,))
+
+
+def covered_area(plan):
+    return sum(p.dims[0] * p.dims[1] for p in plan if p.piece == PIECE_FLOOR)
+
+
+def test_adjacent_walls_fuse_into_one_run():
+    plan = [wall(x, 10.0, cell=i) for i, x in enumerate((0.0, 4.0, 8.0))]
+    merged = merge_collinear_walls(plan, GRID)
+    assert len(merged) == 1
+    (p,) = merged
+    assert p.location == pytest.approx((4.0, 10.0, 0.0))
+    assert p.dims == pytest.approx((12.0, 0.2, 3.0))
+    assert p.cell_ids == (0, 1, 2)
+
+
+def test_gap_splits_the_run():
+    plan = [wall(0.0, 0.0), wall(4.0, 0.0), wall(12.0, 0.0)]
+    merged = merge_collinear_walls(plan, GRID)
+    assert sorted(p.dims[0] for p in merged) == pytest.approx([4.0, 8.0])
+
+
+def test_opposite_facing_walls_share_a_line():
+    plan = [wall(0.0, 0.0, yaw=0.0), wall(4.0, 0.0, yaw=math.pi)]
+    assert len(merge_collinear_walls(plan, GRID)) == 1
+
+
+def test_rotated_line_merges_in_world_space():
+    yaw = math.radians(30.0)
+    dx, dy = math.cos(yaw) * GRID, math.sin(yaw) * GRID
+    plan = [wall(i * dx, i * dy, yaw=yaw, cell=i) for i in range(4)]
+    merged = merge_collinear_walls(plan, GRID)
+    assert len(merged) == 1
+    assert merged[0].location[:2] == pytest.approx((1.5 * dx, 1.5 * dy))
+
+
+def test_different_pieces_heights_and_lines_stay_apart():
+    plan = [
+        wall(0.0, 0.0),
+        wall(4.0, 0.0, piece=PIECE_WALL_HALF),
+        wall(8.0, 0.0, z=1.0),
+        wall(12.0, 1.0),
+    ]
+    assert len(merge_collinear_walls(plan, GRID)) == 4
+
+
+def test_other_pieces_and_variants_pass_through_first():
+    door = Placement(PIECE_DOORWAY, (4.0, 0.0, 0.0), (GRID, 0.2, 3.0), 0.0, 1, 0, (1,))
+    variant = wall(8.0, 0.0)
+    variant.collection = "Ruins"
+    plan = [wall(0.0, 0.0), door, variant, wall(12.0, 0.0)]
+    merged = merge_collinear_walls(plan, GRID)
+    assert merged[:2] == [door, variant]
+    assert len(merged) == 4
+
+
+def test_full_rectangle_becomes_one_slab():
+    plan = [floor(i, j) for i in range(3) for j in range(2)]
+    merged = merge_coplanar_floors(plan, GRID)
+    assert len(merged) == 1
+    (p,) = merged
+    assert p.dims == pytest.approx((12.0, 8.0, 0.2))
+    assert p.location == pytest.approx((4.0, 2.0, 0.0))
+    assert sorted(p.cell_ids) == sorted(q.cell_ids[0] for q in plan)
+
+
+def test_l_shape_keeps_area_and_cells():
+    plan = [floor(i, 0) for i in range(3)] + [floor(0, 1), floor(0, 2)]
+    merged = merge_coplanar_floors(plan, GRID)
+    assert len(merged) == 2
+    assert covered_area(merged) == pytest.approx(covered_area(plan))
+    cells = sorted(c for p in merged for c in p.cell_ids)
+    assert cells == sorted(p.cell_ids[0] for p in plan)
+
+
+def test_elevations_do_not_merge():
+    plan = [floor(0, 0), floor(1, 0, z=1.0)]
+    assert len(merge_coplanar_floors(plan, GRID)) == 2
+
+
+def test_rotated_lattice_merges():
+    yaw = math.radians(20.0)
+    plan = [floor(i, j, yaw=yaw) for i in range(2) for j in range(2)]
+    merged = merge_coplanar_floors(plan, GRID)
+    assert len(merged) == 1
+    assert merged[0].dims[:2] == pytest.approx((8.0, 8.0))
+
+
+def test_off_lattice_tiles_pass_through():
+    odd = floor(0, 0)
+    odd.location = (GRID * 1.5, 0.0, 0.0)
+    plan = [floor(0, 0), floor(1, 0), odd]
+    merged = merge_coplanar_floors(plan, GRID)
+    assert odd in merged
+    assert covered_area(merged) == pytest.approx(covered_area(plan))
+
+
+def test_walls_and_variant_floors_are_left_alone():
+    variant = floor(1, 0)
+    variant.collection = "Tiles"
+    walls = [wall(0.0, 0.0), wall(4.0, 0.0)]
+    plan = walls + [floor(0, 0), variant, floor(2, 0)]
+    merged = merge_coplanar_floors(plan, GRID)
+    assert merged[:3] == walls + [variant]
+    assert len(merged) == 5
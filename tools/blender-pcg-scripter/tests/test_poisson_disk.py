@@ -0,0 +1,71 @@
+import math
+import random
+
+import numpy as np
+import pytest
+from pcg_blockout.generators.poisson_disk import poisson_disk_sample, radius_for_density
+
+HALF = 2.0
+
+
+def sample(centers, yaw=0.0, radius=1.0, seed=7):
+    n = len(centers)
+    return poisson_disk_sample(centers, [math.cos(yaw)] * n, [math.sin(yaw)] * n,
+                               HALF, radius, random.Random(seed))
+
+
+def inside(point, center, yaw):
+    dx, dy = point[0] - center[0], point[1] - center[1]
+    c, s = math.cos(yaw), math.sin(yaw)
+    return (abs(dx * c + dy * s) <= HALF + 1e-9
+            and abs(-dx * s + dy * c) <= HALF + 1e-9)
+
+
+def min_distance(points):
+    p = np.asarray(points)
+    d = np.hypot(p[:, None, 0] - p[None, :, 0], p[:, None, 1] - p[None, :, 1])
+    np.fill_diagonal(d, np.inf)
+    return d.min()
+
+
+def test_points_keep_the_radius_across_cell_borders():
+    centers = [(x * 2 * HALF, y * 2 * HALF) for x in range(4) for y in range(3)]
+    points, _ = sample(centers, radius=1.0)
+    assert len(points) > 20
+    assert min_distance(points) >= 1.0 - 1e-9
+
+
+def test_owner_cell_contains_its_point():
+    yaw = math.radians(35.0)
+    c, s = math.cos(yaw), math.sin(yaw)
+    centers = [(i * 2 * HALF * c, i * 2 * HALF * s) for i in range(5)]
+    points, owners = sample(centers, yaw=yaw)
+    assert len(points) == len(owners)
+    for p, o in zip(points, owners):
+        assert inside(p, centers[o], yaw)
+
+
+def test_every_island_gets_points():
+    centers = [(0.0, 0.0), (100.0, 0.0), (0.0, -80.0)]
+    _, owners = sample(centers, radius=0.8)
+    assert set(owners) == {0, 1, 2}
+
+
+def test_same_seed_same_points():
+    centers = [(0.0, 0.0), (4.0, 0.0)]
+    assert sample(centers, seed=3) == sample(centers, seed=3)
+    assert sample(centers, seed=3) != sample(centers, seed=4)
+
+
+def test_degenerate_input_gives_nothing():
+    assert sample([]) == ([], [])
+    assert sample([(0.0, 0.0)], radius=0.0) == ([], [])
+
+
+@pytest.mark.parametrize("density", [0.5, 1.0, 4.0])
+def test_density_roughly_matches_scatter(density):
+    # SCATTER: one point per 10 / density square units.
+    centers = [(x * 2 * HALF, y * 2 * HALF) for x in range(6) for y in range(6)]
+    points, _ = sample(centers, radius=radius_for_density(density))
+    expected = len(centers) * (2 * HALF) ** 2 * density / 10.0
+    assert 0.5 * expected < len(points) < 1.5 * expected
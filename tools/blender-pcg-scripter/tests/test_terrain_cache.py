@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+from pcg_blockout.core.terrain_cache import TerrainCache, cache_key
+
+BOUNDS = (-10.0, 10.0, -5.0, 5.0)
+
+
+def fields(seed=0, shape=(32, 48)):
+    rng = np.random.default_rng(seed)
+    return [rng.random(shape, dtype=np.float32) for _ in range(3)]
+
+
+def entry_bytes(tmp_path):
+    cache = TerrainCache(str(tmp_path / "probe"))
+    cache.store("k", *fields(), BOUNDS)
+    path = os.path.join(cache.directory, "k")
+    return sum(e.stat().st_size for e in os.scandir(path))
+
+
+def test_store_then_load_round_trips(tmp_path):
+    cache = TerrainCache(str(tmp_path))
+    heightmap, nearest_z, nearest_dist = fields()
+    assert cache.store("abc", heightmap, nearest_z, nearest_dist, BOUNDS)
+    hit = cache.load("abc")
+    assert hit.bounds == BOUNDS
+    np.testing.assert_array_equal(hit.heightmap, heightmap)
+    np.testing.assert_array_equal(hit.nearest_z, nearest_z)
+    np.testing.assert_array_equal(hit.nearest_dist, nearest_dist)
+    assert isinstance(hit.heightmap, np.memmap)
+    assert not hit.heightmap.flags.writeable
+    assert not [n for n in os.listdir(tmp_path) if ".tmp-" in n]
+
+
+def test_misses_and_damaged_entries_load_as_none(tmp_path):
+    cache = TerrainCache(str(tmp_path))
+    assert cache.load("missing") is None
+    cache.store("abc", *fields(), BOUNDS)
+    os.remove(tmp_path / "abc" / "nearest_z.npy")
+    assert cache.load("abc") is None
+
+
+def test_key_covers_settings_and_array_contents():
+    a = np.arange(12, dtype=np.float32)
+    base = cache_key({"seed": 1, "resolution": 0.5}, a)
+    assert base == cache_key({"resolution": 0.5, "seed": 1}, a.copy())
+    assert base != cache_key({"seed": 2, "resolution": 0.5}, a)
+    assert base != cache_key({"seed": 1, "resolution": 0.5}, a + 1)
+    assert base != cache_key({"seed": 1, "resolution": 0.5}, a.reshape(3, 4))
+    assert base != cache_key({"seed": 1, "resolution": 0.5}, a.astype(np.float64))
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    size = entry_bytes(tmp_path)
+    cache = TerrainCache(str(tmp_path / "cache"), max_bytes=int(size * 2.5))
+    for n, key in enumerate(("a", "b")):
+        cache.store(key, *fields(n), BOUNDS)
+        os.utime(os.path.join(cache.directory, key), (n, n))
+    assert cache.load("a") is not None          # touch: "b" is now the oldest
+    cache.store("c", *fields(2), BOUNDS)
+    assert sorted(os.listdir(cache.directory)) == ["a", "c"]
+
+
+def test_new_entry_survives_a_tiny_budget(tmp_path):
+    cache = TerrainCache(str(tmp_path), max_bytes=1)
+    cache.store("a", *fields(), BOUNDS)
+    cache.store("b", *fields(1), BOUNDS)
+    assert os.listdir(tmp_path) == ["b"]
+
+
+def test_clear(tmp_path):
+    cache = TerrainCache(str(tmp_path / "cache"))
+    cache.store("a", *fields(), BOUNDS)
+    cache.clear()
+    assert not os.path.exists(cache.directory)
+    assert cache.load("a") is None
+
+
+def test_unwritable_directory_reports_failure(tmp_path):
+    blocker = tmp_path / "cache"
+    blocker.write_text("not a directory")
+    cache = TerrainCache(str(blocker))
+    assert not cache.store("a", *fields(), BOUNDS)
+    assert cache.load("a") is None
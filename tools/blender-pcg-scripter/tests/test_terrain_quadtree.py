@@ -0,0 +1,70 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+from pcg_blockout.core.noise import fbm
+from pcg_blockout.core.terrain_quadtree import adaptive_triangles
+
+
+def terrain(rows, cols, seed=2):
+    xs, ys = np.arange(cols, dtype=np.float64), np.arange(rows, dtype=np.float64)
+    return fbm(xs[None, :], ys[:, None], seed=seed, frequency=1 / 40) * 6.0
+
+
+def signed_areas(tris, cols):
+    i, j = np.divmod(tris, cols)
+    return 0.5 * ((j[:, 1] - j[:, 0]) * (i[:, 2] - i[:, 0])
+                  - (j[:, 2] - j[:, 0]) * (i[:, 1] - i[:, 0]))
+
+
+def check_watertight(tris, rows, cols):
+    edges = Counter()
+    for a, b, c in tris.tolist():
+        for e in ((a, b), (b, c), (c, a)):
+            edges[tuple(sorted(e))] += 1
+    for (a, b), n in edges.items():
+        if n == 2:
+            continue
+        assert n == 1
+        (ia, ja), (ib, jb) = divmod(a, cols), divmod(b, cols)
+        on_border = ((ia == ib and ia in (0, rows - 1))
+                     or (ja == jb and ja in (0, cols - 1)))
+        assert on_border, f"open edge {(ia, ja)}-{(ib, jb)} inside the grid"
+
+
+@pytest.mark.parametrize("rows, cols, max_size", [(65, 65, 32), (77, 100, 16), (40, 131, 64)])
+def test_mesh_is_watertight_and_covers_the_grid(rows, cols, max_size):
+    h = terrain(rows, cols)
+    dist = np.abs(np.arange(rows, dtype=np.float32) - rows / 2)[:, None].repeat(cols, 1)
+    tris, roots = adaptive_triangles(h, dist, max_error=0.05, detail_radius=2.0,
+                                     max_size=max_size)
+    assert tris.max() < rows * cols
+    areas = signed_areas(tris, cols)
+    assert np.all(areas > 0)                      # counter-clockwise from +Z
+    assert areas.sum() == pytest.approx((rows - 1) * (cols - 1))
+    check_watertight(tris, rows, cols)
+    i, j = np.divmod(tris, cols)
+    assert np.all(i.min(axis=1) // max_size == roots[:, 0])
+    assert np.all(j.min(axis=1) // max_size == roots[:, 1])
+
+
+def test_flat_ground_stays_coarse_and_the_spline_stays_fine():
+    rows = cols = 129
+    h = np.zeros((rows, cols), dtype=np.float32)
+    far = np.full((rows, cols), np.inf, dtype=np.float32)
+    tris, _ = adaptive_triangles(h, far, max_error=0.01, max_size=64)
+    assert len(tris) == 2 * 4
+
+    near = far.copy()
+    near[:, 64] = 0.0
+    tris, _ = adaptive_triangles(h, near, max_error=0.01, detail_radius=0.5, max_size=64)
+    spline_vertices = np.arange(rows) * cols + 64
+    assert np.isin(spline_vertices, tris).all()
+    assert len(tris) < rows * cols // 4
+
+
+def test_tiny_grids():
+    tris, roots = adaptive_triangles(np.zeros((1, 5)), np.zeros((1, 5)), 0.1)
+    assert tris.shape == (0, 3) and roots.shape == (0, 2)
+    tris, _ = adaptive_triangles(np.zeros((2, 2)), np.zeros((2, 2)), 0.1)
+    assert sorted(map(sorted, tris.tolist())) == [[0, 1, 3], [0, 2, 3]]
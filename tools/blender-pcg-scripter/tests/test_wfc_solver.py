@@ -0,0 +1,112 @@
+import os
+import random
+from types import SimpleNamespace
+
+import pytest
+from pcg_blockout.core.errors import ParameterError
+from pcg_blockout.generators.wfc_solver import (
+    CONTEXTS,
+    CTX_SEALED,
+    CTX_STEP,
+    REL_ALONG,
+    WFCContradictionError,
+    WFCRules,
+    WFCSolver,
+    get_rules_directory,
+)
+
+OPEN, WALL, DOOR = 0, 1, 2
+ALL = 0b111
+
+
+def rules_dict(**overrides):
+    data = {
+        "variants": {"open": {}, "wall": {"pieces": ["wall"]},
+                     "doorway": {"pieces": ["doorway"]}},
+        "contexts": {ctx: {"open": 1, "wall": 1} for ctx in CONTEXTS},
+        "forbid": {REL_ALONG: [["doorway", "doorway"]]},
+    }
+    data.update(overrides)
+    return data
+
+
+def chain(n, domain=ALL, seed=1, weights=None):
+    """``n`` edge variables on one line, no two doorways next to each other."""
+    masks = WFCRules.from_dict(rules_dict()).compat_masks(REL_ALONG)
+    neighbors = [[(w, 0) for w in (v - 1, v + 1) if 0 <= w < n] for v in range(n)]
+    weights = weights or [{OPEN: 1.0, WALL: 1.0, DOOR: 5.0}] * n
+    return WFCSolver([domain] * n, weights, neighbors, [masks], random.Random(seed))
+
+
+def test_solution_respects_forbidden_pairs():
+    solver = chain(200)
+    chosen = solver.solve()
+    assert len(chosen) == 200
+    assert DOOR in chosen
+    assert not any(a == b == DOOR for a, b in zip(chosen, chosen[1:]))
+
+
+def test_same_seed_same_solution():
+    assert chain(50, seed=9).solve() == chain(50, seed=9).solve()
+
+
+def test_zero_weights_only_when_nothing_else_fits():
+    weights = [{OPEN: 0.0, WALL: 1.0}] * 20
+    assert set(chain(20, domain=0b011, weights=weights).solve()) == {WALL}
+
+
+def test_empty_domain_is_a_contradiction():
+    solver = chain(3)
+    solver.domains[1] = 0
+    with pytest.raises(WFCContradictionError):
+        solver.solve()
+
+
+def test_unsatisfiable_layout_is_a_contradiction():
+    with pytest.raises(WFCContradictionError):
+        chain(2, domain=1 << DOOR).solve()
+
+
+def test_compat_masks():
+    rules = WFCRules.from_dict(rules_dict())
+    masks = rules.compat_masks(REL_ALONG)
+    assert masks == [ALL, ALL, ALL & ~(1 << DOOR)]
+    assert rules.compat_masks("corner") is None
+
+
+def test_context_weights_resolve_styles_and_references():
+    contexts = rules_dict()["contexts"]
+    contexts[CTX_SEALED] = {"OUTDOOR": {"wall": "cover_density", "open": 2},
+                            "indoor": {"wall": "1-cover_density"}}
+    rules = WFCRules.from_dict(rules_dict(contexts=contexts))
+    params = SimpleNamespace(cover_density=0.25)
+    assert rules.context_weights(CTX_SEALED, "outdoor", params) == {WALL: 0.25, OPEN: 2.0}
+    assert rules.context_weights(CTX_SEALED, "INDOOR", params) == {WALL: 0.75}
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"variants": {}}, "no variants"),
+    ({"contexts": {"sealed": {"open": 1}}}, "miss contexts"),
+    ({"contexts": {**{c: {"open": 1} for c in CONTEXTS}, "attic": {}}}, "Unknown WFC context"),
+    ({"forbid": {"along": [["door", "wall"]]}}, "unknown variant"),
+    ({"forbid": {"diagonal": []}}, "Unknown WFC relation"),
+])
+def test_invalid_rules_are_rejected(data, message):
+    with pytest.raises(ParameterError, match=message):
+        WFCRules.from_dict(rules_dict(**data))
+
+
+def test_traversal_only_in_step_contexts():
+    variants = {**rules_dict()["variants"], "ramp": {"pieces": ["traversal"]}}
+    contexts = rules_dict()["contexts"]
+    contexts[CTX_STEP] = {"ramp": 1}
+    WFCRules.from_dict(rules_dict(variants=variants, contexts=contexts))
+    contexts[CTX_SEALED] = {"ramp": 1}
+    with pytest.raises(ParameterError, match="needs an elevation step"):
+        WFCRules.from_dict(rules_dict(variants=variants, contexts=contexts))
+
+
+@pytest.mark.parametrize("name", sorted(os.listdir(get_rules_directory())))
+def test_bundled_rule_sets_load(name):
+    rules = WFCRules.load(os.path.join(get_rules_directory(), name))
+    assert rules.variants
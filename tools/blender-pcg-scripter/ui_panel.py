@@ -11,14 +11,21 @@ Panel layout (top-to-bottom in the N-panel):
     6.  Decoration Layers        (existing layer system; runs AFTER blockout)
     7.  Terrain                  (DISABLED -- feature parked)
     8.  Road Mesh
-    9.  Controls & Utilities
-    10. Presets
+    9.  Viewport LOD             (distance LOD, chunked output, collision)
+    10. Controls & Utilities     (generate, preview, region regeneration,
+                                  heightmap export)
+    11. Presets
 """
 
+import os
+
 import bpy
+from bpy_extras.io_utils import ExportHelper
 
 from .core import (
+    generation_undo,
     history_manager,
+    lod_manager,
     parameters,
     preset_manager,
     scene_manager,
@@ -26,6 +33,8 @@ from .core import (
 )
 from .core.adapters import BlenderCurveAdapter
 from .core.errors import PCGError
+from .core.heightmap_export import FORMAT_PNG16, FORMAT_RAW16, export_heightmap
+from .core.naming import NAMING_LAZY
 from .core.parameters import (
     PIECE_DOORWAY,
     PIECE_FLOOR,
@@ -39,7 +48,9 @@ from .core.parameters import (
 from .core.preview_manager import PreviewManager
 from .core.spline_sampler import SplineSampler
 from .generators.building_generator import BuildingBlockGenerator
+from .generators.collision import CollisionProxies
 from .generators.layout_generator import LayoutGenerator
+from .generators.region_regen import GenerationSession, current_session, remember
 from .generators.terrain_generator import TerrainGenerator
 
 # ------------------------------------------------------------------ operators
@@ -152,50 +163,89 @@ class PCG_OT_Generate(bpy.types.Operator):
             (root_coll, struct_coll, terrain_coll, conn_coll) = \
                 scene_manager.create_generation_structure()
 
+            # With chunking on, blockout and decoration share Chunk_x_y
+            # collections under "Chunks" instead of Blockout / Decoration.
+            chunks: scene_manager.ChunkedCollections | None = None
+            if params.chunk_collections:
+                chunks_root = bpy.data.collections.new("Chunks")
+                struct_coll.children.link(chunks_root)
+                chunks = scene_manager.ChunkedCollections(
+                    chunks_root, params.chunk_size)
+
             # ---- Blockout (Floor/Wall/Traversal) ----
             building_gen = BuildingBlockGenerator(seed, params)
-            blockout_root = bpy.data.collections.new("Blockout")
-            struct_coll.children.link(blockout_root)
+            blockout_root: bpy.types.Collection | None = None
+            if chunks is None:
+                blockout_root = bpy.data.collections.new("Blockout")
+                struct_coll.children.link(blockout_root)
             # Pieces are linked directly into per-piece sub-collections under
             # blockout_root -- avoids the unlink/relink round-trip and the
             # bpy.ops overhead of the legacy primitive_cube_add path.
             blockout_by_piece = building_gen.build_blockout(
-                cells, parent_collection=blockout_root)
+                cells, parent_collection=blockout_root, chunks=chunks)
 
             total_blockout = sum(len(o) for o in blockout_by_piece.values())
             self.report({'INFO'}, f"Placed {total_blockout} blockout pieces")
+
+            # ---- Collision proxies (from the raw plan, per chunk) ----
+            collision: CollisionProxies | None = None
+            if params.collision_proxies:
+                collision = CollisionProxies(root_coll, params.grid_size,
+                                             params.chunk_size)
+                hulls = collision.build(building_gen.raw_blockout_plan)
+                self.report({'INFO'}, f"Built {hulls} collision hulls in "
+                                      f"{collision.chunk_count} chunks")
             wm.progress_update(75)
 
             # ---- Decoration layers (legacy layer system) ----
             decor_root: dict[str, list] = {}
             decor_parent: bpy.types.Collection | None = None
-            if any(layer.enabled for layer in params.layers):
+            has_layers = any(layer.enabled for layer in params.layers)
+            if has_layers and chunks is None:
                 decor_parent = bpy.data.collections.new("Decoration")
                 struct_coll.children.link(decor_parent)
 
+            # Layer-major: each layer is planned across every cell in one
+            # batch and linked straight into its sub-collection under
+            # decor_parent, so nothing needs organizing afterwards.
             decor_blocks: dict[str, list] = {}
-            for cell in cells:
-                cell_blocks = building_gen.populate_cell(
-                    cell, parent_collection=decor_parent)
-                for layer_name, blocks in cell_blocks.items():
-                    decor_blocks.setdefault(layer_name, []).extend(blocks)
-
-            if decor_blocks:
-                # Decoration props were already linked into per-layer
-                # sub-collections under decor_parent by populate_cell, so we
-                # don't need to organize them again here.
-                pass
+            if has_layers:
+                decor_blocks = building_gen.decorate(
+                    cells, parent_collection=decor_parent, chunks=chunks)
 
             total_decor = sum(len(b) for b in decor_blocks.values())
             self.report({'INFO'}, f"Placed {total_decor} decoration blocks")
+            for reason, label in (("budget", f"Prop budget ({params.max_props})"),
+                                  ("collision", "Collision")):
+                dropped = building_gen.decoration_dropped.get(reason) or {}
+                if dropped:
+                    detail = ", ".join(f"{name} {count}"
+                                       for name, count in dropped.items())
+                    self.report({'INFO'}, f"{label}: dropped "
+                                          f"{sum(dropped.values())} props ({detail})")
+            # Keep what Regenerate Region needs to patch this run later.
+            remember(GenerationSession(
+                root_coll, layout_gen, building_gen, cells,
+                blockout_by_piece, decor_blocks,
+                blockout_parent=blockout_root, decoration_parent=decor_parent,
+                chunks=chunks, collision=collision))
+            if chunks is not None:
+                manifest = chunks.write_manifest()
+                self.report({'INFO'}, f"Bucketed output into "
+                                      f"{len(manifest['chunks'])} chunks "
+                                      f"of {params.chunk_size:g} m")
             wm.progress_update(85)
 
             # ---- Terrain (disabled, see ui panel comment) ----
             # if params.terrain_enabled:
             #     terrain_gen = TerrainGenerator(seed, params, spline_points)
-            #     terrain_obj = terrain_gen.generate(cells)
-            #     if terrain_obj:
-            #         scene_manager.organize_objects([terrain_obj], terrain_coll.name)
+            #     if params.terrain_tiled:
+            #         terrain_objs = terrain_gen.generate_tiled(cells)
+            #     else:
+            #         terrain_obj = terrain_gen.generate(cells)
+            #         terrain_objs = [terrain_obj] if terrain_obj else []
+            #     if terrain_objs:
+            #         scene_manager.organize_objects(terrain_objs, terrain_coll.name)
             #         self.report({'INFO'}, "Terrain generated")
 
             if params.road_mesh_enabled:
@@ -227,6 +277,204 @@ class PCG_OT_Generate(bpy.types.Operator):
             wm.progress_end()
 
 
+class PCG_OT_GenerateLight(bpy.types.Operator):
+    """Generate without a global undo step (Undo Generation reverts it)."""
+    bl_idname = "pcg.generate_light"
+    bl_label = "Generate Level Blockout (Light Undo)"
+    # No UNDO: skips the memfile snapshot of the whole new generation.
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        before = context.scene.pcg_props.to_dict()
+        previous = current_session()
+        result = PCG_OT_Generate.execute(self, context)
+        session = current_session()
+        if 'FINISHED' in result and session is not None and session is not previous:
+            generation_undo.push(session.root.name, before, previous)
+        return result
+
+
+class PCG_OT_UndoGeneration(bpy.types.Operator):
+    """Delete the last light generation and restore the state before it."""
+    bl_idname = "pcg.undo_generation"
+    bl_label = "Undo Generation"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return generation_undo.depth() > 0
+
+    def execute(self, context):
+        entry = generation_undo.pop()
+        if entry is None:
+            self.report({'WARNING'}, "Nothing to undo")
+            return {'CANCELLED'}
+        lod_manager.invalidate()
+        removed = scene_manager.remove_generation(
+            bpy.data.collections[entry.root_name])
+        preset_manager.apply_preset_to_scene(entry.params, context.scene)
+        session = entry.session
+        remember(session if session is not None and session.is_alive() else None)
+        self.report({'INFO'}, f"Removed {entry.root_name} ({removed} objects); "
+                              f"parameters restored")
+        return {'FINISHED'}
+
+
+class PCG_OT_RegenerateRegion(bpy.types.Operator):
+    """Re-roll part of the last generation with a fresh sub-seed."""
+    bl_idname = "pcg.regenerate_region"
+    bl_label = "Regenerate Region"
+    # No REGISTER: the redo panel would undo first, which drops the session.
+    bl_options = {'UNDO'}
+
+    region: bpy.props.EnumProperty(
+        name="Region",
+        items=[
+            ("SELECTED", "Selected Objects",
+             "Cells covered by the selected pieces / props (box- or "
+             "lasso-select them in the viewport first)"),
+            ("CURSOR", "Around 3D Cursor",
+             "Cells within Radius of the 3D cursor"),
+        ],
+        default="SELECTED",
+    )
+    radius: bpy.props.FloatProperty(
+        name="Radius", default=8.0, min=0.0, soft_max=200.0, unit='LENGTH',
+    )
+    sub_seed: bpy.props.IntProperty(
+        name="Sub-seed", description="Seed for the region (0 = random)",
+        default=0, min=0,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "region")
+        if self.region == "CURSOR":
+            layout.prop(self, "radius")
+        layout.prop(self, "sub_seed")
+
+    def execute(self, context):
+        session = current_session()
+        if session is None:
+            self.report({'ERROR'}, "No generation to patch; run Generate first "
+                                   "(undo and file reloads discard it)")
+            return {'CANCELLED'}
+
+        if self.region == "CURSOR":
+            cursor = context.scene.cursor.location
+            cell_ids = session.cells_in_radius(cursor.x, cursor.y, self.radius)
+        else:
+            cell_ids = session.cells_for_objects(context.selected_objects)
+        if not cell_ids:
+            self.report({'WARNING'}, "No cells in the region")
+            return {'CANCELLED'}
+
+        sub_seed = self.sub_seed or seed_manager.generate_random_seed()
+        try:
+            stats = session.regenerate(cell_ids, sub_seed)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.report({'ERROR'}, f"Region regeneration failed: {e}")
+            return {'CANCELLED'}
+        lod_manager.invalidate()
+        self.report({'INFO'},
+            f"Regenerated {stats['cells']} cells (sub-seed {sub_seed}): "
+            f"pieces -{stats['pieces_removed']} +{stats['pieces_added']}, "
+            f"props -{stats['props_removed']} +{stats['props_added']}")
+        return {'FINISHED'}
+
+
+class PCG_OT_NameProps(bpy.types.Operator):
+    """Give the last generation's props descriptive names (Lazy prop names)."""
+    bl_idname = "pcg.name_props"
+    bl_label = "Name Props"
+    # No REGISTER: the redo panel would undo first, which drops the session.
+    bl_options = {'UNDO'}
+
+    selected_only: bpy.props.BoolProperty(
+        name="Selected Only",
+        description="Rename only the selected props instead of all of them",
+        default=False,
+    )
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        session = current_session()
+        if session is None:
+            self.report({'ERROR'}, "No generation to name; run Generate first "
+                                   "(undo and file reloads discard it)")
+            return {'CANCELLED'}
+        objects = context.selected_objects if self.selected_only else None
+        renamed = session.name_props(objects)
+        self.report({'INFO'}, f"Named {renamed} props")
+        return {'FINISHED'}
+
+
+class PCG_OT_ExportHeightmap(bpy.types.Operator, ExportHelper):
+    """Export the terrain heightmap as 16-bit RAW / PNG with a JSON sidecar."""
+    bl_idname = "pcg.export_heightmap"
+    bl_label = "Export Heightmap"
+
+    filename_ext = ".png"
+    filter_glob: bpy.props.StringProperty(default="*.png;*.r16", options={'HIDDEN'})
+    format: bpy.props.EnumProperty(
+        name="Format",
+        items=[
+            ("BOTH", "RAW16 + PNG16", "Write both images"),
+            (FORMAT_PNG16, "PNG16", "16-bit grayscale PNG"),
+            (FORMAT_RAW16, "RAW16", "Headerless little-endian 16-bit samples (.r16)"),
+        ],
+        default="BOTH",
+    )
+
+    def execute(self, context):
+        # Reuse the last generation's seed and cells so the export matches
+        # its flat zones (and hits the terrain cache); otherwise sample now.
+        session = current_session()
+        try:
+            if session is not None:
+                layout_gen = session.layout
+                seed, params = layout_gen.seed, layout_gen.params
+                spline_points = layout_gen.spline_points
+                spaces = list(session.cells.values())
+            else:
+                params = context.scene.pcg_props.to_generation_params()
+                if params.spline_object is None:
+                    self.report({'ERROR'}, "No spline object selected")
+                    return {'CANCELLED'}
+                seed = seed_manager.initialize_seed(params.seed)
+                sampler = SplineSampler(BlenderCurveAdapter(params.spline_object))
+                sampler.validate_spline()
+                spline_points = sampler.sample_points(params.spacing)
+                spaces = None
+
+            result = TerrainGenerator(seed, params, spline_points).compute_heightmap(spaces)
+            if result is None:
+                self.report({'WARNING'}, "Nothing to export")
+                return {'CANCELLED'}
+            heightmap, bounds = result
+            formats = (FORMAT_RAW16, FORMAT_PNG16) if self.format == "BOTH" else (self.format,)
+            written = export_heightmap(heightmap, bounds,
+                                       os.path.splitext(self.filepath)[0], formats)
+        except PCGError as e:
+            self.report({'ERROR'}, str(e))
+            return {'CANCELLED'}
+        except OSError as e:
+            self.report({'ERROR'}, f"Heightmap export failed: {e}")
+            return {'CANCELLED'}
+
+        rows, cols = heightmap.shape
+        self.report({'INFO'}, f"Exported {cols}x{rows} heightmap: "
+                              f"{', '.join(os.path.basename(p) for p in written)}")
+        return {'FINISHED'}
+
+
 class PCG_OT_RandomizeSeed(bpy.types.Operator):
     """Generate a new random seed (and optionally remix parameters)."""
     bl_idname = "pcg.randomize_seed"
@@ -361,6 +609,18 @@ class PCG_OT_ResetParameters(bpy.types.Operator):
         props.ramp_slope_cells = d.RAMP_SLOPE_CELLS
         props.use_stairs = d.USE_STAIRS
         props.generate_pillars = d.GENERATE_PILLARS
+        props.merge_walls = d.MERGE_WALLS
+        props.merge_floors = d.MERGE_FLOORS
+        props.shading_mode = d.SHADING_MODE
+        props.piece_solver = d.PIECE_SOLVER
+        props.wfc_rules = d.WFC_RULES
+        props.max_props = d.MAX_PROPS
+        props.lod_enabled = d.LOD_ENABLED
+        props.lod_distance = d.LOD_DISTANCE
+        props.lod_mode = d.LOD_MODE
+        props.chunk_collections = d.CHUNK_COLLECTIONS
+        props.chunk_size = d.CHUNK_SIZE
+        props.collision_proxies = d.COLLISION_PROXIES
         props.block_type_floor = True
         props.block_type_wall = True
         props.block_type_wall_half = True
@@ -373,6 +633,10 @@ class PCG_OT_ResetParameters(bpy.types.Operator):
         # props.height_variation = d.HEIGHT_VARIATION
         # props.smoothness = d.SMOOTHNESS
         # props.terrain_width = d.TERRAIN_WIDTH
+        # props.terrain_tiled = d.TERRAIN_TILED
+        # props.terrain_resolution = d.TERRAIN_RESOLUTION
+        # props.terrain_adaptive = d.TERRAIN_ADAPTIVE
+        # props.terrain_max_error = d.TERRAIN_MAX_ERROR
         self.report({'INFO'}, "Parameters reset to defaults")
         return {'FINISHED'}
 
@@ -456,9 +720,10 @@ class PCG_OT_DuplicateLayer(bpy.types.Operator):
         source = props.layers[idx]
         new_layer = props.layers.add()
         for attr in ("name", "enabled", "rule", "collection_name", "density",
-                     "offset", "z_offset", "cell_target",
+                     "offset", "z_offset", "min_distance", "cell_target",
+                     "collision_mode",
                      "random_rotation", "random_scale",
-                     "scale_min", "scale_max"):
+                     "scale_min", "scale_max", "priority"):
             setattr(new_layer, attr, getattr(source, attr))
         new_layer.name = f"{source.name} Copy"
         props.active_layer_index = len(props.layers) - 1
@@ -702,6 +967,12 @@ class PCG_PT_MainPanel(bpy.types.Panel):
         col2 = box.column(align=True)
         col2.prop(props, "use_stairs", icon='MOD_ARRAY')
         col2.prop(props, "generate_pillars", icon='MESH_CYLINDER')
+        col2.prop(props, "merge_walls", icon='AUTOMERGE_ON')
+        col2.prop(props, "merge_floors", icon='MESH_GRID')
+        box.row().prop(props, "shading_mode", expand=True)
+        box.row().prop(props, "piece_solver", expand=True)
+        if props.piece_solver == "WFC":
+            box.prop(props, "wfc_rules")
 
         # Per-piece grid
         pieces_box = box.box()
@@ -730,6 +1001,14 @@ class PCG_PT_MainPanel(bpy.types.Panel):
         col.operator("pcg.toggle_all_layers", icon='CHECKBOX_HLT', text="").action = 'ENABLE'
         col.operator("pcg.toggle_all_layers", icon='CHECKBOX_DEHLT', text="").action = 'DISABLE'
 
+        if props.decoration_naming == NAMING_LAZY:
+            row = box.row(align=True)
+            row.prop(props, "decoration_naming")
+            row.operator("pcg.name_props", text="", icon='SORTALPHA')
+        else:
+            box.prop(props, "decoration_naming")
+        box.prop(props, "max_props")
+
         if props.layers and 0 <= props.active_layer_index < len(props.layers):
             active_layer = props.layers[props.active_layer_index]
             sub_box = box.box()
@@ -737,11 +1016,16 @@ class PCG_PT_MainPanel(bpy.types.Panel):
             sub_box.prop(active_layer, "name")
             sub_box.prop(active_layer, "rule")
             sub_box.prop(active_layer, "cell_target")
+            sub_box.prop(active_layer, "collision_mode")
             sub_box.prop_search(active_layer, "collection_name", bpy.data, "collections")
             col = sub_box.column(align=True)
             col.prop(active_layer, "density")
             col.prop(active_layer, "offset")
             col.prop(active_layer, "z_offset")
+            if active_layer.rule == 'POISSON_DISK':
+                col.prop(active_layer, "min_distance")
+            if props.max_props > 0:
+                col.prop(active_layer, "priority")
             col = sub_box.column(align=True)
             col.prop(active_layer, "random_rotation")
             col.prop(active_layer, "random_scale")
@@ -761,6 +1045,12 @@ class PCG_PT_MainPanel(bpy.types.Panel):
         #     box.prop(props, "height_variation")
         #     box.prop(props, "smoothness")
         #     box.prop(props, "terrain_width")
+        #     box.prop(props, "terrain_tiled")
+        #     if props.terrain_tiled:
+        #         box.prop(props, "terrain_resolution")
+        #     box.prop(props, "terrain_adaptive")
+        #     if props.terrain_adaptive:
+        #         box.prop(props, "terrain_max_error")
 
         # 8. Road Mesh --------------------------------------------------
         box = layout.box()
@@ -771,9 +1061,20 @@ class PCG_PT_MainPanel(bpy.types.Panel):
             box.prop(props, "road_height_offset")
             box.prop(props, "road_material_color")
 
+        # 9. Viewport LOD -----------------------------------------------
+        box = layout.box()
+        box.label(text="Viewport LOD", icon='VIEW_CAMERA')
+        box.prop(props, "lod_enabled")
+        if props.lod_enabled:
+            box.prop(props, "lod_distance")
+            box.row().prop(props, "lod_mode", expand=True)
+        box.prop(props, "chunk_collections")
+        box.prop(props, "chunk_size")
+        box.prop(props, "collision_proxies")
+
         layout.separator()
 
-        # 9. Controls & Utilities --------------------------------------
+        # 10. Controls & Utilities --------------------------------------
         col = layout.column(align=True)
         if props.spline_object is None:
             col.enabled = False
@@ -784,13 +1085,20 @@ class PCG_PT_MainPanel(bpy.types.Panel):
         col.separator()
         row = col.row(align=True)
         row.scale_y = 1.2
-        row.operator("pcg.generate", text="Generate", icon='PLAY')
+        row.operator("pcg.generate_light" if props.undo_light else "pcg.generate",
+                     text="Generate", icon='PLAY')
         row.operator("pcg.toggle_preview", text="Preview", icon='HIDE_OFF')
         row.popover(panel="PCG_PT_history_popover", text="", icon='TIME')
+        col.operator("pcg.regenerate_region", text="Regenerate Region",
+                     icon='SELECT_SUBTRACT')
+        col.operator("pcg.export_heightmap", text="Export Heightmap", icon='EXPORT')
+        row = col.row(align=True)
+        row.prop(props, "undo_light", toggle=True)
+        row.operator("pcg.undo_generation", text="Undo Generation", icon='LOOP_BACK')
 
         layout.separator()
 
-        # 10. Presets --------------------------------------------------
+        # 11. Presets --------------------------------------------------
         box = layout.box()
         box.label(text="Presets", icon='PRESET')
         row = box.row(align=True)
@@ -805,6 +1113,11 @@ classes = [
     PCG_OT_CreateDefaultSpline,
     PCG_OT_Preview,
     PCG_OT_Generate,
+    PCG_OT_GenerateLight,
+    PCG_OT_UndoGeneration,
+    PCG_OT_RegenerateRegion,
+    PCG_OT_NameProps,
+    PCG_OT_ExportHeightmap,
     PCG_OT_RandomizeSeed,
     PCG_OT_SavePreset,
     PCG_OT_LoadPreset,